@@ -0,0 +1,178 @@
+# ============================================================
+# KurTakip - Kur Analizi / Rate Analytics
+# Geçmiş kurlardan hareketli ortalama, oynaklık, düşüş ve uç değerleri hesaplar
+# Computes moving averages, volatility, drawdown and extremes from history
+# ============================================================
+#
+# Tüm hareketli istatistikler tek geçişte, kayan toplamlarla hesaplanır
+# (pencere başına yeniden toplama yapılmaz): O(n).
+# Every rolling statistic is computed in a single pass with running sums
+# (nothing is re-summed per window): O(n).
+# ============================================================
+
+# --- Kütüphaneleri içe aktar / Import libraries ---
+import math
+
+# Yıllık oynaklık için işlem günü sayısı / Trading days per year for annualized volatility
+TRADING_DAYS = 252
+
+# Yanıttaki ondalık hane sayısı / Decimal digits in the response
+DIGITS = 6
+
+
+def rolling_mean_std(values, window):
+    """
+    Hareketli ortalama ve örneklem standart sapması (tek geçiş).
+    Rolling mean and sample standard deviation (single pass).
+
+    Sayısal kararlılık için değerler ilk değere göre kaydırılır.
+    Values are shifted by the first value for numerical stability.
+
+    Döndürür / Returns:
+        (ortalamalar / means, sapmalar / deviations); ilk window-1 eleman None
+        the first window-1 items are None
+    """
+    count = len(values)
+    means = [None] * count
+    deviations = [None] * count
+    if count == 0 or window < 1:
+        return means, deviations
+
+    shift = values[0]
+    total = 0.0
+    total_squares = 0.0
+
+    for index in range(count):
+        value = values[index] - shift
+        total += value
+        total_squares += value * value
+
+        if index >= window:
+            old_value = values[index - window] - shift
+            total -= old_value
+            total_squares -= old_value * old_value
+
+        if index >= window - 1:
+            mean = total / window
+            means[index] = mean + shift
+            if window > 1:
+                variance = (total_squares - window * mean * mean) / (window - 1)
+                deviations[index] = math.sqrt(max(variance, 0.0))
+            else:
+                deviations[index] = 0.0
+
+    return means, deviations
+
+
+def drawdowns(values):
+    """
+    Her gün için o ana kadarki zirveden yüzde düşüş (0 ya da negatif).
+    Percent drop from the running peak for every day (0 or negative).
+
+    Döndürür / Returns:
+        (düşüşler / drawdowns, en büyük düşüşün indeksi / index of the worst drawdown,
+         o düşüşün zirve indeksi / index of its peak)
+    """
+    result = []
+    peak_index = 0
+    worst_index = 0
+    worst_peak_index = 0
+
+    for index, value in enumerate(values):
+        if value > values[peak_index]:
+            peak_index = index
+
+        drawdown = (value - values[peak_index]) / values[peak_index] * 100
+        result.append(drawdown)
+
+        if drawdown < result[worst_index]:
+            worst_index = index
+            worst_peak_index = peak_index
+
+    return result, worst_index, worst_peak_index
+
+
+def daily_volatility(values):
+    """
+    Günlük logaritmik getirilerin örneklem standart sapması.
+    Sample standard deviation of daily log returns.
+
+    Döndürür / Returns:
+        Oynaklık ya da yeterli veri yoksa None / Volatility, or None without enough data
+    """
+    returns = []
+    for index in range(1, len(values)):
+        returns.append(math.log(values[index] / values[index - 1]))
+
+    if len(returns) < 2:
+        return None
+
+    mean = math.fsum(returns) / len(returns)
+    squares = math.fsum((value - mean) ** 2 for value in returns)
+    return math.sqrt(squares / (len(returns) - 1))
+
+
+def rounded(value):
+    """
+    Sayıyı yanıt için yuvarlar (None olduğu gibi kalır).
+    Rounds a number for the response (None stays None).
+    """
+    if value is None:
+        return None
+    return round(value, DIGITS)
+
+
+def summarize(points, window):
+    """
+    Geçmiş kurların analizini çıkarır.
+    Computes the analytics of historical rates.
+
+    Parametreler / Parameters:
+        points: [{"date": "2024-12-02", "rate": 35.1}, ...] (tarihe göre sıralı / sorted by date)
+        window: Hareketli pencere uzunluğu (gün) / Rolling window length (days)
+
+    Döndürür / Returns:
+        Sütun biçimli seriler ve özet / Columnar series and a summary
+        ya da veri yoksa None / or None without data
+    """
+    if len(points) == 0:
+        return None
+
+    dates = [point["date"] for point in points]
+    values = [float(point["rate"]) for point in points]
+
+    means, deviations = rolling_mean_std(values, window)
+    drawdown_list, worst_index, worst_peak_index = drawdowns(values)
+
+    min_index = min(range(len(values)), key=values.__getitem__)
+    max_index = max(range(len(values)), key=values.__getitem__)
+
+    volatility = daily_volatility(values)
+    annualized = None
+    if volatility is not None:
+        annualized = volatility * math.sqrt(TRADING_DAYS)
+
+    change_percent = (values[-1] - values[0]) / values[0] * 100
+
+    return {
+        "window": window,
+        "dates": dates,
+        "rates": values,
+        "rolling_mean": [rounded(value) for value in means],
+        "rolling_std": [rounded(value) for value in deviations],
+        "drawdown": [rounded(value) for value in drawdown_list],
+        "summary": {
+            "first": {"date": dates[0], "rate": values[0]},
+            "last": {"date": dates[-1], "rate": values[-1]},
+            "min": {"date": dates[min_index], "rate": values[min_index]},
+            "max": {"date": dates[max_index], "rate": values[max_index]},
+            "change_percent": rounded(change_percent),
+            "max_drawdown": {
+                "percent": rounded(drawdown_list[worst_index]),
+                "peak_date": dates[worst_peak_index],
+                "trough_date": dates[worst_index],
+            },
+            "volatility_daily": rounded(volatility),
+            "volatility_annualized": rounded(annualized),
+        },
+    }
@@ -4,14 +4,44 @@
 # ============================================================
 
 # --- Kütüphaneleri içe aktar / Import libraries ---
+import atexit
+import hashlib
 import logging
 import os
 import random
-from datetime import datetime, timedelta
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 
+import click
 import requests
-from flask import Flask, jsonify, request, send_from_directory
+from flask import Flask, Response, jsonify, request, stream_with_context
+from werkzeug.http import is_resource_modified
+
+import analytics
+import batch
+import broadcast
+import business_days
+import compression
+import ecb_import
+import money
+import providers
+import static_assets
+from cache import SingleFlight, TTLCache, VersionCache
+from cross_rates import MatrixRing, RateMatrix
+from history_store import HistoryStore, merge_intervals, parse_day
+from json_provider import FastJSONProvider
+from refresher import RateRefresher
+from shared_cache import SharedSnapshotFile
+
+# MessagePack isteğe bağlıdır; kurulu değilse ?format=msgpack kullanılamaz
+# MessagePack is optional; without it ?format=msgpack is unavailable
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
 
 # --- Log ayarları / Logging setup ---
 logging.basicConfig(level=logging.INFO)
@@ -20,6 +50,10 @@ logger = logging.getLogger(__name__)
 # --- Flask uygulamasını oluştur / Create Flask app ---
 app = Flask(__name__)
 
+# JSON yanıtları orjson ile yazılır (kurulu değilse standart json)
+# JSON responses are written with orjson (stdlib json if it is not installed)
+app.json = FastJSONProvider(app)
+
 
 # ============================================================
 # CORS Ayarları / CORS Settings
@@ -38,6 +72,15 @@ def add_cors_headers(response):
     return response
 
 
+@app.after_request
+def compress_body(response):
+    """
+    Yanıtı istemcinin kabul ettiği kodlamayla (brotli / gzip) sıkıştırır.
+    Compresses the response with an encoding the client accepts (brotli / gzip).
+    """
+    return compression.compress_response(request, response)
+
+
 # ============================================================
 # Sabitler ve Ayarlar / Constants and Settings
 # ============================================================
@@ -51,6 +94,16 @@ BASE_DIR = this_file.parent
 CURRENT_RATES_URL = "https://api.exchangerate-api.com/v4/latest"
 # Geçmiş veriler için (ücretsiz) / For historical data (free)
 HISTORICAL_URL = "https://api.frankfurter.app"
+# Aynı ECB verisini sunan ikinci Frankfurter adresi / Second Frankfurter host serving the same ECB data
+FRANKFURTER_DEV_URL = "https://api.frankfurter.dev/v1"
+
+# Güncel kur kaynakları (tercih sırasıyla, virgülle ayrılmış)
+# Current rate providers (in order of preference, comma separated)
+RATE_PROVIDERS = os.getenv("RATE_PROVIDERS", "exchangerate-api,frankfurter")
+
+# Geçmiş kur kaynakları (tercih sırasıyla, virgülle ayrılmış)
+# Historical rate providers (in order of preference, comma separated)
+HISTORY_PROVIDERS = os.getenv("HISTORY_PROVIDERS", "frankfurter,frankfurter-dev")
 
 # Gerçek geçmiş verileri kullan mı? / Use real historical data?
 # Ortam değişkeninden okunur, varsayılan: true
@@ -62,9 +115,97 @@ USE_REAL_HISTORICAL_DATA = (env_value == "true")
 # API bekleme süresi (saniye) / API timeout (seconds)
 API_TIMEOUT = 5.0
 
+# Güncel kurların önbellekte taze kalma süresi (saniye)
+# How long current rates stay fresh in the cache (seconds)
+RATE_CACHE_TTL = float(os.getenv("RATE_CACHE_TTL", "300"))
+
+# Süresi dolan kurların arka planda yenilenirken sunulabileceği ek süre (saniye)
+# Extra time expired rates may be served while refreshing in the background (seconds)
+RATE_CACHE_STALE_TTL = float(os.getenv("RATE_CACHE_STALE_TTL", "3600"))
+
+# Arka planda kur yenileme aralığı (saniye, 0 = kapalı)
+# Background rate refresh interval (seconds, 0 = disabled)
+RATE_REFRESH_INTERVAL = float(os.getenv("RATE_REFRESH_INTERVAL", "300"))
+
+# Canlı akış açılamadığında sayfanın kurları yoklama aralığı (saniye)
+# How often the page polls the rates when the live stream is unavailable (seconds)
+LIVE_POLL_INTERVAL = int(os.getenv("LIVE_POLL_INTERVAL", "60"))
+
+# Geçmiş kurların günlük yenilenme saati (UTC, ECB yayınından sonra)
+# Daily refresh time for historical rates (UTC, after ECB publication)
+HISTORY_REFRESH_TIME = os.getenv("HISTORY_REFRESH_TIME", "15:30")
+
+# İşçiler (worker) arası paylaşılan kur dosyası (boş = kapalı)
+# Rate snapshot file shared between workers (empty = disabled)
+SHARED_CACHE_PATH = os.getenv("SHARED_CACHE_PATH", str(BASE_DIR / "data" / "rates_snapshot.json"))
+
+# Paylaşılan dosyadaki verinin internete çıkmadan kullanılabileceği süre (saniye)
+# How long the shared snapshot is used without going to the internet (seconds)
+SHARED_CACHE_MAX_AGE = float(os.getenv("SHARED_CACHE_MAX_AGE", "60"))
+
+# Yeniden başlatmada kur verisinin okunduğu dosya (boş = kapalı)
+# File the rate snapshots are reloaded from on restart (empty = disabled)
+WARM_STATE_PATH = os.getenv("WARM_STATE_PATH", str(BASE_DIR / "data" / "warm_state.json"))
+
+# Bu süreden eski dosya başlangıçta kullanılmaz (saniye)
+# A file older than this is ignored at startup (seconds)
+WARM_STATE_MAX_AGE = float(os.getenv("WARM_STATE_MAX_AGE", "86400"))
+
+# Kur verisinin diske yazılma aralığı (saniye; kapanışta da yazılır)
+# How often the rate snapshots are written to disk (seconds; also written on shutdown)
+WARM_STATE_INTERVAL = float(os.getenv("WARM_STATE_INTERVAL", "300"))
+
+# İlk yenilemeye eklenen rastgele gecikme (aralığın oranı): sunucular aynı anda istek atmaz
+# Random delay added to the first refresh (share of the interval) so servers do not fetch at once
+REFRESH_JITTER_RATIO = 0.1
+
+# Tüm çapraz kurların hesaplandığı çapa para birimi
+# Anchor currency all cross rates are derived from
+ANCHOR_CURRENCY = os.getenv("ANCHOR_CURRENCY", "USD").upper()
+
+# Popüler pariteler için toplam bekleme süresi (saniye)
+# Overall deadline for the popular pairs endpoint (seconds)
+POPULAR_PAIRS_DEADLINE = float(os.getenv("POPULAR_PAIRS_DEADLINE", str(API_TIMEOUT)))
+
+# Paralel kur çekme için iş parçacığı sayısı
+# Number of worker threads for parallel rate fetching
+FETCH_WORKERS = int(os.getenv("FETCH_WORKERS", "8"))
+
+# Toplu dönüşümde izin verilen en fazla satır sayısı
+# Maximum number of rows allowed in a batch conversion
+BATCH_MAX_ROWS = int(os.getenv("BATCH_MAX_ROWS", "100000"))
+
+# 24 saatlik değişim için bellekte tutulan eski kur verisi sayısı
+# Number of past snapshots kept in memory for the 24h change
+SNAPSHOT_RING_SIZE = int(os.getenv("SNAPSHOT_RING_SIZE", "512"))
+
+# Değişimin hesaplandığı süre (saniye) / Window the change is computed over (seconds)
+CHANGE_WINDOW = 24 * 60 * 60
+
 # Varsayılan geçmiş veri gün sayısı / Default number of days for history
 DEFAULT_DAYS = 30
 
+# Geçmiş kurların saklandığı yerel veritabanı / Local database for historical rates
+HISTORY_DB_PATH = os.getenv("HISTORY_DB_PATH", str(BASE_DIR / "data" / "history.sqlite3"))
+
+# Bugünü içeren geçmiş verinin geçerlilik süresi (saniye)
+# How long historical data that includes today stays valid (seconds)
+HISTORY_RECENT_TTL = float(os.getenv("HISTORY_RECENT_TTL", "3600"))
+
+# Değişmeyen veriler (para birimi listesi) için tarayıcı önbellek süresi (saniye)
+# Browser cache lifetime for data that never changes at runtime (seconds)
+STATIC_DATA_MAX_AGE = 86400
+
+# Analiz sonuçlarının önbellek süresi (saniye) / Cache lifetime of analytics results (seconds)
+ANALYTICS_CACHE_TTL = float(os.getenv("ANALYTICS_CACHE_TTL", "600"))
+
+# Önbellekte tutulan en fazla analiz sonucu (her biri tam bir hareketli seri taşır)
+# Most analytics results kept in the cache (each holds a full rolling series)
+ANALYTICS_CACHE_SIZE = int(os.getenv("ANALYTICS_CACHE_SIZE", "256"))
+
+# Varsayılan hareketli pencere (gün) / Default rolling window (days)
+DEFAULT_WINDOW = 7
+
 # Sahte veri için rastgele değişim oranı (%2)
 # Random variation for fake data (2%)
 VARIATION = 0.02
@@ -98,15 +239,228 @@ CURRENCIES = {
     "NZD": {"name": "Yeni Zelanda Doları", "symbol": "NZ$"},
 }
 
+# --- Popüler pariteler / Popular pairs ---
+POPULAR_PAIRS = [
+    {"base": "USD", "quote": "TRY", "name": "Dolar/TL"},
+    {"base": "EUR", "quote": "TRY", "name": "Euro/TL"},
+    {"base": "GBP", "quote": "TRY", "name": "Sterlin/TL"},
+    {"base": "EUR", "quote": "USD", "name": "Euro/Dolar"},
+    {"base": "GBP", "quote": "USD", "name": "Sterlin/Dolar"},
+    {"base": "JPY", "quote": "USD", "name": "Yen/Dolar"},
+    {"base": "CHF", "quote": "USD", "name": "Frank/Dolar"},
+    {"base": "USD", "quote": "CAD", "name": "Dolar/Kanada Doları"},
+]
+
+# Yerel geçmiş kur deposu (ilk kullanımda açılır)
+# Local historical rate store (opened on first use)
+history_store = HistoryStore(HISTORY_DB_PATH, recent_ttl=HISTORY_RECENT_TTL)
+
+# İşçiler arası paylaşılan kur dosyası / Rate snapshot file shared between workers
+shared_snapshot = None
+if SHARED_CACHE_PATH:
+    shared_snapshot = SharedSnapshotFile(SHARED_CACHE_PATH)
+
+# Sıcak başlangıç dosyası / Warm start file
+warm_state = None
+if WARM_STATE_PATH:
+    warm_state = SharedSnapshotFile(WARM_STATE_PATH)
+
+# Paralel kur çekme havuzu / Pool for parallel rate fetching
+fetch_executor = ThreadPoolExecutor(max_workers=FETCH_WORKERS, thread_name_prefix="kurtakip-fetch")
+
+# Aynı (tarih, temel birim) için eşzamanlı geçmiş kur istekleri tek çağrıda birleşir
+# Concurrent historical lookups for the same (date, base) share a single call
+date_flight = SingleFlight()
+
+# Kaynak adı -> kaynak / Provider name -> provider
+PROVIDER_FACTORIES = {
+    "exchangerate-api": lambda: providers.ExchangeRateApiProvider(CURRENT_RATES_URL, API_TIMEOUT),
+    "frankfurter": lambda: providers.FrankfurterProvider(HISTORICAL_URL, API_TIMEOUT),
+    "frankfurter-dev": lambda: providers.FrankfurterProvider(FRANKFURTER_DEV_URL, API_TIMEOUT, name="frankfurter-dev"),
+}
+
+
+def require_all_currencies(provider, data):
+    """
+    Güncel kurlarda desteklenen tüm para birimleri olmalı; eksik sonuç reddedilir.
+    Current rates must cover every supported currency; a partial result is rejected.
+
+    Örn. Frankfurter (ECB) SAR, AED ve RUB yayınlamaz; böyle bir sonuç önbelleğe
+    girerse bu kodlar bir TTL boyunca kaybolurdu. Reddedilince sıradaki kaynak denenir.
+    E.g. Frankfurter (ECB) publishes no SAR, AED or RUB; if such a result were
+    cached those codes would vanish for a whole TTL. Once rejected the next provider is tried.
+
+    Hatalar / Raises:
+        providers.ProviderError: Eksik para birimi varsa / If any currency is missing
+    """
+    missing = [code for code in CURRENCIES if code not in data.get("rates", {})]
+    if missing:
+        raise providers.ProviderError(
+            provider.name + ": eksik para birimleri / missing currencies: " + ", ".join(missing)
+        )
+
+
+# Her veri türü için yedekli kaynak havuzu / Provider pool with failover for each data type
+history_provider_list = providers.build_providers(HISTORY_PROVIDERS, PROVIDER_FACTORIES)
+rate_providers = providers.ProviderPool(
+    providers.build_providers(RATE_PROVIDERS, PROVIDER_FACTORIES), "latest", validate=require_all_currencies
+)
+series_providers = providers.ProviderPool(history_provider_list, "series")
+date_providers = providers.ProviderPool(history_provider_list, "on_date")
+
 
 # ============================================================
 # Yardımcı Fonksiyonlar / Helper Functions
 # ============================================================
 
+def fetch_rates(base_currency):
+    """
+    İnternetten güncel döviz kurlarını çeker (önbelleksiz).
+    Fetches current exchange rates from the internet (uncached).
+
+    İlk kaynak yavaşsa ya da hata verirse sıradaki kaynak kullanılır.
+    The next provider is used when the first one is slow or fails.
+
+    Parametre / Parameter:
+        base_currency: Para birimi kodu / Currency code (örn: "USD")
+
+    Döndürür / Returns:
+        Başarılı ise: kur verileri (sözlük) / rate data (dictionary)
+        Hata varsa: None
+    """
+    try:
+        # Kaynakları sırayla / yedekli dene / Try the providers in order, with hedging
+        return rate_providers.call(base_currency)
+    except Exception as error:
+        # Tüm kaynaklar başarısız / Every provider failed
+        logger.error("Kur kaynakları başarısız / Rate providers failed: " + str(error))
+        return None
+
+
+def read_shared_snapshot(anchor_currency):
+    """
+    Paylaşılan dosyadaki kur verisini, yeterince yeniyse döndürür.
+    Returns the rate snapshot in the shared file if it is recent enough.
+
+    Döndürür / Returns:
+        Kur verisi (sözlük) ya da None / Rate data (dictionary) or None
+    """
+    if shared_snapshot is None:
+        return None
+
+    snapshot = shared_snapshot.read_fresh(SHARED_CACHE_MAX_AGE)
+    if snapshot is None or snapshot.get("base") != anchor_currency:
+        return None
+    return snapshot
+
+
+def fetch_rate_matrix(anchor_currency):
+    """
+    Çapa para biriminin kurlarını alır ve tüm pariteleri hesaplar.
+    Gets the anchor currency's rates and computes every pair.
+
+    Paylaşılan dosya açıksa önce ona bakılır; internetten sadece bir süreç
+    çeker ve sonucu diğer işçiler için dosyaya yazar.
+    If the shared file is enabled it is checked first; only one process
+    fetches from the internet and writes the result for the other workers.
+
+    Parametre / Parameter:
+        anchor_currency: Çapa para birimi / Anchor currency (örn: "USD")
+
+    Döndürür / Returns:
+        Başarılı ise: RateMatrix / On success: RateMatrix
+        Hata varsa: None
+    """
+    if shared_snapshot is None:
+        snapshot = fetch_rates(anchor_currency)
+        return RateMatrix.from_snapshot(snapshot, CURRENCIES)
+
+    snapshot = read_shared_snapshot(anchor_currency)
+    if snapshot is None:
+        with shared_snapshot.lock():
+            # Biz beklerken başka bir işçi çekmiş olabilir
+            # Another worker may have fetched it while we waited
+            snapshot = read_shared_snapshot(anchor_currency)
+            if snapshot is None:
+                snapshot = fetch_rates(anchor_currency)
+                if snapshot is None:
+                    return None
+                shared_snapshot.write(snapshot)
+
+    return RateMatrix.from_snapshot(snapshot, CURRENCIES)
+
+
+# Yeni kur verisini canlı akış abonelerine dağıtır
+# Fans new rate snapshots out to the live stream subscribers
+rate_broadcaster = broadcast.RateBroadcaster()
+
+# WSGI modunda açık akışlar (her biri bir işçi iş parçacığı tutar)
+# Open streams in WSGI mode (each holds a worker thread)
+wsgi_streams = broadcast.StreamSlots(broadcast.SSE_WSGI_MAX_STREAMS)
+
+# ASGI girişi akışları olay döngüsünde sunar (asgi.py True yapar)
+# The ASGI entry point serves streams on the event loop (set to True by asgi.py)
+app.config["ASYNC_STREAMS"] = False
+
+# 24 saatlik değişim için son kur verileri / Recent snapshots for the 24h change
+snapshot_ring = MatrixRing(SNAPSHOT_RING_SIZE)
+
+
+def publish_rate_matrix(anchor_currency, matrix):
+    """
+    Önbelleğe yeni yazılan kur matrisini halka tampona ve canlı akışa iletir.
+    Passes a newly cached rate matrix to the ring buffer and the live stream.
+    """
+    snapshot_ring.add(matrix)
+    rate_broadcaster.publish(matrix)
+
+
+# Güncel kur matrisi önbelleği (tek anahtar: çapa para birimi)
+# Current rate matrix cache (single key: the anchor currency)
+# /api/rates yanıt gövdeleri: kur verisi başına, temel birim başına bir kez yazılır
+# /api/rates response bodies: encoded once per rate snapshot and base currency
+rates_body_cache = VersionCache()
+
+rate_cache = TTLCache(
+    loader=lambda anchor_currency: fetch_rate_matrix(anchor_currency),
+    ttl=RATE_CACHE_TTL,
+    stale_ttl=RATE_CACHE_STALE_TTL,
+    on_put=publish_rate_matrix,
+)
+
+
+def get_rate_matrix():
+    """
+    Güncel kur matrisini önbellekten döndürür, gerekirse internetten çeker.
+    Returns the current rate matrix from the cache, fetching it if needed.
+
+    Aynı anda gelen istekler tek bir API çağrısında birleştirilir.
+    Concurrent requests are coalesced into a single API call.
+    Arka plan yenileyici çalışıyorsa yayınlanmış veri doğrudan kullanılır
+    ve istek hiç internete çıkmaz. Veri RATE_CACHE_TTL + RATE_CACHE_STALE_TTL
+    süresinden eskiyse (örn. kaynak uzun süre yanıt vermiyorsa) kullanılmaz;
+    istek yeniden çekmeyi dener, o da olmazsa hata döner.
+    While the background refresher runs the published snapshot is used
+    directly and the request never goes to the network. A snapshot older than
+    RATE_CACHE_TTL + RATE_CACHE_STALE_TTL (e.g. while the upstream is down) is
+    not served: the request tries to fetch again and fails if that fails too.
+
+    Döndürür / Returns:
+        Başarılı ise: RateMatrix / On success: RateMatrix
+        Hata varsa: None
+    """
+    if rate_refresher.is_running():
+        matrix = rate_cache.peek(ANCHOR_CURRENCY, max_age=RATE_CACHE_TTL + RATE_CACHE_STALE_TTL)
+        if matrix is not None:
+            return matrix
+
+    return rate_cache.get(ANCHOR_CURRENCY)
+
+
 def get_rates(base_currency):
     """
-    İnternetten güncel döviz kurlarını çeker.
-    Fetches current exchange rates from the internet.
+    Bir para biriminin güncel kurlarını kur matrisinden döndürür.
+    Returns current exchange rates for a currency from the rate matrix.
 
     Parametre / Parameter:
         base_currency: Para birimi kodu / Currency code (örn: "USD")
@@ -115,29 +469,112 @@ def get_rates(base_currency):
         Başarılı ise: kur verileri (sözlük) / rate data (dictionary)
         Hata varsa: None
     """
-    # API adresini oluştur / Build API URL
-    url = CURRENT_RATES_URL + "/" + base_currency
+    matrix = get_rate_matrix()
+    if matrix is None:
+        return None
 
-    try:
-        # İnternete istek gönder / Send request to internet
-        response = requests.get(url, timeout=API_TIMEOUT)
+    return matrix_rates(matrix, base_currency)
 
-        # 200 = başarılı istek / 200 = successful request
-        if response.status_code == 200:
-            data = response.json()
-            return data
-        else:
-            logger.error("API hatası / API error: " + str(response.status_code))
-            return None
 
-    except requests.Timeout:
-        # İnternet çok yavaş / Internet too slow
-        logger.error("API zaman aşımı / API timeout: " + base_currency)
+def matrix_rates(matrix, base_currency):
+    """
+    Bir para biriminin kurlarını verilen matristen okur.
+    Reads a currency's rates from the given matrix.
+
+    Döndürür / Returns:
+        Kur verileri (sözlük) ya da birim matriste yoksa None
+        Rate data (dictionary), or None if the currency is not in the matrix
+    """
+    rates = matrix.row(base_currency)
+    if rates is None:
         return None
-    except Exception as error:
-        # Başka bir hata oldu / Some other error happened
-        logger.error("Hata / Error: " + str(error))
+
+    return {
+        "base": base_currency,
+        "date": matrix.date,
+        "rates": rates
+    }
+
+
+def get_rates_many(base_currencies, deadline):
+    """
+    Birden fazla para biriminin kurlarını tek bir kur matrisinden döndürür.
+    Returns rates for several currencies from a single rate matrix.
+
+    Matris bir kez alınır (gerekirse tek bir API çağrısıyla); tüm satırlar
+    aynı kur verisinden gelir. Süre dolarsa boş sonuç döner.
+    The matrix is fetched once (with a single API call if needed) and every
+    row comes from the same snapshot. An empty result is returned past the deadline.
+
+    Parametreler / Parameters:
+        base_currencies: Para birimi kodları / Currency codes (örn: ["USD", "EUR", "USD"])
+        deadline: Toplam bekleme süresi (saniye) / Overall deadline (seconds)
+
+    Döndürür / Returns:
+        {kod: kur verileri} sözlüğü / {code: rate data} dictionary
+    """
+    # Yavaş bir kaynak isteği süreden fazla bekletmesin / A slow upstream must not hold the request past the deadline
+    future = fetch_executor.submit(get_rate_matrix)
+    done, _ = wait([future], timeout=deadline)
+    if future not in done:
+        logger.warning("Kur isteği zaman aşımına uğradı / Rate request missed the deadline")
+        return {}
+    if future.exception() is not None:
+        logger.error("Kur hatası / Rate error: " + str(future.exception()))
+        return {}
+
+    matrix = future.result()
+    if matrix is None:
+        return {}
+
+    # Tekrarları çıkar (sırayı koru) / Remove duplicates (keep order)
+    results = {}
+    for code in dict.fromkeys(base_currencies):
+        data = matrix_rates(matrix, code)
+        if data is not None:
+            results[code] = data
+
+    return results
+
+
+def reference_rate(base_currency, quote_currency, now):
+    """
+    24 saat önceki kuru yerel veriden bulur (internete çıkmaz).
+    Finds the rate from 24 hours ago in local data (never goes to the network).
+
+    Önce bellekteki eski kur verilerine, yoksa geçmiş kur deposundaki
+    dünkü kura bakılır.
+    Looks at the past snapshots in memory first, then at yesterday's fixing
+    in the historical store.
+
+    Döndürür / Returns:
+        Kur ya da bilinmiyorsa None / Rate, or None if unknown
+    """
+    matrix = snapshot_ring.at(now - CHANGE_WINDOW)
+    if matrix is not None:
+        rate = matrix.rate(base_currency, quote_currency)
+        if rate is not None:
+            return rate
+
+    yesterday = datetime.fromtimestamp(now).date() - timedelta(days=1)
+    stored = history_store.get_rate_on(base_currency, quote_currency, yesterday)
+    if stored is None:
         return None
+    return stored["rate"]
+
+
+def change_24h(base_currency, quote_currency, rate, now):
+    """
+    Kurun son 24 saatteki yüzde değişimini hesaplar.
+    Computes the rate's percentage change over the last 24 hours.
+
+    Döndürür / Returns:
+        Yüzde değişim ya da eski kur bilinmiyorsa None / Percent change, or None if the old rate is unknown
+    """
+    old_rate = reference_rate(base_currency, quote_currency, now)
+    if not old_rate:
+        return None
+    return round((rate - old_rate) / old_rate * 100, 4)
 
 
 def is_valid_currency(currency_code):
@@ -158,10 +595,160 @@ def is_valid_currency(currency_code):
         return False
 
 
+def request_rounding():
+    """
+    İstekteki "rounding" parametresini okur (yoksa ROUNDING_MODE).
+    Reads the request's "rounding" parameter (ROUNDING_MODE if missing).
+
+    Hatalar / Raises:
+        ValueError: Kip bilinmiyorsa / If the mode is unknown
+    """
+    return money.parse_rounding(request.args.get("rounding", money.ROUNDING_MODE))
+
+
+# ============================================================
+# Koşullu GET / Conditional GET
+# Tekrarlanan isteklerde veri değişmediyse sadece 304 döner
+# Repeat requests get a bare 304 when the data has not changed
+# ============================================================
+
+def make_etag(*parts):
+    """
+    Parçalardan kısa, kararlı bir ETag üretir.
+    Builds a short, stable ETag from the given parts.
+    """
+    digest = hashlib.blake2b(digest_size=12)
+    for part in parts:
+        digest.update(str(part).encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def rates_max_age(matrix):
+    """
+    Kur verisinin bir sonraki yenilemeye kadar kalan süresi (saniye).
+    Seconds left until the rate snapshot is next refreshed.
+    """
+    if rate_refresher.is_running():
+        interval = RATE_REFRESH_INTERVAL
+    else:
+        interval = RATE_CACHE_TTL
+
+    age = time.time() - matrix.created_at
+    return max(0, int(interval - age))
+
+
+def history_range(points):
+    """
+    Geçmiş verinin kapsadığı aralığı özetler (ETag için).
+    Summarizes the range covered by historical data (for ETags).
+
+    Parametre / Parameter:
+        points: [{"date": "...", "rate": ...}, ...]
+    """
+    if len(points) == 0:
+        return "empty"
+    return (points[0]["date"], points[-1]["date"], len(points), points[-1]["rate"])
+
+
+def series_range(columns):
+    """
+    Sütun biçimli geçmiş verinin kapsadığı aralığı özetler (ETag için).
+    Summarizes the range covered by columnar historical data (for ETags).
+
+    Parametre / Parameter:
+        columns: {"dates": [...], "series": {"TRY": [...], ...}}
+    """
+    dates = columns["dates"]
+    if len(dates) == 0:
+        return "empty"
+
+    last_values = []
+    for code in sorted(columns["series"]):
+        last_values.append(columns["series"][code][-1])
+    return (dates[0], dates[-1], len(dates), last_values)
+
+
+def conditional_json(etag, build_payload, max_age, last_modified=None, render=jsonify):
+    """
+    ETag / Last-Modified ile koşullu JSON yanıtı oluşturur.
+    Builds a conditional JSON response with ETag / Last-Modified.
+
+    İstemcinin kopyası güncelse gövde hiç oluşturulmaz ve 304 döner.
+    If the client's copy is current the body is never built and 304 is returned.
+
+    Parametreler / Parameters:
+        etag: Verinin sürümü / Version of the data
+        build_payload: Gövdeyi üreten fonksiyon / Function building the body
+        max_age: Cache-Control max-age (saniye / seconds)
+        last_modified: Verinin değiştiği zaman (unix, isteğe bağlı) / When the data changed (unix, optional)
+        render: Gövdeyi yanıta çeviren fonksiyon / Function turning the body into a response
+    """
+    if last_modified is not None:
+        last_modified = datetime.fromtimestamp(int(last_modified), timezone.utc)
+
+    if is_resource_modified(request.environ, etag=etag, last_modified=last_modified):
+        response = render(build_payload())
+    else:
+        response = app.response_class(status=304)
+
+    response.set_etag(etag)
+    if last_modified is not None:
+        response.last_modified = last_modified
+    response.cache_control.public = True
+    response.cache_control.max_age = max_age
+    return response
+
+
+def fetch_historical_series(base_currency, quote_currencies, start_date, end_date):
+    """
+    Geçmiş kur kaynaklarından birden fazla hedef para biriminin kurlarını tek istekte çeker (önbelleksiz).
+    Fetches rates for several target currencies in one request from the historical providers (uncached).
+
+    Parametreler / Parameters:
+        base_currency: Temel para birimi / Base currency (örn: "USD")
+        quote_currencies: Hedef para birimleri / Target currencies (örn: ["TRY", "EUR"])
+        start_date: Başlangıç tarihi / Start date
+        end_date: Bitiş tarihi / End date
+
+    Döndürür / Returns:
+        Başarılı ise: {"TRY": {"2024-12-02": 34.6, ...}, ...} / On success: quote -> date -> rate
+        Hata varsa: None
+    """
+    try:
+        return series_providers.call(base_currency, quote_currencies, start_date, end_date)
+    except Exception as error:
+        logger.error(
+            "Geçmiş veri hatası / Historical data error: " + base_currency + "/"
+            + ",".join(quote_currencies) + ": " + str(error)
+        )
+        return None
+
+
+def fetch_historical_range(base_currency, quote_currency, start_date, end_date):
+    """
+    Geçmiş kur kaynaklarından bir tarih aralığının kurlarını çeker (önbelleksiz).
+    Fetches rates for a date range from the historical providers (uncached).
+
+    Döndürür / Returns:
+        Başarılı ise: {"2024-12-02": 34.6, ...} / On success: date -> rate
+        Hata varsa: None
+    """
+    series = fetch_historical_series(base_currency, [quote_currency], start_date, end_date)
+    if series is None:
+        return None
+    return series[quote_currency]
+
+
 def get_historical_rates(base_currency, quote_currency, day_count):
     """
-    Frankfurter API'den geçmiş kur verilerini çeker.
-    Fetches historical rate data from Frankfurter API.
+    Geçmiş kur verilerini yerel depodan, yoksa Frankfurter API'den getirir.
+    Returns historical rate data from the local store, or from Frankfurter API.
+
+    Sadece yerelde olmayan alt aralıklar çekilir (her boşluk için tek istek) ve
+    depoya yazılır; böylece kayan pencereler sadece yeni günleri indirir.
+    Only the sub-ranges missing locally are fetched (one request per gap) and
+    written to the store, so sliding windows only download the new days.
 
     Parametreler / Parameters:
         base_currency: Temel para birimi / Base currency (örn: "USD")
@@ -172,85 +759,245 @@ def get_historical_rates(base_currency, quote_currency, day_count):
         Başarılı ise: tarih ve kur listesi / list of date and rate
         Hata varsa: None
     """
-    try:
-        # Tarih aralığını hesapla / Calculate date range
-        today = datetime.now()
-        start_date = today - timedelta(days=day_count)
+    # Tarih aralığını hesapla / Calculate date range
+    end_date = datetime.now().date()
+    start_date = end_date - timedelta(days=day_count)
+
+    # Yerelde olmayan boşlukları internetten çek / Fetch the gaps not known locally
+    gaps = history_store.missing_ranges(base_currency, quote_currency, start_date, end_date)
+    for gap_start, gap_end in gaps:
+        # Sadece hafta sonu / tatil olan boşluklarda kur yayınlanmaz
+        # Gaps made of weekends / holidays only have no fixings to fetch
+        if not business_days.has_business_day(gap_start, gap_end):
+            history_store.mark_covered(base_currency, quote_currency, gap_start, gap_end)
+            continue
+
+        fetched = fetch_historical_range(base_currency, quote_currency, gap_start, gap_end)
+        if fetched is None:
+            return None
 
-        # Tarihleri yazıya çevir / Convert dates to text
-        start_date_text = start_date.strftime('%Y-%m-%d')
-        end_date_text = today.strftime('%Y-%m-%d')
+        history_store.save_rates(base_currency, quote_currency, fetched)
+        history_store.mark_covered(base_currency, quote_currency, gap_start, gap_end)
 
-        # API adresini oluştur / Build API URL
-        url = HISTORICAL_URL + "/" + start_date_text + ".." + end_date_text
+    result_list = history_store.get_rates(base_currency, quote_currency, start_date, end_date)
 
-        # API parametreleri / API parameters
-        api_params = {"from": base_currency, "to": quote_currency}
+    # Hafta sonu ve tatillerde kur yoksa normaldir; sadece eksik iş günlerini bildir
+    # Weekends and holidays have no fixings; only report missing business days
+    expected = len(business_days.business_days_between(start_date, effective_fixing_date(end_date)))
+    if len(result_list) < expected:
+        logger.info(
+            str(expected - len(result_list)) + " iş günü eksik / business days missing: "
+            + base_currency + "/" + quote_currency
+        )
 
-        # İstek gönder (geçmiş veri daha uzun sürebilir)
-        # Send request (historical data may take longer)
-        long_timeout = API_TIMEOUT * 2
-        response = requests.get(url, params=api_params, timeout=long_timeout)
+    # Sonuç var mı? / Any results?
+    if len(result_list) > 0:
+        return result_list
+    else:
+        return None
 
-        # Yanıt başarılı mı? / Is response successful?
-        if response.status_code != 200:
-            logger.error("Frankfurter API hatası: " + str(response.status_code))
-            return None
 
-        data = response.json()
+def get_historical_series(base_currency, quote_currencies, day_count):
+    """
+    Birden fazla hedef para biriminin geçmiş kurlarını ortak bir tarih ekseninde getirir.
+    Returns historical rates for several target currencies on a shared date axis.
 
-        # Yanıtta "rates" anahtarı var mı? / Does response have "rates" key?
-        if "rates" not in data:
-            logger.error("API'den beklenmeyen yanıt / Unexpected API response")
-            return None
+    Yerelde olmayan boşluklar birleştirilir ve her boşluk, o boşluğa ihtiyaç duyan
+    tüm hedefler için tek istekte çekilir.
+    Missing gaps are merged and each gap is fetched in a single request for all
+    targets that need it.
 
-        # Verileri tarihe göre sırala / Sort data by date
-        rates_data = data["rates"]
-        result_list = []
-
-        all_dates = list(rates_data.keys())
-        all_dates.sort()
-
-        for current_date in all_dates:
-            day_rates = rates_data[current_date]
-
-            # Bu tarihte hedef para birimi var mı? / Does this date have the target currency?
-            if quote_currency in day_rates:
-                rate_value = day_rates[quote_currency]
-                rate_value = float(rate_value)
-
-                item = {
-                    "date": current_date,
-                    "rate": rate_value
-                }
-                result_list.append(item)
-
-        # Hafta sonları veri olmayabilir, bu normal
-        # Weekends may have no data, that's normal
-        if len(result_list) < day_count:
-            logger.info(
-                str(len(result_list)) + " gün veri bulundu / days of data found "
-                "(hafta sonları hariç / weekends excluded)"
-            )
-
-        # Sonuç var mı? / Any results?
-        if len(result_list) > 0:
-            return result_list
-        else:
+    Parametreler / Parameters:
+        base_currency: Temel para birimi / Base currency (örn: "USD")
+        quote_currencies: Hedef para birimleri / Target currencies (örn: ["TRY", "EUR"])
+        day_count: Kaç günlük veri / How many days of data
+
+    Döndürür / Returns:
+        Başarılı ise: {"dates": [...], "series": {"TRY": [...], ...}}
+        (eksik günler None) / (missing days are None)
+        Hata varsa: None
+    """
+    # Tarih aralığını hesapla / Calculate date range
+    end_date = datetime.now().date()
+    start_date = end_date - timedelta(days=day_count)
+
+    # Her hedefin boşluklarını bul / Find each target's gaps
+    gaps_by_quote = {}
+    all_gaps = []
+    for quote_currency in quote_currencies:
+        gaps = history_store.missing_ranges(base_currency, quote_currency, start_date, end_date)
+        gaps_by_quote[quote_currency] = gaps
+        all_gaps.extend(gaps)
+
+    # Boşlukları birleştir, her biri için tek istek at
+    # Merge the gaps and send one request for each
+    for gap_start, gap_end, _ in merge_intervals([(gap[0], gap[1], 0) for gap in all_gaps]):
+        # Sadece hafta sonu / tatil olan boşluklarda kur yayınlanmaz
+        # Gaps made of weekends / holidays only have no fixings to fetch
+        if not business_days.has_business_day(gap_start, gap_end):
+            for quote_currency in quote_currencies:
+                history_store.mark_covered(base_currency, quote_currency, gap_start, gap_end)
+            continue
+
+        needed = []
+        for quote_currency in quote_currencies:
+            for quote_gap_start, quote_gap_end in gaps_by_quote[quote_currency]:
+                if quote_gap_start <= gap_end and quote_gap_end >= gap_start:
+                    needed.append(quote_currency)
+                    break
+
+        fetched = fetch_historical_series(base_currency, needed, gap_start, gap_end)
+        if fetched is None:
             return None
 
-    except requests.Timeout:
-        logger.error("API zaman aşımı / timeout: " + base_currency + "/" + quote_currency)
+        for quote_currency in needed:
+            history_store.save_rates(base_currency, quote_currency, fetched[quote_currency])
+            history_store.mark_covered(base_currency, quote_currency, gap_start, gap_end)
+
+    # Ortak tarih eksenini oluştur / Build the shared date axis
+    rates_by_quote = {}
+    all_dates = set()
+    for quote_currency in quote_currencies:
+        rows = history_store.get_rates(base_currency, quote_currency, start_date, end_date)
+        day_rates = {}
+        for row in rows:
+            day_rates[row["date"]] = row["rate"]
+        rates_by_quote[quote_currency] = day_rates
+        all_dates.update(day_rates)
+
+    if len(all_dates) == 0:
         return None
-    except Exception as error:
-        logger.error("Geçmiş veri hatası / Historical data error: " + str(error))
+
+    dates = sorted(all_dates)
+    series = {}
+    for quote_currency in quote_currencies:
+        day_rates = rates_by_quote[quote_currency]
+        series[quote_currency] = [day_rates.get(day_text) for day_text in dates]
+
+    return {"dates": dates, "series": series}
+
+
+def fetch_rates_on_date(base_currency, date_text):
+    """
+    Geçmiş kur kaynaklarından belirli bir tarihteki tüm kurları çeker (önbelleksiz).
+    Fetches all rates on a specific date from the historical providers (uncached).
+
+    Hafta sonu ya da tatil günleri için API bir önceki iş gününün kurunu döndürür.
+    For weekends or holidays the API returns the previous business day's rate.
+
+    Tüm kaynaklar başarısız olursa son hata yukarı iletilir.
+    If every provider fails the last error is raised to the caller.
+
+    Döndürür / Returns:
+        {"date": kurun tarihi / fixing date, "rates": {"TRY": 34.6, ...}}
+    """
+    data = date_providers.call(base_currency, date_text)
+
+    # Sadece desteklenen para birimleri / Only supported currencies
+    rates = {}
+    for code, rate in data["rates"].items():
+        if code in CURRENCIES and code != base_currency:
+            rates[code] = rate
+
+    return {"date": data["date"], "rates": rates}
+
+
+def load_rates_on_date(base_currency, date_text):
+    """
+    Bir tarihteki tüm kurları çeker ve her parite için yerel depoya yazar.
+    Fetches all rates on a date and writes them to the local store for every pair.
+
+    Böylece aynı gün için başka bir hedef soran istekler internete çıkmaz.
+    Requests asking for another target on the same day then stay offline.
+    """
+    requested_day = datetime.strptime(date_text, "%Y-%m-%d").date()
+    fetched = fetch_rates_on_date(base_currency, date_text)
+
+    # Kurun tarihinden istenen güne kadar başka kur yok
+    # No other fixing exists between the fixing date and the requested day
+    fixing_day = datetime.strptime(fetched["date"], "%Y-%m-%d").date()
+    for quote_currency, rate in fetched["rates"].items():
+        history_store.save_rates(base_currency, quote_currency, {fetched["date"]: rate})
+        if fixing_day <= requested_day:
+            history_store.mark_covered(base_currency, quote_currency, fixing_day, requested_day)
+
+    return fetched
+
+
+# İlk ECB kurundan önceki tarihler için hata mesajı
+# Error message for dates before the first ECB fixing
+EARLIEST_DATE_ERROR = (
+    "ECB kurları " + business_days.FIRST_FIXING_DATE.isoformat() + " tarihinden başlar"
+    " / ECB fixings start on " + business_days.FIRST_FIXING_DATE.isoformat()
+)
+
+
+def effective_fixing_date(day):
+    """
+    Bir gün için geçerli ECB kurunun tarihini internete çıkmadan bulur.
+    Finds the date of the ECB fixing that applies on a day, without a network call.
+
+    Hafta sonu ve tatillerde bir önceki iş günü; bugünün kuru henüz
+    yayınlanmadıysa (HISTORY_REFRESH_TIME öncesi) bir önceki iş günü döner.
+    Weekends and holidays map to the previous business day; so does today
+    while its fixing is not published yet (before HISTORY_REFRESH_TIME).
+    """
+    fixing_day = business_days.fixing_date(day)
+
+    now = datetime.now(timezone.utc)
+    if fixing_day >= now.date() and (now.hour, now.minute) < parse_time_of_day(HISTORY_REFRESH_TIME):
+        fixing_day = business_days.fixing_date(now.date() - timedelta(days=1))
+
+    return fixing_day
+
+
+def get_rate_on_date(base_currency, quote_currency, date_text):
+    """
+    Belirli bir tarihteki kuru yerel depodan, yoksa Frankfurter API'den getirir.
+    Returns the rate on a specific date from the local store, or from Frankfurter API.
+
+    İstek önce geçerli kur gününe çevrilir; böylece aynı iş gününe düşen tarihler
+    (örn. cumartesi ve pazar) aynı kaydı ve aynı API çağrısını paylaşır.
+    The request is first resolved to its fixing date, so dates that fall on the
+    same business day (e.g. Saturday and Sunday) share one record and one API call.
+
+    Parametreler / Parameters:
+        base_currency: Temel para birimi / Base currency (örn: "USD")
+        quote_currency: Hedef para birimi / Target currency (örn: "TRY")
+        date_text: Tarih / Date ("YYYY-MM-DD")
+
+    Döndürür / Returns:
+        Başarılı ise: {"date": kurun tarihi / fixing date, "rate": kur / rate}
+        Kur yoksa: None
+    """
+    requested_day = datetime.strptime(date_text, "%Y-%m-%d").date()
+
+    stored = history_store.get_rate_on(base_currency, quote_currency, requested_day)
+    if stored is not None:
+        return stored
+
+    fixing_day = effective_fixing_date(requested_day)
+    if fixing_day != requested_day:
+        stored = history_store.get_rate_on(base_currency, quote_currency, fixing_day)
+        if stored is not None:
+            return stored
+
+    fixing_text = fixing_day.isoformat()
+    fetched = date_flight.do(
+        (fixing_text, base_currency),
+        lambda: load_rates_on_date(base_currency, fixing_text),
+    )
+
+    rate = fetched["rates"].get(quote_currency)
+    if rate is None:
         return None
+    return {"date": fetched["date"], "rate": rate}
 
 
 def make_fake_history(current_rate, day_count):
     """
-    Sahte geçmiş veri üretir (gerçek veri alınamazsa kullanılır).
-    Generates fake historical data (used when real data is unavailable).
+    Sahte geçmiş veri üretir (sadece USE_REAL_HISTORICAL_DATA kapalıyken kullanılır).
+    Generates fake historical data (used only while USE_REAL_HISTORICAL_DATA is off).
 
     Parametreler / Parameters:
         current_rate: Bugünkü kur / Today's rate (örn: 32.50)
@@ -280,33 +1027,281 @@ def make_fake_history(current_rate, day_count):
     return fake_data
 
 
+def load_analytics(key):
+    """
+    Bir döviz çifti ve pencere için analiz sonucunu hesaplar (önbellek yükleyicisi).
+    Computes the analytics for a pair and window (cache loader).
+
+    Parametre / Parameter:
+        key: (temel / base, hedef / quote, gün / days, pencere / window)
+
+    Döndürür / Returns:
+        Analiz sonucu ya da veri yoksa None / Analytics result, or None without data
+    """
+    base_currency, quote_currency, day_count, window = key
+
+    note = "Gerçek veri (Frankfurter.app) / Real data from Frankfurter.app"
+    if USE_REAL_HISTORICAL_DATA:
+        # Kaynaklar başarısızsa sahte veriyle analiz yapılmaz / No analytics on fake data if the providers fail
+        points = get_historical_rates(base_currency, quote_currency, day_count)
+        if points is None:
+            return None
+    else:
+        # Gerçek veri kapalıysa sahte veri üret / With real data disabled, generate fake data
+        data = get_rates(base_currency)
+        if data is None:
+            return None
+
+        current_rate = data["rates"].get(quote_currency)
+        if current_rate is None:
+            current_rate = 1.0
+        points = make_fake_history(current_rate, day_count)
+        note = "Simüle edilmiş veri / Simulated data"
+
+    result = analytics.summarize(points, window)
+    if result is None:
+        return None
+
+    result["base"] = base_currency
+    result["quote"] = quote_currency
+    result["days"] = day_count
+    result["note"] = note
+    return result
+
+
+# Analiz önbelleği: anahtar (çift, gün, pencere) / Analytics cache keyed by (pair, days, window)
+analytics_cache = TTLCache(loader=load_analytics, ttl=ANALYTICS_CACHE_TTL, maxsize=ANALYTICS_CACHE_SIZE)
+
+
+# ============================================================
+# Arka Plan Görevleri / Background Tasks
+# ============================================================
+
+# Kur verisinin en son diske yazıldığı zaman / When the rate snapshots were last saved
+warm_state_saved = {"at": 0.0}
+
+
+def save_warm_state():
+    """
+    Son kur verilerini (24 saatlik halka tampon dahil) diske yazar.
+    Writes the recent rate snapshots (including the 24h ring buffer) to disk.
+
+    Döndürür / Returns:
+        Yazıldıysa True / True if written
+    """
+    if warm_state is None:
+        return False
+
+    matrices = snapshot_ring.items()
+    if len(matrices) == 0:
+        return False
+
+    snapshots = []
+    for matrix in matrices:
+        snapshots.append(matrix.to_snapshot())
+
+    warm_state.write({"anchor": ANCHOR_CURRENCY, "snapshots": snapshots})
+    warm_state_saved["at"] = time.time()
+    return True
+
+
+def load_warm_state():
+    """
+    Diskteki son kur verilerini belleğe alır (yeniden başlatmadan sonra).
+    Loads the recent rate snapshots from disk (after a restart).
+
+    Dosya WARM_STATE_MAX_AGE'den eskiyse kullanılmaz. Son kur verisi,
+    çekildiği andaki yaşıyla önbelleğe girer: eskiyse bayat sayılır ve
+    istekler beklemeden sunulurken yenilenir.
+    A file older than WARM_STATE_MAX_AGE is ignored. The latest snapshot
+    enters the cache with its real age: if it is old it counts as stale and
+    is refreshed while requests are still served without waiting.
+
+    Döndürür / Returns:
+        Önbelleğe alınan RateMatrix ya da None / The cached RateMatrix, or None
+    """
+    if warm_state is None:
+        return None
+
+    result = warm_state.read()
+    if result is None:
+        return None
+
+    data, written_at = result
+    if time.time() - written_at >= WARM_STATE_MAX_AGE or data.get("anchor") != ANCHOR_CURRENCY:
+        return None
+
+    matrix = None
+    for snapshot in data.get("snapshots", []):
+        loaded = RateMatrix.from_snapshot(snapshot, CURRENCIES)
+        if loaded is not None:
+            snapshot_ring.add(loaded)
+            matrix = loaded
+
+    if matrix is None:
+        return None
+
+    # Önbelleğin sunabileceğinden eski veri sadece 24 saatlik değişim için kalır
+    # Data older than the cache would serve is only kept for the 24h change
+    age = max(0.0, time.time() - matrix.created_at)
+    if age >= RATE_CACHE_TTL + RATE_CACHE_STALE_TTL:
+        return None
+
+    rate_cache.put(ANCHOR_CURRENCY, matrix, age=age)
+    logger.info("Kur verisi diskten yüklendi / Rates loaded from disk (" + str(int(age)) + " s)")
+    return matrix
+
+
+def refresh_current_rates():
+    """
+    Güncel kur matrisini internetten yeniler ve önbelleğe yayınlar.
+    Refreshes the current rate matrix from the internet and publishes it to the cache.
+    """
+    matrix = rate_cache.refresh(ANCHOR_CURRENCY)
+    if matrix is None:
+        logger.warning("Kurlar yenilenemedi / Could not refresh rates")
+
+    # Belli aralıklarla diske yaz / Save to disk every so often
+    if time.time() - warm_state_saved["at"] >= WARM_STATE_INTERVAL:
+        save_warm_state()
+
+
+def refresh_recent_history(day_count=7):
+    """
+    Popüler paritelerin son günlerinin geçmiş kurlarını yeniler.
+    Refreshes the recent historical rates of the popular pairs.
+
+    Her temel para birimi için tek istek atılır.
+    One request is sent per base currency.
+    """
+    end_date = datetime.now().date()
+    start_date = end_date - timedelta(days=day_count)
+
+    # Hedefleri temel birime göre grupla / Group targets by base currency
+    quotes_by_base = {}
+    for pair in POPULAR_PAIRS:
+        quotes = quotes_by_base.setdefault(pair["base"], [])
+        if pair["quote"] not in quotes:
+            quotes.append(pair["quote"])
+
+    for base_currency, quote_currencies in quotes_by_base.items():
+        fetched = fetch_historical_series(base_currency, quote_currencies, start_date, end_date)
+        if fetched is None:
+            continue
+
+        for quote_currency in quote_currencies:
+            history_store.save_rates(base_currency, quote_currency, fetched[quote_currency])
+            history_store.mark_covered(base_currency, quote_currency, start_date, end_date)
+
+
+def parse_time_of_day(text):
+    """
+    "SS:DD" yazısını (saat, dakika) ikilisine çevirir.
+    Converts "HH:MM" text to an (hour, minute) pair.
+    """
+    hour_text, minute_text = text.split(":")
+    return (int(hour_text), int(minute_text))
+
+
+# Arka plan kur yenileyici / Background rate refresher
+rate_refresher = RateRefresher(
+    refresh_rates=refresh_current_rates,
+    interval=RATE_REFRESH_INTERVAL,
+    refresh_history=refresh_recent_history,
+    history_time=parse_time_of_day(HISTORY_REFRESH_TIME),
+)
+
+
+def start_background_tasks():
+    """
+    Arka plan görevlerini başlatır (sunucu giriş noktalarından çağrılır).
+    Starts the background tasks (called from the server entry points).
+    """
+    if RATE_REFRESH_INTERVAL > 0:
+        rate_refresher.start(delay=first_refresh_delay())
+
+
+def first_refresh_delay():
+    """
+    İlk yenilemeden önce beklenecek süre (saniye).
+    Time to wait before the first refresh (seconds).
+
+    Diskten yüklenen veri hâlâ tazeyse yenileme kalan süre kadar ertelenir;
+    rastgele ek gecikme, aynı anda başlatılan sunucuların kaynağa birlikte
+    istek atmasını önler.
+    If the data loaded from disk is still fresh the refresh waits for the
+    remaining time; a random extra delay keeps servers started together from
+    hitting the source at the same moment.
+    """
+    age = rate_cache.age(ANCHOR_CURRENCY)
+    if age is None:
+        return 0.0
+
+    remaining = max(0.0, RATE_REFRESH_INTERVAL - age)
+    return remaining + random.uniform(0, RATE_REFRESH_INTERVAL * REFRESH_JITTER_RATIO)
+
+
+# Önceki çalışmadan kalan kur verisiyle başla; kapanırken son veriyi yaz
+# Start from the rates of the previous run; write the latest ones on shutdown
+load_warm_state()
+atexit.register(save_warm_state)
+
+
 # ============================================================
 # API Endpoint'leri / API Endpoints
 # Her endpoint bir URL adresidir ve tarayıcıdan erişilebilir
 # Each endpoint is a URL that can be accessed from the browser
 # ============================================================
 
+# API bilgisi / API information
+API_INFO = {
+    "message": "KurTakip API'ye Hoş Geldiniz! / Welcome to KurTakip API!",
+    "version": "1.0.0",
+    "endpoints": {
+        "currencies": "/api/currencies",
+        "rates": "/api/rates/{base}",
+        "convert": "/api/convert?from_currency=USD&to_currency=TRY&amount=100",
+        "history": "/api/history/{base}/{quote}?days=30",
+        "history-batch": "/api/history/{base}?quotes=TRY,EUR&days=30",
+        "analytics": "/api/analytics/{base}/{quote}?days=90&window=7",
+        "popular": "/api/popular-pairs",
+        "multi-convert": "/api/multi-convert?from_currency=USD&amount=100",
+        "convert-batch": "POST /api/convert/batch",
+        "convert-stream": "POST /api/convert/stream",
+        "stream-rates": "/api/stream/rates?base=USD",
+        "stream-status": "/api/stream/status",
+        "rate-on-date": "/api/rate-on-date/{base}/{quote}/{date}",
+        "fixing-date": "/api/fixing-date/{date}",
+        "providers": "/api/providers",
+        "compare-dates": "/api/compare-dates/{base}/{quote}?start_date=X&end_date=Y"
+    }
+}
+
+
+def json_asset(payload):
+    """
+    Değişmeyen bir JSON gövdesini bir kez yazar ve sıkıştırır.
+    Encodes and compresses an unchanging JSON body once.
+    """
+    return static_assets.Asset(app.json.dump_bytes(payload) + b"\n", "application/json")
+
+
+# Çalışırken değişmeyen yanıtlar başlangıçta hazırlanır
+# Responses that never change at runtime are built at startup
+API_INFO_ASSET = json_asset(API_INFO)
+CURRENCIES_ASSET = json_asset({
+    "fiat": CURRENCIES,
+    "total": len(CURRENCIES)
+})
+
+
 @app.route("/api")
 def api_info():
     """
     API hakkında bilgi döndürür.
     Returns information about the API.
     """
-    info = {
-        "message": "KurTakip API'ye Hoş Geldiniz! / Welcome to KurTakip API!",
-        "version": "1.0.0",
-        "endpoints": {
-            "currencies": "/api/currencies",
-            "rates": "/api/rates/{base}",
-            "convert": "/api/convert?from_currency=USD&to_currency=TRY&amount=100",
-            "history": "/api/history/{base}/{quote}?days=30",
-            "popular": "/api/popular-pairs",
-            "multi-convert": "/api/multi-convert?from_currency=USD&amount=100",
-            "rate-on-date": "/api/rate-on-date/{base}/{quote}/{date}",
-            "compare-dates": "/api/compare-dates/{base}/{quote}?start_date=X&end_date=Y"
-        }
-    }
-    return jsonify(info)
+    return API_INFO_ASSET.response(request, app.response_class, STATIC_DATA_MAX_AGE)
 
 
 @app.route("/api/currencies")
@@ -315,11 +1310,7 @@ def list_currencies():
     Desteklenen tüm para birimlerini listeler.
     Lists all supported currencies.
     """
-    result = {
-        "fiat": CURRENCIES,
-        "total": len(CURRENCIES)
-    }
-    return jsonify(result)
+    return CURRENCIES_ASSET.response(request, app.response_class, STATIC_DATA_MAX_AGE)
 
 
 @app.route("/api/rates/<base_currency>")
@@ -328,33 +1319,108 @@ def show_rates(base_currency):
     Bir para biriminin tüm kurlarını gösterir.
     Shows all exchange rates for a currency.
 
-    Örnek / Example: /api/rates/USD -> 1 USD = ? EUR, TRY, GBP...
+    Örnek / Example: /api/rates/USD -> 1 USD = ? EUR, TRY, GBP...
+    """
+    base_currency = base_currency.upper()
+
+    # Para birimi geçerli mi? / Is currency valid?
+    if not is_valid_currency(base_currency):
+        return jsonify({"error": "Para birimi bulunamadı / Currency not found"}), 404
+
+    # Kurları bellekteki matristen al / Get rates from the in-memory matrix
+    matrix = get_rate_matrix()
+    if matrix is None:
+        return jsonify({"error": "Kurlar alınamadı / Could not fetch rates"}), 500
+
+    def encode_payload():
+        # Kur bilgilerini al / Get rate info
+        rates = matrix.row(base_currency)
+        if rates is None:
+            rates = {}
+
+        return app.json.dump_bytes({
+            "base": base_currency,
+            "date": matrix.date,
+            "rates": rates
+        })
+
+    def build_body():
+        # Aynı kur verisi için gövde bir kez yazılır / The body is encoded once per snapshot
+        return rates_body_cache.get(matrix.version, base_currency, encode_payload)
+
+    etag = make_etag("rates", base_currency, matrix.version)
+    return conditional_json(etag, build_body, rates_max_age(matrix), matrix.updated_at,
+                            render=app.json.bytes_response)
+
+
+@app.route("/api/stream/rates")
+def stream_rates():
     """
-    base_currency = base_currency.upper()
+    Kur değişikliklerini Server-Sent Events ile canlı olarak gönderir.
+    Streams rate changes live with Server-Sent Events.
 
-    # Para birimi geçerli mi? / Is currency valid?
+    Örnek / Example: /api/stream/rates?base=USD
+
+    Bağlanınca "snapshot" olayı tüm kurları, sonraki "rates" olayları sadece
+    değişen kurları taşır. Tüm bağlantılar tek bir arka plan yenilemesini paylaşır.
+    On connect a "snapshot" event carries all rates; later "rates" events carry
+    only the rates that changed. Every connection shares one background refresh.
+    """
+    base_currency = request.args.get('base', ANCHOR_CURRENCY).upper()
     if not is_valid_currency(base_currency):
         return jsonify({"error": "Para birimi bulunamadı / Currency not found"}), 404
 
-    # Kurları internetten al / Get rates from internet
-    data = get_rates(base_currency)
-    if data is None:
-        return jsonify({"error": "Kurlar alınamadı / Could not fetch rates"}), 500
+    # Her WSGI akışı bir işçi iş parçacığı tutar: sınır dolunca istemci yoklamaya geçer
+    # Every WSGI stream holds a worker thread: past the limit the client falls back to polling
+    if not wsgi_streams.acquire():
+        response = jsonify({
+            "error": "Canlı akış kullanılamıyor / Live stream unavailable",
+            "poll": "/api/rates/" + base_currency,
+            "poll_interval": LIVE_POLL_INTERVAL
+        })
+        response.status_code = 503
+        response.headers["Retry-After"] = str(LIVE_POLL_INTERVAL)
+        return response
 
-    # Tarih bilgisini al / Get date info
-    date = data.get("date")
+    try:
+        # Abone varken veriyi yenileyici tazeler / The refresher keeps the data fresh while anyone listens
+        start_background_tasks()
+
+        if get_rate_matrix() is None:
+            wsgi_streams.release()
+            return jsonify({"error": "Kurlar alınamadı / Could not fetch rates"}), 500
+
+        events = broadcast.iter_events(rate_broadcaster, base_currency, request.headers.get("Last-Event-ID"))
+        response = Response(stream_with_context(events), mimetype="text/event-stream")
+    except Exception:
+        wsgi_streams.release()
+        raise
+
+    # Bağlantı kapanınca yer boşalır / The slot is freed when the connection closes
+    response.call_on_close(wsgi_streams.release)
+    response.headers["Cache-Control"] = "no-cache"
+    response.headers["X-Accel-Buffering"] = "no"
+    return response
 
-    # Kur bilgilerini al / Get rate info
-    rates = data.get("rates")
-    if rates is None:
-        rates = {}
 
-    result = {
-        "base": base_currency,
-        "date": date,
-        "rates": rates
-    }
-    return jsonify(result)
+@app.route("/api/stream/status")
+def stream_status():
+    """
+    Canlı akışın açılıp açılamayacağını söyler; açılamıyorsa sayfa kurları yoklar.
+    Tells whether the live stream can be opened; if not the page polls the rates.
+    """
+    if app.config["ASYNC_STREAMS"]:
+        available = True
+    else:
+        available = wsgi_streams.available()
+
+    response = jsonify({
+        "available": available,
+        "base": ANCHOR_CURRENCY,
+        "poll_interval": LIVE_POLL_INTERVAL
+    })
+    response.cache_control.no_store = True
+    return response
 
 
 @app.route("/api/convert")
@@ -380,9 +1446,16 @@ def convert():
     try:
         amount_text = request.args.get('amount', '0')
         amount = float(amount_text)
+        exact_amount = money.parse_amount(amount_text)
     except (ValueError, TypeError):
         return jsonify({"error": "Geçersiz miktar / Invalid amount"}), 400
 
+    # Yuvarlama kipi / Rounding mode
+    try:
+        rounding = request_rounding()
+    except ValueError as error:
+        return jsonify({"error": str(error)}), 400
+
     # --- 2. Kontroller / Validations ---
 
     # Miktar pozitif olmalı / Amount must be positive
@@ -401,19 +1474,18 @@ def convert():
 
     # --- 3. Dönüşüm yap / Do the conversion ---
 
-    # Kurları internetten al / Get rates from internet
-    data = get_rates(from_currency)
-    if data is None:
+    # Kurları bellekteki matristen al / Get rates from the in-memory matrix
+    matrix = get_rate_matrix()
+    if matrix is None:
         return jsonify({"error": "Kurlar alınamadı / Could not fetch rates"}), 500
 
     # Hedef kuru bul / Find target rate
-    all_rates = data["rates"]
-    rate = all_rates.get(to_currency)
+    rate = matrix.rate(from_currency, to_currency)
     if rate is None:
         return jsonify({"error": "Kur bulunamadı / Rate not found"}), 404
 
-    # Sonucu hesapla / Calculate result
-    result = amount * rate
+    # Sonucu hesapla (kuruş hanesine yuvarlanır) / Calculate result (rounded to the minor unit)
+    result = money.convert_scaled(exact_amount, money.scale_rate(rate), to_currency, rounding)
 
     # --- 4. Sonucu döndür / Return result ---
     now = str(datetime.now())
@@ -424,10 +1496,255 @@ def convert():
         "amount": amount,
         "rate": rate,
         "result": result,
+        "rounding": rounding,
         "timestamp": now
     })
 
 
+@app.route("/api/convert/batch", methods=["POST"])
+def convert_batch():
+    """
+    Birçok dönüşümü tek istekte yapar.
+    Performs many conversions in a single request.
+
+    Gövde / Body (Content-Type'a göre / by Content-Type):
+        application/json:     [{"from": "USD", "to": "TRY", "amount": 100}, ...]
+        text/csv:             from,to,amount başlıklı / with a from,to,amount header
+        application/x-ndjson: her satırda bir JSON nesnesi / one JSON object per line
+
+    Sonuçlar gelen sırayla döner; hatalı satırlar "error" alanıyla işaretlenir.
+    Results come back in the input order; bad rows carry an "error" field.
+    """
+    body_format = batch.detect_format(request.content_type)
+    if body_format is None:
+        return jsonify({"error": "Desteklenmeyen içerik türü / Unsupported content type"}), 415
+
+    try:
+        rounding = request_rounding()
+    except ValueError as error:
+        return jsonify({"error": str(error)}), 400
+
+    # Gövdeyi satırlara ayır / Split the body into rows
+    try:
+        raw_rows = batch.parse_rows(request.get_data(as_text=True), body_format)
+    except ValueError:
+        return jsonify({"error": "Gövde okunamadı / Could not parse body"}), 400
+
+    if len(raw_rows) == 0:
+        return jsonify({"error": "Satır bulunamadı / No rows found"}), 400
+
+    if len(raw_rows) > BATCH_MAX_ROWS:
+        return jsonify({"error": "En fazla " + str(BATCH_MAX_ROWS) + " satır / At most " + str(BATCH_MAX_ROWS) + " rows"}), 413
+
+    # Kurları bellekteki matristen al / Get rates from the in-memory matrix
+    matrix = get_rate_matrix()
+    if matrix is None:
+        return jsonify({"error": "Kurlar alınamadı / Could not fetch rates"}), 500
+
+    results = batch.convert_rows(raw_rows, matrix, is_valid_currency, rounding)
+
+    # Hatalı satırları say / Count the bad rows
+    error_count = 0
+    for item in results:
+        if "error" in item:
+            error_count += 1
+
+    return jsonify({
+        "count": len(results),
+        "errors": error_count,
+        "date": matrix.date,
+        "rounding": rounding,
+        "results": results,
+        "timestamp": str(datetime.now())
+    })
+
+
+def iter_body_lines(stream):
+    """
+    İstek gövdesini satır satır yazıya çevirir (tamamı belleğe alınmaz).
+    Decodes the request body line by line (never held in memory whole).
+    """
+    for raw_line in stream:
+        yield raw_line.decode("utf-8")
+
+
+@app.route("/api/convert/stream", methods=["POST"])
+def convert_stream():
+    """
+    Çok büyük CSV / NDJSON dosyalarını akış halinde çevirir.
+    Converts very large CSV / NDJSON files as a stream.
+
+    Gövde okundukça satır satır çevrilir ve sonuç parça parça (chunked) döner;
+    bellek kullanımı dosya boyutundan bağımsızdır.
+    The body is converted line by line as it is read and the result is sent
+    back in chunks, so memory use does not depend on the file size.
+
+    Gövde / Body:
+        text/csv:             from,to,amount başlıklı / with a from,to,amount header
+        application/x-ndjson: her satırda bir JSON nesnesi / one JSON object per line
+    """
+    body_format = batch.detect_format(request.content_type)
+    if body_format not in (batch.FORMAT_CSV, batch.FORMAT_NDJSON):
+        return jsonify({"error": "text/csv ya da application/x-ndjson gerekli / text/csv or application/x-ndjson required"}), 415
+
+    try:
+        rounding = request_rounding()
+    except ValueError as error:
+        return jsonify({"error": str(error)}), 400
+
+    # Kurları bellekteki matristen al / Get rates from the in-memory matrix
+    matrix = get_rate_matrix()
+    if matrix is None:
+        return jsonify({"error": "Kurlar alınamadı / Could not fetch rates"}), 500
+
+    # Okuma -> çevirme -> yazma zinciri / Read -> convert -> write pipeline
+    raw_rows = batch.iter_raw_rows(iter_body_lines(request.stream), body_format)
+    results = batch.iter_converted(raw_rows, matrix, is_valid_currency, rounding)
+    chunks = batch.iter_output(results, body_format)
+
+    if body_format == batch.FORMAT_CSV:
+        mimetype = "text/csv"
+    else:
+        mimetype = "application/x-ndjson"
+
+    return Response(stream_with_context(chunks), mimetype=mimetype)
+
+
+# Geçmiş veri yanıt biçimleri / History response formats
+FORMAT_JSON = "json"
+FORMAT_COLUMNAR = "columnar"
+FORMAT_MSGPACK = "msgpack"
+HISTORY_FORMATS = (FORMAT_JSON, FORMAT_COLUMNAR, FORMAT_MSGPACK)
+
+# Eksik gün doldurma yöntemleri / Ways of filling missing days
+FILL_NONE = "none"
+FILL_LOCF = "locf"
+HISTORY_FILLS = (FILL_NONE, FILL_LOCF)
+
+# Geçmiş kaynakları başarısızsa istemcinin tekrar denemeden önce beklemesi (saniye)
+# How long clients should wait before retrying when the historical providers fail (seconds)
+HISTORY_RETRY_AFTER = 60
+
+
+def history_unavailable():
+    """
+    Tüm geçmiş kur kaynakları başarısız olduğunda dönülen yanıt (503).
+    The response returned when every historical provider failed (503).
+    """
+    response = jsonify({"error": "Geçmiş veri alınamadı / Historical data unavailable"})
+    response.status_code = 503
+    response.headers["Retry-After"] = str(HISTORY_RETRY_AFTER)
+    return response
+
+
+def history_format():
+    """
+    İstekteki "format" parametresini okur.
+    Reads the request's "format" parameter.
+
+    Hatalar / Raises:
+        ValueError: Biçim bilinmiyorsa ya da desteklenmiyorsa / If the format is unknown or unsupported
+    """
+    body_format = request.args.get("format", FORMAT_JSON).lower()
+    if body_format not in HISTORY_FORMATS:
+        raise ValueError("Geçersiz biçim / Invalid format: " + body_format)
+    if body_format == FORMAT_MSGPACK and msgpack is None:
+        raise ValueError("MessagePack kurulu değil / MessagePack is not installed")
+    return body_format
+
+
+def history_fill():
+    """
+    İstekteki "fill" parametresini okur ("locf": eksik günlerde önceki kur).
+    Reads the request's "fill" parameter ("locf": previous rate on missing days).
+
+    Hatalar / Raises:
+        ValueError: Yöntem bilinmiyorsa / If the method is unknown
+    """
+    fill = request.args.get("fill", FILL_NONE).lower()
+    if fill not in HISTORY_FILLS:
+        raise ValueError("Geçersiz doldurma / Invalid fill: " + fill)
+    return fill
+
+
+def calendar_columns(dates, series):
+    """
+    Tarih listesini başlangıç + adım biçimine çevirir; eksik günler None olur.
+    Turns a list of dates into start + step form; missing days become None.
+
+    Parametreler / Parameters:
+        dates: Sıralı tarihler / Sorted dates (["2024-12-02", "2024-12-04"])
+        series: {ad: değerler} / {name: values} (her tarih için bir değer / one value per date)
+
+    Döndürür / Returns:
+        {"start": "2024-12-02", "end": "2024-12-04", "step": 1,
+         "series": {ad / name: [v1, None, v2]}}
+    """
+    if len(dates) == 0:
+        return {"start": None, "end": None, "step": 1, "series": {name: [] for name in series}}
+
+    start = parse_day(dates[0])
+    length = (parse_day(dates[-1]) - start).days + 1
+
+    columns = {}
+    for name in series:
+        columns[name] = [None] * length
+
+    for index, date_text in enumerate(dates):
+        offset = (parse_day(date_text) - start).days
+        for name, values in series.items():
+            columns[name][offset] = values[index]
+
+    return {"start": dates[0], "end": dates[-1], "step": 1, "series": columns}
+
+
+def shape_history(payload, body_format):
+    """
+    Geçmiş veri yanıtını istenen biçime sokar.
+    Shapes a history response into the requested format.
+
+    "columnar" ve "msgpack" biçimlerinde tarih listesi yerine başlangıç
+    tarihi + günlük adım + kur dizisi döner (hafta sonları None).
+    In the "columnar" and "msgpack" formats a start date + daily step + rate
+    array replaces the list of dates (weekends are None).
+    """
+    if body_format == FORMAT_JSON:
+        return payload
+
+    shaped = dict(payload)
+    shaped["format"] = body_format
+
+    if "data" in payload:
+        points = shaped.pop("data")
+        columns = calendar_columns([item["date"] for item in points], {"rates": [item["rate"] for item in points]})
+        shaped["rates"] = columns["series"]["rates"]
+    else:
+        columns = calendar_columns(shaped.pop("dates"), shaped["series"])
+        shaped["series"] = columns["series"]
+
+    shaped["start"] = columns["start"]
+    shaped["end"] = columns["end"]
+    shaped["step"] = columns["step"]
+    return shaped
+
+
+def msgpack_response(payload):
+    """
+    Gövdeyi MessagePack olarak döndürür.
+    Returns the body as MessagePack.
+    """
+    return app.response_class(msgpack.packb(payload), mimetype="application/x-msgpack")
+
+
+def history_renderer(body_format):
+    """
+    Biçime uygun yanıt fonksiyonu / Response function for the format
+    """
+    if body_format == FORMAT_MSGPACK:
+        return msgpack_response
+    return jsonify
+
+
 @app.route("/api/history/<base_currency>/<quote_currency>")
 def history(base_currency, quote_currency):
     """
@@ -456,22 +1773,39 @@ def history(base_currency, quote_currency):
     if day_count <= 0 or day_count > 365:
         return jsonify({"error": "Gün 1-365 arası olmalı / Days must be 1-365"}), 400
 
+    # Yanıt biçimi ve eksik gün doldurma / Response format and gap filling
+    try:
+        body_format = history_format()
+        fill = history_fill()
+    except ValueError as error:
+        return jsonify({"error": str(error)}), 400
+    render = history_renderer(body_format)
+
     # Önce gerçek veriyi dene / Try real data first
     if USE_REAL_HISTORICAL_DATA:
         real_data = get_historical_rates(base_currency, quote_currency, day_count)
 
         if real_data is not None:
-            return jsonify({
+            payload = {
                 "base": base_currency,
                 "quote": quote_currency,
                 "days": day_count,
                 "data": real_data,
                 "note": "Gerçek veri (Frankfurter.app) / Real data from Frankfurter.app"
-            })
-        else:
-            logger.warning("Gerçek veri alınamadı, sahte veri kullanılıyor / Real data failed, using simulated")
+            }
 
-    # Gerçek veri yoksa sahte veri üret / If no real data, generate fake data
+            # Hafta sonu / tatil günleri önceki kurla doldurulur / Weekends / holidays carry the previous rate
+            if fill == FILL_LOCF:
+                payload["data"] = business_days.fill_forward(real_data, datetime.now().date())
+                payload["fill"] = fill
+
+            etag = make_etag("history", base_currency, quote_currency, day_count, body_format, fill, history_range(real_data))
+            return conditional_json(etag, lambda: shape_history(payload, body_format), int(HISTORY_RECENT_TTL), render=render)
+
+        # Gerçek veri istenirken asla sahte veri dönülmez / Never serve fake data when real data is expected
+        return history_unavailable()
+
+    # Gerçek veri kapalıysa sahte veri üret / With real data disabled, generate fake data
     data = get_rates(base_currency)
     if data is None:
         return jsonify({"error": "Kurlar alınamadı / Could not fetch rates"}), 500
@@ -482,15 +1816,159 @@ def history(base_currency, quote_currency):
     if current_rate is None:
         current_rate = 1.0
 
-    fake_data = make_fake_history(current_rate, day_count)
+    def build_payload():
+        return shape_history({
+            "base": base_currency,
+            "quote": quote_currency,
+            "days": day_count,
+            "data": make_fake_history(current_rate, day_count),
+            "note": "Simüle edilmiş veri / Simulated data"
+        }, body_format)
 
-    return jsonify({
-        "base": base_currency,
-        "quote": quote_currency,
-        "days": day_count,
-        "data": fake_data,
-        "note": "Simüle edilmiş veri / Simulated data"
-    })
+    # Sahte veri kur verisiyle birlikte değişir / Simulated data changes with the rate snapshot
+    etag = make_etag("history-simulated", base_currency, quote_currency, day_count, body_format, datetime.now().date(), current_rate)
+    return conditional_json(etag, build_payload, int(HISTORY_RECENT_TTL), render=render)
+
+
+@app.route("/api/history/<base_currency>")
+def history_batch(base_currency):
+    """
+    Bir para biriminin birden fazla hedefe karşı geçmiş verilerini tek seferde getirir.
+    Returns historical data of one currency against several targets at once.
+
+    Örnek / Example: /api/history/USD?quotes=TRY,EUR,GBP&days=30
+
+    Yanıt sütun biçimindedir: tek bir tarih ekseni ve her hedef için bir kur dizisi.
+    The response is columnar: one shared date axis and one rate array per target.
+    """
+    base_currency = base_currency.upper()
+
+    # Kaç günlük veri isteniyor? / How many days of data?
+    try:
+        day_count = int(request.args.get('days', str(DEFAULT_DAYS)))
+    except ValueError:
+        return jsonify({"error": "Geçersiz gün sayısı / Invalid day count"}), 400
+
+    if not is_valid_currency(base_currency):
+        return jsonify({"error": "Geçersiz para birimi / Invalid currency"}), 400
+
+    # Hedef para birimleri (virgülle ayrılmış) / Target currencies (comma separated)
+    quote_list = []
+    for part in request.args.get('quotes', '').split(","):
+        code = part.strip().upper()
+        if not code:
+            continue
+        if not is_valid_currency(code):
+            return jsonify({"error": "Geçersiz para birimi / Invalid currency: " + code}), 400
+        if code != base_currency and code not in quote_list:
+            quote_list.append(code)
+
+    if len(quote_list) == 0:
+        return jsonify({"error": "quotes parametresi gerekli / quotes parameter required"}), 400
+
+    # Gün sayısı 1-365 arası olmalı / Days must be between 1-365
+    if day_count <= 0 or day_count > 365:
+        return jsonify({"error": "Gün 1-365 arası olmalı / Days must be 1-365"}), 400
+
+    # Yanıt biçimi / Response format
+    try:
+        body_format = history_format()
+    except ValueError as error:
+        return jsonify({"error": str(error)}), 400
+    render = history_renderer(body_format)
+
+    # Önce gerçek veriyi dene / Try real data first
+    if USE_REAL_HISTORICAL_DATA:
+        real_data = get_historical_series(base_currency, quote_list, day_count)
+
+        if real_data is not None:
+            payload = {
+                "base": base_currency,
+                "quotes": quote_list,
+                "days": day_count,
+                "dates": real_data["dates"],
+                "series": real_data["series"],
+                "note": "Gerçek veri (Frankfurter.app) / Real data from Frankfurter.app"
+            }
+            etag = make_etag("history", base_currency, ",".join(quote_list), day_count, body_format, series_range(real_data))
+            return conditional_json(etag, lambda: shape_history(payload, body_format), int(HISTORY_RECENT_TTL), render=render)
+
+        # Gerçek veri istenirken asla sahte veri dönülmez / Never serve fake data when real data is expected
+        return history_unavailable()
+
+    # Gerçek veri kapalıysa sahte veri üret / With real data disabled, generate fake data
+    data = get_rates(base_currency)
+    if data is None:
+        return jsonify({"error": "Kurlar alınamadı / Could not fetch rates"}), 500
+
+    current_rates = {}
+    for quote_currency in quote_list:
+        current_rate = data["rates"].get(quote_currency)
+        if current_rate is None:
+            current_rate = 1.0
+        current_rates[quote_currency] = current_rate
+
+    def build_payload():
+        dates = []
+        series = {}
+        for quote_currency in quote_list:
+            fake_data = make_fake_history(current_rates[quote_currency], day_count)
+            dates = [item["date"] for item in fake_data]
+            series[quote_currency] = [item["rate"] for item in fake_data]
+
+        return shape_history({
+            "base": base_currency,
+            "quotes": quote_list,
+            "days": day_count,
+            "dates": dates,
+            "series": series,
+            "note": "Simüle edilmiş veri / Simulated data"
+        }, body_format)
+
+    # Sahte veri kur verisiyle birlikte değişir / Simulated data changes with the rate snapshot
+    etag = make_etag("history-simulated", base_currency, day_count, body_format, datetime.now().date(), sorted(current_rates.items()))
+    return conditional_json(etag, build_payload, int(HISTORY_RECENT_TTL), render=render)
+
+
+@app.route("/api/analytics/<base_currency>/<quote_currency>")
+def show_analytics(base_currency, quote_currency):
+    """
+    Bir döviz çiftinin geçmişinden hesaplanmış istatistikleri getirir.
+    Returns statistics computed from a currency pair's history.
+
+    Örnek / Example: /api/analytics/USD/TRY?days=90&window=7
+
+    Hareketli ortalama / sapma, zirveden düşüş, en düşük / en yüksek,
+    yüzde değişim ve oynaklık tek bir küçük yanıtta döner.
+    Rolling mean / deviation, drawdown, min / max, percent change and
+    volatility come back in one small response.
+    """
+    base_currency = base_currency.upper()
+    quote_currency = quote_currency.upper()
+
+    try:
+        day_count = int(request.args.get('days', str(DEFAULT_DAYS)))
+        window = int(request.args.get('window', str(DEFAULT_WINDOW)))
+    except ValueError:
+        return jsonify({"error": "Geçersiz sayı / Invalid number"}), 400
+
+    if not is_valid_currency(base_currency) or not is_valid_currency(quote_currency):
+        return jsonify({"error": "Geçersiz para birimi / Invalid currency"}), 400
+
+    # Gün sayısı 1-365 arası olmalı / Days must be between 1-365
+    if day_count <= 0 or day_count > 365:
+        return jsonify({"error": "Gün 1-365 arası olmalı / Days must be 1-365"}), 400
+
+    # Pencere 2 ile gün sayısı arasında olmalı / Window must be between 2 and the day count
+    if window < 2 or window > day_count:
+        return jsonify({"error": "Pencere 2 ile gün sayısı arasında olmalı / Window must be between 2 and days"}), 400
+
+    result = analytics_cache.get((base_currency, quote_currency, day_count, window))
+    if result is None:
+        return history_unavailable()
+
+    etag = make_etag("analytics", base_currency, quote_currency, day_count, window, result["summary"])
+    return conditional_json(etag, lambda: result, int(ANALYTICS_CACHE_TTL))
 
 
 @app.route("/api/popular-pairs")
@@ -499,47 +1977,47 @@ def popular_pairs():
     En çok takip edilen döviz çiftlerinin kurlarını getirir.
     Returns rates for the most popular currency pairs.
     """
-    # Popüler çiftler listesi / Popular pairs list
-    pairs = [
-        {"base": "USD", "quote": "TRY", "name": "Dolar/TL"},
-        {"base": "EUR", "quote": "TRY", "name": "Euro/TL"},
-        {"base": "GBP", "quote": "TRY", "name": "Sterlin/TL"},
-        {"base": "EUR", "quote": "USD", "name": "Euro/Dolar"},
-        {"base": "GBP", "quote": "USD", "name": "Sterlin/Dolar"},
-        {"base": "JPY", "quote": "USD", "name": "Yen/Dolar"},
-        {"base": "CHF", "quote": "USD", "name": "Frank/Dolar"},
-        {"base": "USD", "quote": "CAD", "name": "Dolar/Kanada Doları"},
-    ]
+    # Geçerli çiftleri seç / Select valid pairs
+    valid_pairs = []
+    for pair in POPULAR_PAIRS:
+        if is_valid_currency(pair["base"]) and is_valid_currency(pair["quote"]):
+            valid_pairs.append(pair)
+
+    # Tüm temel birimler tek kur matrisinden okunur / Every base is read from one rate matrix
+    base_codes = [pair["base"] for pair in valid_pairs]
+    rates_by_base = get_rates_many(base_codes, POPULAR_PAIRS_DEADLINE)
 
     results = []
+    now = time.time()
 
     # Her popüler çift için kur bilgisini al / Get rate for each popular pair
-    for pair in pairs:
+    for pair in valid_pairs:
         base_code = pair["base"]
         quote_code = pair["quote"]
 
-        # Para birimleri geçerli mi? / Are currencies valid?
-        base_valid = is_valid_currency(base_code)
-        quote_valid = is_valid_currency(quote_code)
-
-        if base_valid and quote_valid:
-            # Kuru internetten al / Get rate from internet
-            data = get_rates(base_code)
+        data = rates_by_base.get(base_code)
+        if data is None:
+            continue
 
-            if data is not None:
-                all_rates = data["rates"]
-                rate = all_rates.get(quote_code)
+        rate = data["rates"].get(quote_code)
+        if rate is not None:
+            results.append({
+                "base": base_code,
+                "quote": quote_code,
+                "name": pair["name"],
+                "rate": rate,
+                "change_24h": change_24h(base_code, quote_code, rate, now)
+            })
 
-                if rate is not None:
-                    results.append({
-                        "base": base_code,
-                        "quote": quote_code,
-                        "name": pair["name"],
-                        "rate": rate,
-                        "change_24h": 0  # 24 saatlik değişim (henüz yok) / 24h change (not yet available)
-                    })
+    # Tüm çiftler aynı kur verisinden gelir; sürümü ETag olur
+    # Every pair comes from the same snapshot; its version is the ETag
+    matrix = rate_cache.peek(ANCHOR_CURRENCY)
+    if matrix is None or len(results) == 0:
+        return jsonify(results)
 
-    return jsonify(results)
+    changes = [item["change_24h"] for item in results]
+    etag = make_etag("popular-pairs", matrix.version, changes)
+    return conditional_json(etag, lambda: results, rates_max_age(matrix), matrix.updated_at)
 
 
 @app.route("/api/multi-convert")
@@ -562,9 +2040,16 @@ def multi_convert():
     try:
         amount_text = request.args.get('amount', '0')
         amount = float(amount_text)
+        exact_amount = money.parse_amount(amount_text)
     except (ValueError, TypeError):
         return jsonify({"error": "Geçersiz miktar / Invalid amount"}), 400
 
+    # Yuvarlama kipi / Rounding mode
+    try:
+        rounding = request_rounding()
+    except ValueError as error:
+        return jsonify({"error": str(error)}), 400
+
     if amount <= 0:
         return jsonify({"error": "Miktar 0'dan büyük olmalı / Amount must be > 0"}), 400
 
@@ -597,22 +2082,21 @@ def multi_convert():
     if len(target_list) == 0:
         return jsonify({"error": "Geçerli hedef bulunamadı / No valid targets found"}), 400
 
-    # Kurları internetten al / Get rates from internet
-    data = get_rates(from_currency)
-    if data is None:
+    # Kurları bellekteki matristen al / Get rates from the in-memory matrix
+    matrix = get_rate_matrix()
+    if matrix is None:
         return jsonify({"error": "Kurlar alınamadı / Could not fetch rates"}), 500
 
     # Her hedef para birimi için dönüşüm yap
     # Convert for each target currency
     conversions = []
-    all_rates = data["rates"]
 
     for target_code in target_list:
-        rate = all_rates.get(target_code)
+        rate = matrix.rate(from_currency, target_code)
 
         if rate is not None:
             currency_info = CURRENCIES[target_code]
-            converted_amount = amount * rate
+            converted_amount = money.convert_scaled(exact_amount, money.scale_rate(rate), target_code, rounding)
 
             conversions.append({
                 "currency": target_code,
@@ -627,6 +2111,7 @@ def multi_convert():
     return jsonify({
         "from": from_currency,
         "amount": amount,
+        "rounding": rounding,
         "conversions": conversions,
         "timestamp": now
     })
@@ -661,29 +2146,21 @@ def rate_on_date(base_currency, quote_currency, date):
     if parsed_date > now:
         return jsonify({"error": "Gelecek tarih sorgulanamaz / Cannot query future dates"}), 400
 
-    try:
-        # API'den o tarihteki kuru al / Get rate from API for that date
-        url = HISTORICAL_URL + "/" + date
-        api_params = {"from": base_currency, "to": quote_currency}
-        response = requests.get(url, params=api_params, timeout=API_TIMEOUT)
-
-        # İstek başarısız mı? / Request failed?
-        if response.status_code != 200:
-            return jsonify({"error": "API'den veri alınamadı / Could not fetch from API"}), 500
-
-        data = response.json()
+    # İlk ECB kurundan önce kur yoktur / There are no fixings before the first ECB rate
+    if parsed_date.date() < business_days.FIRST_FIXING_DATE:
+        return jsonify({"error": EARLIEST_DATE_ERROR}), 400
 
-        # Kur var mı kontrol et / Check if rate exists
-        has_rates = "rates" in data
-        has_quote = has_rates and (quote_currency in data["rates"])
+    try:
+        # O tarihteki kuru al (önce yerel depo) / Get rate for that date (local store first)
+        found = get_rate_on_date(base_currency, quote_currency, date)
 
-        if has_quote:
-            rate = data["rates"][quote_currency]
+        if found is not None:
             return jsonify({
                 "base": base_currency,
                 "quote": quote_currency,
                 "date": date,
-                "rate": rate,
+                "fixing_date": found["date"],
+                "rate": found["rate"],
                 "source": "Frankfurter.app (Avrupa Merkez Bankası / European Central Bank)"
             })
         else:
@@ -696,6 +2173,43 @@ def rate_on_date(base_currency, quote_currency, date):
         return jsonify({"error": "Bir hata oluştu / An error occurred"}), 500
 
 
+@app.route("/api/fixing-date/<date>")
+def fixing_date(date):
+    """
+    Bir tarih için hangi günün ECB kurunun geçerli olduğunu söyler (internete çıkmadan).
+    Tells which day's ECB fixing applies on a date (without a network call).
+
+    Örnek / Example: /api/fixing-date/2024-12-01 -> "fixing_date": "2024-11-29"
+    """
+    try:
+        requested_day = datetime.strptime(date, "%Y-%m-%d").date()
+    except ValueError:
+        return jsonify({"error": "Geçersiz tarih. YYYY-MM-DD kullanın / Invalid date. Use YYYY-MM-DD"}), 400
+
+    # İlk ECB kurundan önce kur yoktur / There are no fixings before the first ECB rate
+    if requested_day < business_days.FIRST_FIXING_DATE:
+        return jsonify({"error": EARLIEST_DATE_ERROR}), 400
+
+    return jsonify({
+        "date": date,
+        "fixing_date": effective_fixing_date(requested_day).isoformat(),
+        "is_business_day": business_days.is_business_day(requested_day)
+    })
+
+
+@app.route("/api/providers")
+def provider_stats():
+    """
+    Kur kaynaklarının sırasını, gecikmelerini ve hata sayılarını gösterir.
+    Shows the order, latency and error counts of the rate providers.
+    """
+    return jsonify({
+        "rates": rate_providers.snapshot(),
+        "history": series_providers.snapshot(),
+        "on_date": date_providers.snapshot()
+    })
+
+
 @app.route("/api/compare-dates/<base_currency>/<quote_currency>")
 def compare_dates(base_currency, quote_currency):
     """
@@ -736,40 +2250,26 @@ def compare_dates(base_currency, quote_currency):
     if start_datetime > now or end_datetime > now:
         return jsonify({"error": "Gelecek tarih sorgulanamaz / Cannot query future dates"}), 400
 
-    try:
-        # --- Başlangıç tarihinin kurunu al / Get rate for start date ---
-        start_rate = None
-
-        url = HISTORICAL_URL + "/" + start_date
-        api_params = {"from": base_currency, "to": quote_currency}
-        response = requests.get(url, params=api_params, timeout=API_TIMEOUT)
+    # İlk ECB kurundan önce kur yoktur / There are no fixings before the first ECB rate
+    if min(start_datetime, end_datetime).date() < business_days.FIRST_FIXING_DATE:
+        return jsonify({"error": EARLIEST_DATE_ERROR}), 400
 
-        if response.status_code == 200:
-            data = response.json()
-            has_rates = "rates" in data
-            has_quote = has_rates and (quote_currency in data["rates"])
-            if has_quote:
-                start_rate = data["rates"][quote_currency]
+    try:
+        # İki tarihin kurunu aynı anda al / Look up both dates at the same time
+        start_future = fetch_executor.submit(get_rate_on_date, base_currency, quote_currency, start_date)
+        end_future = fetch_executor.submit(get_rate_on_date, base_currency, quote_currency, end_date)
+        start_found = start_future.result()
+        end_found = end_future.result()
 
-        if start_rate is None:
+        if start_found is None:
             return jsonify({"error": start_date + " tarihi için kur bulunamadı / No rate for " + start_date}), 404
 
-        # --- Bitiş tarihinin kurunu al / Get rate for end date ---
-        end_rate = None
-
-        url = HISTORICAL_URL + "/" + end_date
-        response = requests.get(url, params=api_params, timeout=API_TIMEOUT)
-
-        if response.status_code == 200:
-            data = response.json()
-            has_rates = "rates" in data
-            has_quote = has_rates and (quote_currency in data["rates"])
-            if has_quote:
-                end_rate = data["rates"][quote_currency]
-
-        if end_rate is None:
+        if end_found is None:
             return jsonify({"error": end_date + " tarihi için kur bulunamadı / No rate for " + end_date}), 404
 
+        start_rate = start_found["rate"]
+        end_rate = end_found["rate"]
+
         # --- Değişim yüzdesini hesapla / Calculate percentage change ---
         difference = end_rate - start_rate
         change_percent = (difference / start_rate) * 100
@@ -788,6 +2288,8 @@ def compare_dates(base_currency, quote_currency):
             "quote": quote_currency,
             "start_date": start_date,
             "end_date": end_date,
+            "start_fixing_date": start_found["date"],
+            "end_fixing_date": end_found["date"],
             "start_rate": start_rate,
             "end_rate": end_rate,
             "change_percent": change_percent,
@@ -808,34 +2310,127 @@ def compare_dates(base_currency, quote_currency):
 # Serves HTML and JavaScript files to the user
 # ============================================================
 
+# Sayfa, JS ve CSS bir kez okunup sıkıştırılır / The page, JS and CSS are read and compressed once
+page_assets = static_assets.AssetBundle(BASE_DIR / "static")
+
+
 @app.route("/")
 def home():
     """
     Ana sayfayı gösterir.
     Shows the home page.
+
+    Sayfa her seferinde doğrulanır; içindeki JS / CSS adresleri içerik özetlidir.
+    The page is always revalidated; its JS / CSS URLs are content-hashed.
+    """
+    return page_assets.page.response(request, app.response_class, 0)
+
+
+def serve_asset(url):
     """
-    static_folder = os.path.join(BASE_DIR, "static")
-    return send_from_directory(static_folder, "index.html")
+    Hazır bir dosyayı gönderir (içerik özetli adresler "immutable" önbelleğe alınır).
+    Serves a prebuilt file (content-hashed URLs are cached as "immutable").
+    """
+    found = page_assets.get(url)
+    if found is None:
+        return jsonify({"error": "Dosya bulunamadı / File not found"}), 404
+
+    asset, immutable = found
+    if immutable:
+        return asset.response(request, app.response_class, static_assets.IMMUTABLE_MAX_AGE, immutable=True)
+    return asset.response(request, app.response_class, 0)
 
 
-@app.route("/js/app.js")
-def serve_js():
+@app.route("/js/<name>")
+def serve_js(name):
     """
     JavaScript dosyasını gönderir.
     Serves the JavaScript file.
     """
-    js_folder = os.path.join(BASE_DIR, "static", "js")
-    return send_from_directory(js_folder, "app.js", mimetype="application/javascript")
+    return serve_asset("/js/" + name)
 
 
-@app.route("/css/style.css")
-def serve_css():
+@app.route("/css/<name>")
+def serve_css(name):
     """
     CSS dosyasını gönderir.
     Serves the CSS file.
     """
-    css_folder = os.path.join(BASE_DIR, "static", "css")
-    return send_from_directory(css_folder, "style.css", mimetype="text/css")
+    return serve_asset("/css/" + name)
+
+
+# ============================================================
+# Komut Satırı / Command Line
+# Kullanım / Usage: flask --app app <komut / command>
+# ============================================================
+
+@app.cli.command("convert-file")
+@click.argument("input_path", type=click.Path(exists=True, dir_okay=False))
+@click.argument("output_path", required=False)
+@click.option("--format", "file_format", type=click.Choice([batch.FORMAT_CSV, batch.FORMAT_NDJSON]),
+              help="Dosya biçimi (varsayılan: uzantıdan) / File format (default: from extension)")
+@click.option("--rounding", type=click.Choice(money.ROUNDING_MODES), default=money.ROUNDING_MODE,
+              help="Yuvarlama kipi / Rounding mode")
+def convert_file_command(input_path, output_path, file_format, rounding):
+    """
+    Bir CSV / NDJSON dosyasını satır satır çevirir.
+    Converts a CSV / NDJSON file line by line.
+
+    Örnek / Example: flask --app app convert-file islemler.csv sonuc.csv
+    """
+    if file_format is None:
+        file_format = batch.format_from_path(input_path)
+
+    matrix = get_rate_matrix()
+    if matrix is None:
+        raise click.ClickException("Kurlar alınamadı / Could not fetch rates")
+
+    if output_path:
+        output_file = open(output_path, "w", encoding="utf-8", newline="")
+    else:
+        output_file = sys.stdout
+
+    try:
+        with open(input_path, "r", encoding="utf-8", newline="") as input_file:
+            raw_rows = batch.iter_raw_rows(input_file, file_format)
+            results = batch.iter_converted(raw_rows, matrix, is_valid_currency, rounding)
+            for chunk in batch.iter_output(results, file_format):
+                output_file.write(chunk)
+    finally:
+        if output_path:
+            output_file.close()
+
+
+@app.cli.command("import-ecb")
+@click.argument("archive_path", type=click.Path(exists=True, dir_okay=False))
+def import_ecb_command(archive_path):
+    """
+    ECB geçmiş kur arşivini (eurofxref-hist.csv / .zip) yerel depoya yükler.
+    Loads the ECB historical rate archive (eurofxref-hist.csv / .zip) into the local store.
+
+    Örnek / Example: flask --app app import-ecb eurofxref-hist.zip
+
+    Tüm CURRENCIES çiftleri EUR üzerinden hesaplanır; sonrasında geçmiş veri
+    istekleri bu aralık için internete çıkmaz.
+    Every CURRENCIES pair is derived through EUR; afterwards history requests
+    for the loaded range need no network.
+    """
+    try:
+        lines = ecb_import.open_archive(archive_path)
+    except ValueError as error:
+        raise click.ClickException(str(error))
+
+    try:
+        summary = ecb_import.import_archive(lines, history_store, set(CURRENCIES))
+    except ValueError as error:
+        raise click.ClickException("Arşiv okunamadı / Could not read the archive: " + str(error))
+    finally:
+        lines.close()
+
+    click.echo(
+        str(summary["days"]) + " gün / days, " + str(summary["pairs"]) + " parite / pairs, "
+        + str(summary["rows"]) + " kur / rates (" + str(summary["start"]) + " .. " + str(summary["end"]) + ")"
+    )
 
 
 # ============================================================
@@ -857,6 +2452,9 @@ if __name__ == "__main__":
     print("=" * 50)
     print("")
 
+    # Kurları arka planda yenile / Refresh rates in the background
+    start_background_tasks()
+
     # 0.0.0.0 = tüm ağ bağlantılarını dinle (Docker için gerekli)
     # 0.0.0.0 = listen on all network connections (required for Docker)
     app.run(host="0.0.0.0", port=5000, debug=False)
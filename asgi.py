@@ -0,0 +1,219 @@
+# ============================================================
+# KurTakip - ASGI Giriş Noktası / ASGI Entry Point
+# Uygulamayı asyncio tabanlı bir sunucuda (örn: uvicorn) çalıştırır
+# Runs the application on an asyncio-based server (e.g. uvicorn)
+# ============================================================
+#
+# Kullanım / Usage:
+#   uvicorn asgi:application --host 0.0.0.0 --port 5000
+#
+# Flask görünümleri bakımı yapılan bir WSGI adaptörü (a2wsgi) üzerinden
+# ASGI_THREADS iş parçacığında çalışır. Dış API çağrıları hâlâ engelleyicidir:
+# aynı anda en fazla ASGI_THREADS görünüm çalışır, yani bu mod normal istekler
+# için gthread işçisinden daha fazla eşzamanlılık sağlamaz. Kazanç uzun açık
+# bağlantılardadır: canlı kur akışı (/api/stream/rates) doğrudan olay
+# döngüsünde çalışır ve iş parçacığı tutmaz.
+# Flask views run on ASGI_THREADS threads through a maintained WSGI adapter
+# (a2wsgi). Upstream calls still block: at most ASGI_THREADS views run at
+# once, so for ordinary requests this mode gives no more concurrency than a
+# gthread worker. The gain is for long-lived connections: the live rate
+# stream (/api/stream/rates) runs directly on the event loop and holds no thread.
+# ============================================================
+
+# --- Kütüphaneleri içe aktar / Import libraries ---
+import asyncio
+import json
+import os
+from urllib.parse import parse_qs
+
+from a2wsgi import WSGIMiddleware
+
+import broadcast
+from app import ANCHOR_CURRENCY, get_rate_matrix, is_valid_currency, rate_broadcaster, start_background_tasks
+from app import app as flask_app
+
+# Flask görünümlerini çalıştıran iş parçacığı sayısı (= aynı anda çalışan görünüm sayısı).
+# Dış API'ye giden istekler zaten tek çağrıda birleşir ve sunucu başına
+# UPSTREAM_POOL_SIZE bağlantıyla sınırlıdır; daha fazla iş parçacığı çoğunlukla sadece bekler.
+# Number of threads running Flask views (= views running at once). Upstream
+# fetches are already coalesced and limited to UPSTREAM_POOL_SIZE connections
+# per host, so more threads would mostly just wait.
+ASGI_THREADS = int(os.getenv("ASGI_THREADS", "16"))
+
+
+class AsgiRouter:
+    """
+    Uzun açık bağlantıları olay döngüsünde, diğer her şeyi WSGI uygulamasında sunar.
+    Serves long-lived connections on the event loop and everything else with the WSGI app.
+
+    ASGI <-> WSGI çevirisi a2wsgi'ye bırakılır; burada sadece yönlendirme ve
+    başlatma (lifespan) olayları işlenir.
+    The ASGI <-> WSGI translation is left to a2wsgi; only routing and the
+    lifespan events are handled here.
+    """
+
+    def __init__(self, wsgi_app, threads=ASGI_THREADS, on_startup=(), async_routes=None):
+        """
+        Parametreler / Parameters:
+            wsgi_app: Çalıştırılacak WSGI uygulaması / WSGI application to run
+            threads: Görünümleri çalıştıran iş parçacığı sayısı / Threads running the views
+            on_startup: Sunucu başlarken çağrılacak fonksiyonlar / Functions called on server startup
+            async_routes: Doğrudan olay döngüsünde çalışan {yol: ASGI fonksiyonu} (uzun açık bağlantılar için)
+                          {path: ASGI callable} served on the event loop (for long-lived connections)
+        """
+        self.wsgi = WSGIMiddleware(wsgi_app, workers=threads)
+        self.on_startup = list(on_startup)
+        self.async_routes = dict(async_routes or {})
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+            return
+
+        # Uzun açık bağlantılar iş parçacığı tutmaz / Long-lived connections do not hold a thread
+        route = None
+        if scope["type"] == "http":
+            route = self.async_routes.get(scope["path"])
+        if route is not None:
+            await route(scope, receive, send)
+            return
+
+        await self.wsgi(scope, receive, send)
+
+    async def _lifespan(self, receive, send):
+        """
+        Sunucunun başlatma / kapatma olaylarını işler.
+        Handles the server's startup / shutdown events.
+        """
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                for callback in self.on_startup:
+                    callback()
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+
+async def send_json(send, status, data):
+    """
+    Küçük bir JSON yanıtı gönderir.
+    Sends a small JSON response.
+    """
+    body = json.dumps(data, ensure_ascii=False).encode("utf-8")
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [(b"content-type", b"application/json"), (b"access-control-allow-origin", b"*")],
+    })
+    await send({"type": "http.response.body", "body": body, "more_body": False})
+
+
+async def wait_for_disconnect(receive):
+    """
+    İstemci bağlantıyı kapatana kadar bekler.
+    Waits until the client closes the connection.
+    """
+    while True:
+        message = await receive()
+        if message["type"] == "http.disconnect":
+            return
+
+
+async def stream_rates(scope, receive, send):
+    """
+    /api/stream/rates uç noktasının olay döngüsü sürümü.
+    Event-loop version of the /api/stream/rates endpoint.
+
+    Her bağlantı bir iş parçacığı yerine küçük bir kuyruk tutar; binlerce
+    pano aynı süreçte açık kalabilir.
+    Each connection holds a small queue instead of a thread, so thousands of
+    dashboards can stay open in one process.
+    """
+    query = parse_qs(scope.get("query_string", b"").decode("latin1"))
+    base_currency = query.get("base", [ANCHOR_CURRENCY])[0].upper()
+    if not is_valid_currency(base_currency):
+        await send_json(send, 404, {"error": "Para birimi bulunamadı / Currency not found"})
+        return
+
+    last_event_id = None
+    for name, value in scope.get("headers", []):
+        if name.lower() == b"last-event-id":
+            last_event_id = value.decode("latin1")
+
+    loop = asyncio.get_running_loop()
+    start_background_tasks()
+    matrix = await loop.run_in_executor(None, get_rate_matrix)
+    if matrix is None:
+        await send_json(send, 500, {"error": "Kurlar alınamadı / Could not fetch rates"})
+        return
+
+    updates = asyncio.Queue(maxsize=broadcast.SSE_QUEUE_SIZE)
+
+    def offer(update):
+        # Yetişemeyen abone: kuyruğu boşalt, tam veri gönder
+        # Subscriber fell behind: drop the backlog and send a full snapshot
+        if updates.full():
+            while not updates.empty():
+                updates.get_nowait()
+            updates.put_nowait((update, True))
+        else:
+            updates.put_nowait((update, False))
+
+    def deliver(update):
+        loop.call_soon_threadsafe(offer, update)
+
+    latest = rate_broadcaster.subscribe(deliver)
+    disconnected = asyncio.ensure_future(wait_for_disconnect(receive))
+    try:
+        await send({
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [
+                (b"content-type", b"text/event-stream; charset=utf-8"),
+                (b"cache-control", b"no-cache"),
+                (b"access-control-allow-origin", b"*"),
+            ],
+        })
+        await send({"type": "http.response.body", "body": broadcast.RETRY, "more_body": True})
+
+        event = broadcast.first_event(latest, base_currency, last_event_id)
+        if event is not None:
+            await send({"type": "http.response.body", "body": event, "more_body": True})
+
+        while True:
+            next_update = asyncio.ensure_future(updates.get())
+            done, _ = await asyncio.wait(
+                {next_update, disconnected},
+                timeout=broadcast.SSE_HEARTBEAT,
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+
+            if disconnected in done:
+                next_update.cancel()
+                return
+
+            if next_update in done:
+                event = broadcast.next_event(next_update.result(), base_currency)
+            else:
+                next_update.cancel()
+                event = broadcast.HEARTBEAT
+
+            if event is not None:
+                await send({"type": "http.response.body", "body": event, "more_body": True})
+    finally:
+        rate_broadcaster.unsubscribe(deliver)
+        disconnected.cancel()
+
+
+# Akışlar olay döngüsünde çalışır, iş parçacığı tutmaz; sayfa her zaman akışı açabilir
+# Streams run on the event loop and hold no thread; the page may always open one
+flask_app.config["ASYNC_STREAMS"] = True
+
+# ASGI sunucusunun yükleyeceği uygulama / Application loaded by the ASGI server
+application = AsgiRouter(
+    flask_app,
+    on_startup=[start_background_tasks],
+    async_routes={"/api/stream/rates": stream_rates},
+)
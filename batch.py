@@ -0,0 +1,305 @@
+# ============================================================
+# KurTakip - Toplu Dönüşüm / Batch Conversion
+# Çok sayıda (kaynak, hedef, miktar) satırını tek seferde çevirir
+# Converts many (from, to, amount) rows in one go
+# ============================================================
+
+# --- Kütüphaneleri içe aktar / Import libraries ---
+import csv
+import io
+import json
+
+import money
+
+# Desteklenen gövde biçimleri / Supported body formats
+FORMAT_JSON = "json"
+FORMAT_CSV = "csv"
+FORMAT_NDJSON = "ndjson"
+
+# CSV çıktı sütunları / CSV output columns
+CSV_COLUMNS = ["row", "from", "to", "amount", "rate", "result", "error"]
+
+
+class RowError(ValueError):
+    """
+    Tek bir satırdaki hata (diğer satırlar yine çevrilir).
+    An error in a single row (the other rows are still converted).
+    """
+
+
+def detect_format(content_type):
+    """
+    Content-Type başlığından gövde biçimini bulur.
+    Detects the body format from the Content-Type header.
+
+    Döndürür / Returns:
+        "json", "csv" ya da "ndjson" / or None
+    """
+    content_type = (content_type or "").split(";")[0].strip().lower()
+
+    if content_type in ("application/json", ""):
+        return FORMAT_JSON
+    if content_type in ("text/csv", "application/csv"):
+        return FORMAT_CSV
+    if content_type in ("application/x-ndjson", "application/ndjson", "application/jsonl"):
+        return FORMAT_NDJSON
+    return None
+
+
+def normalize_row(raw_row):
+    """
+    Bir satırı (kaynak, hedef, miktar, tam miktar) dörtlüsüne çevirir.
+    Turns a row into a (from, to, amount, exact amount) tuple.
+
+    Tam miktar, /api/convert'teki gibi satırdaki asıl yazıdan okunur
+    (float'a çevrilmeden), böylece iki yol aynı sonucu verir.
+    The exact amount is read from the row's original text (never through a
+    float), as /api/convert does, so both paths give the same result.
+
+    "from"/"to" ya da GET API'deki "from_currency"/"to_currency" adları kabul edilir.
+    Accepts "from"/"to" or the GET API's "from_currency"/"to_currency" names.
+
+    Hatalar / Raises:
+        RowError: Satır geçersizse / If the row is invalid
+    """
+    if not isinstance(raw_row, dict):
+        raise RowError("Satır bir nesne olmalı / Row must be an object")
+
+    from_currency = raw_row.get("from", raw_row.get("from_currency"))
+    to_currency = raw_row.get("to", raw_row.get("to_currency"))
+    amount_value = raw_row.get("amount")
+
+    if not from_currency or not to_currency:
+        raise RowError("from ve to gerekli / from and to are required")
+
+    if isinstance(amount_value, bool):
+        raise RowError("Geçersiz miktar / Invalid amount")
+
+    try:
+        exact_amount = money.parse_amount(amount_value)
+        amount = float(amount_value)
+    except (TypeError, ValueError) as error:
+        raise RowError(str(error))
+
+    if exact_amount[0] <= 0:
+        raise RowError("Miktar 0'dan büyük olmalı / Amount must be > 0")
+
+    return str(from_currency).strip().upper(), str(to_currency).strip().upper(), amount, exact_amount
+
+
+def iter_raw_rows(lines, body_format):
+    """
+    Satır satır gelen gövdeden ham satırlar üretir (tamamı belleğe alınmaz).
+    Yields raw rows from a line-by-line body (never held in memory whole).
+
+    Parametreler / Parameters:
+        lines: Yazı satırları üreten yineleyici / Iterator of text lines
+        body_format: "csv" ya da "ndjson"
+
+    Üretir / Yields:
+        Sözlük ya da okunamayan satır için RowError / A dict, or a RowError for an unreadable line
+    """
+    if body_format == FORMAT_CSV:
+        for raw_row in csv.DictReader(lines):
+            yield raw_row
+        return
+
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError:
+            yield RowError("Geçersiz JSON satırı / Invalid JSON line")
+
+
+def format_from_path(path):
+    """
+    Dosya uzantısından biçimi bulur (.csv ise CSV, değilse NDJSON).
+    Detects the format from a file extension (.csv is CSV, anything else NDJSON).
+    """
+    if str(path).lower().endswith(".csv"):
+        return FORMAT_CSV
+    return FORMAT_NDJSON
+
+
+def parse_rows(body, body_format):
+    """
+    İstek gövdesini ham satır listesine çevirir.
+    Parses a request body into a list of raw rows.
+
+    Parametreler / Parameters:
+        body: İstek gövdesi (yazı) / Request body (text)
+        body_format: "json", "csv" ya da "ndjson"
+
+    Döndürür / Returns:
+        Ham satır listesi / List of raw rows
+
+    Hatalar / Raises:
+        ValueError: Gövde okunamazsa / If the body cannot be parsed
+    """
+    if body_format == FORMAT_JSON:
+        data = json.loads(body)
+        if isinstance(data, dict):
+            data = data.get("rows")
+        if not isinstance(data, list):
+            raise ValueError("JSON dizisi bekleniyor / Expected a JSON array")
+        return data
+
+    return list(iter_raw_rows(io.StringIO(body), body_format))
+
+
+def check_row(raw_row, is_valid_currency):
+    """
+    Ham satırı doğrular ve (kaynak, hedef, miktar, tam miktar) dörtlüsüne çevirir.
+    Validates a raw row and turns it into a (from, to, amount, exact amount) tuple.
+
+    Hatalar / Raises:
+        RowError: Satır geçersizse / If the row is invalid
+    """
+    if isinstance(raw_row, RowError):
+        raise raw_row
+
+    row = normalize_row(raw_row)
+    if not is_valid_currency(row[0]) or not is_valid_currency(row[1]):
+        raise RowError("Geçersiz para birimi / Invalid currency")
+    return row
+
+
+def source_rates(matrix, from_currency):
+    """
+    Kaynak para biriminin kur satırını ve ölçeklenmiş halini döndürür.
+    Returns a source currency's rate row and its scaled-integer form.
+
+    Döndürür / Returns:
+        (kurlar / rates, ölçeklenmiş kurlar / scaled rates)
+    """
+    rates = matrix.row(from_currency) or {}
+    return rates, money.scale_rates(rates)
+
+
+def converted_row(from_currency, to_currency, amount, exact_amount, rate, rate_units, rounding):
+    """
+    Başarılı bir dönüşüm sonucunu oluşturur (sonuç kuruş hanesine yuvarlanır).
+    Builds a successful conversion result (rounded to the minor unit).
+    """
+    return {
+        "from": from_currency,
+        "to": to_currency,
+        "amount": amount,
+        "rate": rate,
+        "result": money.convert_scaled(exact_amount, rate_units, to_currency, rounding),
+    }
+
+
+def convert_rows(raw_rows, matrix, is_valid_currency, rounding=money.ROUNDING_MODE):
+    """
+    Satırları kaynak para birimine göre gruplayıp kur matrisiyle çevirir.
+    Groups rows by source currency and converts them against the rate matrix.
+
+    Sonuçlar gelen sırayla döner; hatalı satırlar {"error": ...} olarak işaretlenir.
+    Results come back in the input order; bad rows are marked as {"error": ...}.
+
+    Parametreler / Parameters:
+        raw_rows: Ham satırlar / Raw rows
+        matrix: RateMatrix
+        is_valid_currency: Para birimi kontrol fonksiyonu / Currency check function
+        rounding: Yuvarlama kipi / Rounding mode
+
+    Döndürür / Returns:
+        Sonuç listesi / List of results
+    """
+    results = [None] * len(raw_rows)
+
+    # Satırları kaynak para birimine göre grupla / Group rows by source currency
+    groups = {}
+    for index, raw_row in enumerate(raw_rows):
+        try:
+            from_currency, to_currency, amount, exact_amount = check_row(raw_row, is_valid_currency)
+        except RowError as error:
+            results[index] = {"row": index, "error": str(error)}
+            continue
+
+        groups.setdefault(from_currency, []).append((index, to_currency, amount, exact_amount))
+
+    # Her kaynak için kur satırını bir kez al / Look up each source's rate row once
+    for from_currency, items in groups.items():
+        rates, scaled = source_rates(matrix, from_currency)
+
+        for index, to_currency, amount, exact_amount in items:
+            rate = rates.get(to_currency)
+            if rate is None:
+                results[index] = {"row": index, "error": "Kur bulunamadı / Rate not found"}
+                continue
+
+            results[index] = converted_row(
+                from_currency, to_currency, amount, exact_amount, rate, scaled[to_currency], rounding
+            )
+
+    return results
+
+
+def iter_converted(raw_rows, matrix, is_valid_currency, rounding=money.ROUNDING_MODE):
+    """
+    Satırları geldikçe tek tek çevirir (akış için; bellek kullanımı sabit kalır).
+    Converts rows one by one as they arrive (for streaming; memory stays flat).
+
+    Parametreler / Parameters:
+        raw_rows: Ham satır yineleyicisi / Iterator of raw rows
+        matrix: RateMatrix
+        is_valid_currency: Para birimi kontrol fonksiyonu / Currency check function
+        rounding: Yuvarlama kipi / Rounding mode
+
+    Üretir / Yields:
+        Her satır için sonuç (satır numarasıyla) / One result per row (with its row number)
+    """
+    rates_by_source = {}
+
+    for index, raw_row in enumerate(raw_rows):
+        try:
+            from_currency, to_currency, amount, exact_amount = check_row(raw_row, is_valid_currency)
+        except RowError as error:
+            yield {"row": index, "error": str(error)}
+            continue
+
+        # Kaynak para biriminin kur satırını bir kez al / Look up the source's rate row once
+        source = rates_by_source.get(from_currency)
+        if source is None:
+            source = source_rates(matrix, from_currency)
+            rates_by_source[from_currency] = source
+
+        rates, scaled = source
+        rate = rates.get(to_currency)
+        if rate is None:
+            yield {"row": index, "error": "Kur bulunamadı / Rate not found"}
+            continue
+
+        result = converted_row(from_currency, to_currency, amount, exact_amount, rate, scaled[to_currency], rounding)
+        result["row"] = index
+        yield result
+
+
+def iter_output(results, body_format):
+    """
+    Sonuçları giriş biçiminde (CSV ya da NDJSON) yazı parçalarına çevirir.
+    Turns results into text chunks in the input format (CSV or NDJSON).
+
+    Üretir / Yields:
+        Her sonuç için bir satır / One line per result
+    """
+    if body_format == FORMAT_CSV:
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=CSV_COLUMNS, lineterminator="\n")
+        writer.writeheader()
+        yield buffer.getvalue()
+
+        for result in results:
+            buffer.seek(0)
+            buffer.truncate()
+            writer.writerow(result)
+            yield buffer.getvalue()
+        return
+
+    for result in results:
+        yield json.dumps(result, ensure_ascii=False) + "\n"
@@ -0,0 +1,347 @@
+# ============================================================
+# KurTakip - Canlı Kur Yayını / Live Rate Broadcast
+# Yeni kur verisini Server-Sent Events (SSE) ile tüm abonelere iletir
+# Pushes new rate snapshots to every subscriber with Server-Sent Events (SSE)
+# ============================================================
+#
+# Tek bir üretici (kur önbelleği) yeni veri yayınladığında her aboneye
+# sadece değişen kurlar gönderilir. Olay metni her temel para birimi için
+# bir kez oluşturulur; binlerce abone aynı baytları paylaşır.
+# When the single producer (the rate cache) publishes a new snapshot each
+# subscriber gets only the rates that changed. The event text is built once
+# per base currency and the same bytes are shared by thousands of subscribers.
+# ============================================================
+
+# --- Kütüphaneleri içe aktar / Import libraries ---
+import json
+import logging
+import os
+import queue
+import threading
+
+# --- Log ayarları / Logging setup ---
+logger = logging.getLogger(__name__)
+
+# Abone başına bekleyen en fazla güncelleme / Max pending updates per subscriber
+SSE_QUEUE_SIZE = int(os.getenv("SSE_QUEUE_SIZE", "16"))
+
+# Bağlantıyı canlı tutan boş mesaj aralığı (saniye)
+# Interval of the keep-alive comment (seconds)
+SSE_HEARTBEAT = float(os.getenv("SSE_HEARTBEAT", "15"))
+
+# WSGI modunda süreç başına aynı anda açık olabilecek akış sayısı. Her akış
+# bir işçi iş parçacığını bağlantı kapanana kadar tutar; varsayılan gunicorn
+# iş parçacıklarının (GUNICORN_THREADS) yarısıdır, diğer yarısı isteklere kalır.
+# 0 = akış sadece ASGI modunda
+# Streams that may be open at once per process in WSGI mode. Each stream holds
+# a worker thread until it disconnects; the default is half of the gunicorn
+# threads (GUNICORN_THREADS), leaving the other half for requests.
+# 0 = streams are served in ASGI mode only
+SSE_WSGI_MAX_STREAMS = int(os.getenv("SSE_WSGI_MAX_STREAMS", str(int(os.getenv("GUNICORN_THREADS", "4")) // 2)))
+
+# Bağlantıyı canlı tutan boş mesaj / Keep-alive comment
+HEARTBEAT = b": ping\n\n"
+
+# Koptuğunda tarayıcının yeniden bağlanma süresi (ms) / Browser reconnect delay (ms)
+RETRY = b"retry: 5000\n\n"
+
+
+def sse_event(event, data, event_id=None):
+    """
+    Tek bir SSE olayını bayt olarak yazar.
+    Encodes a single SSE event as bytes.
+
+    Parametreler / Parameters:
+        event: Olay adı / Event name
+        data: JSON'a çevrilecek veri / Data to encode as JSON
+        event_id: Olay kimliği (yeniden bağlanmada Last-Event-ID olur) / Event id (sent back as Last-Event-ID)
+    """
+    lines = []
+    if event_id is not None:
+        lines.append("id: " + str(event_id))
+    lines.append("event: " + event)
+    lines.append("data: " + json.dumps(data, ensure_ascii=False, separators=(",", ":")))
+    return ("\n".join(lines) + "\n\n").encode("utf-8")
+
+
+class RateUpdate:
+    """
+    Bir kur verisi yayını: yeni matris ve bir önceki matris.
+    One published snapshot: the new matrix and the one before it.
+
+    Olaylar temel para birimi başına bir kez oluşturulur ve saklanır.
+    Events are built once per base currency and kept.
+    """
+
+    def __init__(self, matrix, previous=None):
+        self.matrix = matrix
+        self.previous = previous
+        self._snapshots = {}
+        self._diffs = {}
+
+    @property
+    def version(self):
+        return self.matrix.version
+
+    def snapshot_event(self, base_currency):
+        """
+        Temel para biriminin tüm kurlarını içeren olay ("snapshot").
+        Event holding all rates of the base currency ("snapshot").
+        """
+        event = self._snapshots.get(base_currency)
+        if event is None:
+            event = sse_event("snapshot", {
+                "base": base_currency,
+                "date": self.matrix.date,
+                "rates": self.matrix.row(base_currency) or {},
+            }, self.version)
+            self._snapshots[base_currency] = event
+        return event
+
+    def diff_event(self, base_currency):
+        """
+        Sadece değişen kurları içeren olay ("rates"); değişiklik yoksa None.
+        Event holding only the rates that changed ("rates"); None if nothing changed.
+        """
+        if self.previous is None:
+            return self.snapshot_event(base_currency)
+
+        if base_currency in self._diffs:
+            return self._diffs[base_currency]
+
+        old_rates = self.previous.row(base_currency) or {}
+        new_rates = self.matrix.row(base_currency) or {}
+        changes = {}
+        for code, rate in new_rates.items():
+            if old_rates.get(code) != rate:
+                changes[code] = rate
+
+        event = None
+        if changes or self.previous.date != self.matrix.date:
+            event = sse_event("rates", {
+                "base": base_currency,
+                "date": self.matrix.date,
+                "rates": changes,
+            }, self.version)
+        self._diffs[base_currency] = event
+        return event
+
+
+class Subscription:
+    """
+    İş parçacığı tabanlı bir abone (WSGI akış yanıtları için).
+    A thread-based subscriber (for WSGI streaming responses).
+
+    Abone yetişemezse bekleyen güncellemeler atılır ve bir sonraki
+    olayda tüm kurlar ("snapshot") gönderilir.
+    If the subscriber falls behind its pending updates are dropped and the
+    next event carries all rates ("snapshot").
+    """
+
+    def __init__(self, maxsize=SSE_QUEUE_SIZE):
+        self._queue = queue.Queue(maxsize=maxsize)
+
+    def deliver(self, update):
+        """
+        Yayıncı tarafından çağrılır; asla beklemez.
+        Called by the broadcaster; never blocks.
+        """
+        try:
+            self._queue.put_nowait((update, False))
+        except queue.Full:
+            # Yetişemeyen abone: kuyruğu boşalt, tam veri gönder
+            # Subscriber fell behind: drop the backlog and send a full snapshot
+            while True:
+                try:
+                    self._queue.get_nowait()
+                except queue.Empty:
+                    break
+            self._queue.put_nowait((update, True))
+
+    def next(self, timeout):
+        """
+        Bir sonraki güncellemeyi bekler.
+        Waits for the next update.
+
+        Döndürür / Returns:
+            (güncelleme / update, tam mı / is full) ya da süre dolarsa None / or None on timeout
+        """
+        try:
+            return self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+
+class StreamSlots:
+    """
+    Aynı anda açık olabilecek iş parçacığı tabanlı akışları sınırlar.
+    Limits how many thread-based streams may be open at once.
+    """
+
+    def __init__(self, limit):
+        """
+        Parametre / Parameter:
+            limit: En fazla açık akış / Most open streams (0 = hiç / none)
+        """
+        self.limit = limit
+        self._lock = threading.Lock()
+        self._open = 0
+
+    def acquire(self):
+        """
+        Yer varsa bir akış ayırır. / Reserves a stream if there is room.
+
+        Döndürür / Returns:
+            Ayrıldıysa True / True if reserved
+        """
+        with self._lock:
+            if self._open >= self.limit:
+                return False
+            self._open += 1
+            return True
+
+    def release(self):
+        """
+        Kapanan akışın yerini boşaltır. / Frees the slot of a closed stream.
+        """
+        with self._lock:
+            if self._open > 0:
+                self._open -= 1
+
+    def available(self):
+        """
+        Yeni bir akış açılabilir mi? / Can a new stream be opened?
+        """
+        with self._lock:
+            return self._open < self.limit
+
+
+class RateBroadcaster:
+    """
+    Yeni kur verisini tüm abonelere dağıtan tek üretici.
+    The single producer that fans new rate snapshots out to every subscriber.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers = set()
+        self._latest = None
+
+    @property
+    def latest(self):
+        """
+        Son yayınlanan güncelleme (yoksa None).
+        The last published update (None if there is none).
+        """
+        with self._lock:
+            return self._latest
+
+    def subscriber_count(self):
+        """
+        Bağlı abone sayısı / Number of connected subscribers
+        """
+        with self._lock:
+            return len(self._subscribers)
+
+    def subscribe(self, deliver):
+        """
+        Bir aboneyi ekler.
+        Adds a subscriber.
+
+        Parametre / Parameter:
+            deliver: Her güncellemede çağrılan fonksiyon (beklememeli)
+                     Function called with every update (must not block)
+
+        Döndürür / Returns:
+            Son yayınlanan güncelleme (ilk olay için) / The last published update (for the first event)
+        """
+        with self._lock:
+            self._subscribers.add(deliver)
+            return self._latest
+
+    def unsubscribe(self, deliver):
+        """
+        Bir aboneyi çıkarır.
+        Removes a subscriber.
+        """
+        with self._lock:
+            self._subscribers.discard(deliver)
+
+    def publish(self, matrix):
+        """
+        Yeni kur matrisini yayınlar; sürüm değişmediyse bir şey yapmaz.
+        Publishes a new rate matrix; does nothing if its version is unchanged.
+        """
+        with self._lock:
+            previous = self._latest
+            if previous is not None and previous.version == matrix.version:
+                return
+            update = RateUpdate(matrix, previous.matrix if previous is not None else None)
+            self._latest = update
+            subscribers = list(self._subscribers)
+
+        for deliver in subscribers:
+            try:
+                deliver(update)
+            except Exception as error:
+                logger.error("Yayın hatası / Broadcast error: " + str(error))
+
+
+def first_event(latest, base_currency, last_event_id=None):
+    """
+    Bağlanan aboneye gönderilecek ilk olay (tüm kurlar).
+    The first event for a newly connected subscriber (all rates).
+
+    İstemcinin Last-Event-ID'si güncel sürümse None (zaten güncel).
+    None if the client's Last-Event-ID is already the current version.
+    """
+    if latest is None or str(latest.version) == last_event_id:
+        return None
+    return latest.snapshot_event(base_currency)
+
+
+def next_event(item, base_currency):
+    """
+    Kuyruktan alınan (güncelleme, tam mı) ikilisini olaya çevirir.
+    Turns an (update, is full) pair taken from a queue into an event.
+
+    Döndürür / Returns:
+        Olay baytları ya da bu temel birim için değişiklik yoksa None
+        Event bytes, or None if nothing changed for this base currency
+    """
+    update, full = item
+    if full:
+        return update.snapshot_event(base_currency)
+    return update.diff_event(base_currency)
+
+
+def iter_events(broadcaster, base_currency, last_event_id=None, heartbeat=SSE_HEARTBEAT):
+    """
+    Bir abone için SSE olaylarını üretir (WSGI akış yanıtı olarak kullanılır).
+    Yields the SSE events for one subscriber (used as a WSGI streaming response).
+
+    Bağlanınca tüm kurlar, sonra sadece değişenler gönderilir.
+    All rates are sent on connect, then only the changes.
+    """
+    subscription = Subscription()
+    latest = broadcaster.subscribe(subscription.deliver)
+
+    try:
+        # Tarayıcıya yeniden bağlanma süresini bildir / Tell the browser how soon to reconnect
+        yield RETRY
+
+        event = first_event(latest, base_currency, last_event_id)
+        if event is not None:
+            yield event
+
+        while True:
+            item = subscription.next(heartbeat)
+            if item is None:
+                yield HEARTBEAT
+                continue
+
+            event = next_event(item, base_currency)
+            if event is not None:
+                yield event
+    finally:
+        broadcaster.unsubscribe(subscription.deliver)
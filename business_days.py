@@ -0,0 +1,187 @@
+# ============================================================
+# KurTakip - İş Günü Takvimi / Business-Day Calendar
+# ECB (TARGET) tatillerine göre hangi günün kurunun geçerli olduğunu bulur
+# Finds which day's fixing applies, following the ECB (TARGET) holidays
+# ============================================================
+#
+# ECB referans kurları sadece TARGET iş günlerinde yayınlanır: hafta sonları,
+# 1 Ocak, Paskalya Cuması, Paskalya Pazartesisi, 1 Mayıs, 25 ve 26 Aralık hariç.
+# Her yılın iş günleri bir kez hesaplanıp sıralı bir dizide tutulur; bir
+# tarihin geçerli kur günü ikili arama ile internete çıkmadan bulunur.
+# ECB reference rates are published on TARGET business days only: not on
+# weekends, 1 January, Good Friday, Easter Monday, 1 May, 25 and 26 December.
+# Each year's business days are computed once and kept in a sorted array, so
+# the fixing date for any day is found by binary search with no network call.
+# ============================================================
+
+# --- Kütüphaneleri içe aktar / Import libraries ---
+import bisect
+import threading
+from datetime import date, timedelta
+
+# İlk ECB referans kuru (euronun ilk işlem günü); öncesinde geçerli kur yoktur
+# First ECB reference rate (the euro's first trading day); no fixing applies before it
+FIRST_FIXING_DATE = date(1999, 1, 4)
+
+# Hesaplanmış yıllar: yıl -> sıralı iş günü sıra numaraları (toordinal)
+# Computed years: year -> sorted business-day ordinals (toordinal)
+_years = {}
+_lock = threading.Lock()
+
+
+def easter_sunday(year):
+    """
+    Paskalya Pazarını hesaplar (Gregoryen takvim, Anonymous algoritması).
+    Computes Easter Sunday (Gregorian calendar, Anonymous algorithm).
+    """
+    a = year % 19
+    b = year // 100
+    c = year % 100
+    d = b // 4
+    e = b % 4
+    f = (b + 8) // 25
+    g = (b - f + 1) // 3
+    h = (19 * a + b - d - g + 15) % 30
+    i = c // 4
+    k = c % 4
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * l) // 451
+    month = (h + l - 7 * m + 114) // 31
+    day = (h + l - 7 * m + 114) % 31 + 1
+    return date(year, month, day)
+
+
+def target_holidays(year):
+    """
+    Bir yılın TARGET tatil günleri.
+    The TARGET holidays of a year.
+
+    Döndürür / Returns:
+        Tarih kümesi / Set of dates
+    """
+    easter = easter_sunday(year)
+    return {
+        date(year, 1, 1),
+        easter - timedelta(days=2),
+        easter + timedelta(days=1),
+        date(year, 5, 1),
+        date(year, 12, 25),
+        date(year, 12, 26),
+    }
+
+
+def _year_index(year):
+    """
+    Yılın iş günlerini (sıra numarası olarak) döndürür; ilk seferde hesaplar.
+    Returns the year's business days (as ordinals), computing them the first time.
+    """
+    index = _years.get(year)
+    if index is not None:
+        return index
+
+    holidays = target_holidays(year)
+    index = []
+    day = date(year, 1, 1)
+    while day.year == year:
+        if day.weekday() < 5 and day not in holidays:
+            index.append(day.toordinal())
+        day += timedelta(days=1)
+
+    with _lock:
+        _years[year] = index
+    return index
+
+
+def is_business_day(day):
+    """
+    Gün bir TARGET iş günü mü? / Is the day a TARGET business day?
+    """
+    index = _year_index(day.year)
+    position = bisect.bisect_left(index, day.toordinal())
+    return position < len(index) and index[position] == day.toordinal()
+
+
+def fixing_date(day):
+    """
+    Bir gün için geçerli kurun tarihi: o gün ya da öncesindeki son iş günü.
+    The date of the fixing that applies on a day: that day or the last business day before it.
+
+    Örnek / Example: fixing_date(date(2024, 12, 1)) -> date(2024, 11, 29) (Pazar / Sunday)
+
+    Hatalar / Raises:
+        ValueError: Gün FIRST_FIXING_DATE öncesindeyse / If the day is before FIRST_FIXING_DATE
+    """
+    if day < FIRST_FIXING_DATE:
+        raise ValueError("ECB kurları " + FIRST_FIXING_DATE.isoformat() + " tarihinden başlar / ECB fixings start on " + FIRST_FIXING_DATE.isoformat())
+
+    year = day.year
+    ordinal = day.toordinal()
+
+    while True:
+        index = _year_index(year)
+        position = bisect.bisect_right(index, ordinal)
+        if position > 0:
+            return date.fromordinal(index[position - 1])
+
+        # Yılın ilk iş gününden önce: bir önceki yılın son iş günü
+        # Before the year's first business day: last business day of the previous year
+        year -= 1
+
+
+def business_days_between(start_date, end_date):
+    """
+    İki tarih arasındaki (ikisi de dahil) iş günleri.
+    The business days between two dates (both included).
+    """
+    result = []
+    for year in range(start_date.year, end_date.year + 1):
+        index = _year_index(year)
+        low = bisect.bisect_left(index, start_date.toordinal())
+        high = bisect.bisect_right(index, end_date.toordinal())
+        for ordinal in index[low:high]:
+            result.append(date.fromordinal(ordinal))
+    return result
+
+
+def has_business_day(start_date, end_date):
+    """
+    Aralıkta en az bir iş günü var mı? / Is there at least one business day in the range?
+    """
+    if end_date < start_date or end_date < FIRST_FIXING_DATE:
+        return False
+    return fixing_date(end_date) >= start_date
+
+
+def fill_forward(points, end_date):
+    """
+    Eksik günleri bir önceki kurla doldurur (last observation carried forward).
+    Fills missing days with the previous rate (last observation carried forward).
+
+    İlk kurdan bitiş gününe kadar her takvim günü için bir kayıt döner;
+    doldurulan günlerde "fixing_date" kurun asıl tarihini gösterir.
+    Returns one entry per calendar day from the first rate up to the end
+    date; filled days carry "fixing_date", the date the rate comes from.
+
+    Parametreler / Parameters:
+        points: [{"date": "2024-11-29", "rate": 34.6}, ...] (tarihe göre sıralı / sorted by date)
+        end_date: Son gün / Last day (date)
+    """
+    if len(points) == 0:
+        return []
+
+    result = []
+    day = date.fromisoformat(points[0]["date"])
+    position = 0
+    last = None
+
+    while day <= end_date:
+        day_text = day.isoformat()
+        if position < len(points) and points[position]["date"] == day_text:
+            last = points[position]
+            position += 1
+            result.append({"date": day_text, "rate": last["rate"]})
+        else:
+            result.append({"date": day_text, "rate": last["rate"], "fixing_date": last["date"]})
+        day += timedelta(days=1)
+
+    return result
@@ -0,0 +1,335 @@
+# ============================================================
+# KurTakip - Önbellek / Cache
+# Yukarı akış (upstream) API çağrılarını azaltmak için bellek içi önbellek
+# In-process cache to reduce upstream API calls
+# ============================================================
+
+# --- Kütüphaneleri içe aktar / Import libraries ---
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+# --- Log ayarları / Logging setup ---
+logger = logging.getLogger(__name__)
+
+
+# ============================================================
+# Tekil Uçuş / Single Flight
+# Aynı anahtar için aynı anda gelen istekleri tek bir çağrıda birleştirir
+# Coalesces concurrent calls for the same key into a single call
+# ============================================================
+
+class _Call:
+    """
+    Devam eden tek bir çağrıyı temsil eder.
+    Represents one in-flight call.
+    """
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Aynı anahtar için eşzamanlı çağrıları birleştirir.
+    Coalesces concurrent calls for the same key.
+
+    İlk gelen çağrı fonksiyonu çalıştırır, diğerleri onun sonucunu bekler.
+    The first caller runs the function, the others wait for its result.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def do(self, key, function):
+        """
+        Fonksiyonu anahtar başına en fazla bir kez aynı anda çalıştırır.
+        Runs the function at most once at a time per key.
+
+        Parametreler / Parameters:
+            key: Çağrı anahtarı / Call key (örn: "USD")
+            function: Parametresiz fonksiyon / Function with no arguments
+
+        Döndürür / Returns:
+            Fonksiyonun sonucu / The function's result
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            is_leader = call is None
+            if is_leader:
+                call = _Call()
+                self._calls[key] = call
+
+        # Başka biri zaten çalıştırıyor, sonucu bekle
+        # Someone else is already running it, wait for the result
+        if not is_leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = function()
+        except Exception as error:
+            call.error = error
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+        return call.result
+
+    def in_flight(self, key):
+        """
+        Bu anahtar için devam eden bir çağrı var mı?
+        Is there an in-flight call for this key?
+        """
+        with self._lock:
+            return key in self._calls
+
+
+# ============================================================
+# TTL Önbellek / TTL Cache
+# ============================================================
+
+class TTLCache:
+    """
+    Süreli (TTL) ve "bayatken yenile" (stale-while-revalidate) destekli önbellek.
+    Cache with a time-to-live and stale-while-revalidate support.
+
+    - Taze kayıt (yaş < ttl): doğrudan döndürülür
+      Fresh entry (age < ttl): returned directly
+    - Bayat kayıt (ttl <= yaş < ttl + stale_ttl): hemen döndürülür,
+      arka planda yenilenir
+      Stale entry (ttl <= age < ttl + stale_ttl): returned at once and
+      refreshed in the background
+    - Kayıt yok ya da çok eski: yükleyici çağrılır (eşzamanlı çağrılar birleştirilir)
+      Missing or too old: the loader is called (concurrent calls coalesced)
+
+    Yükleyici None döndürürse sonuç önbelleğe alınmaz.
+    If the loader returns None the result is not cached.
+
+    maxsize verilirse kayıt sayısı sınırlanır: sınır aşılınca önce süresi tamamen
+    dolmuş kayıtlar, yetmezse en uzun süredir kullanılmayan kayıt atılır (LRU).
+    With maxsize the number of entries is bounded: past the limit fully expired
+    entries are dropped first, then the least recently used one (LRU).
+    """
+
+    def __init__(self, loader, ttl, stale_ttl=0.0, on_put=None, maxsize=None):
+        """
+        Parametreler / Parameters:
+            loader: Anahtarı alıp değeri döndüren fonksiyon / Function taking a key and returning its value
+            ttl: Taze kalma süresi (saniye) / Freshness lifetime (seconds)
+            stale_ttl: Bayat değerin sunulabileceği ek süre / Extra time a stale value may be served
+            on_put: Her yeni değer saklandığında (anahtar, değer) ile çağrılır (isteğe bağlı)
+                    Called with (key, value) whenever a value is stored (optional)
+            maxsize: En fazla kayıt sayısı (None = sınırsız) / Most entries kept (None = unbounded)
+        """
+        self.loader = loader
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.on_put = on_put
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._refreshing = set()
+        self._flight = SingleFlight()
+
+    def get(self, key):
+        """
+        Anahtarın değerini önbellekten ya da yükleyiciden döndürür.
+        Returns the value for a key, from the cache or the loader.
+
+        Döndürür / Returns:
+            Değer ya da yüklenemezse None / The value, or None if it could not be loaded
+        """
+        now = time.monotonic()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+
+        if entry is not None:
+            stored_at, value = entry
+            age = now - stored_at
+
+            # Taze / Fresh
+            if age < self.ttl:
+                return value
+
+            # Bayat ama hâlâ sunulabilir / Stale but still servable
+            if age < self.ttl + self.stale_ttl:
+                self._refresh_in_background(key)
+                return value
+
+        # Önbellekte yok ya da çok eski / Missing or too old
+        return self._flight.do(key, lambda: self._load(key))
+
+    def refresh(self, key):
+        """
+        Anahtarı hemen yükleyiciden yeniler (eşzamanlı çağrılar birleştirilir).
+        Refreshes a key from the loader now (concurrent calls coalesced).
+        """
+        return self._flight.do(key, lambda: self._load(key))
+
+    def put(self, key, value, age=0.0):
+        """
+        Bir değeri önbelleğe elle yazar.
+        Stores a value in the cache manually.
+
+        Parametreler / Parameters:
+            key: Anahtar / Key
+            value: Değer / Value
+            age: Değerin şimdiden yaşı (saniye; örn. diskten okunan veri)
+                 How old the value already is (seconds; e.g. data read from disk)
+        """
+        with self._lock:
+            self._entries[key] = (time.monotonic() - age, value)
+            self._entries.move_to_end(key)
+            if self.maxsize is not None and len(self._entries) > self.maxsize:
+                self._evict()
+
+        if self.on_put is not None:
+            self.on_put(key, value)
+
+    def age(self, key):
+        """
+        Kaydın yaşı (saniye) ya da kayıt yoksa None.
+        Age of the entry (seconds), or None if there is no entry.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None:
+            return None
+        return time.monotonic() - entry[0]
+
+    def peek(self, key, max_age=None):
+        """
+        Yükleyiciyi çağırmadan mevcut değeri döndürür.
+        Returns the current value without calling the loader.
+
+        Parametreler / Parameters:
+            key: Anahtar / Key
+            max_age: Bundan eski değer yok sayılır (saniye; None = yaşına bakma)
+                     A value older than this is ignored (seconds; None = ignore the age)
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if max_age is not None and time.monotonic() - entry[0] > max_age:
+            return None
+        return entry[1]
+
+    def clear(self):
+        """
+        Tüm kayıtları siler.
+        Removes all entries.
+        """
+        with self._lock:
+            self._entries.clear()
+
+    def _evict(self):
+        """
+        Kayıt sayısını maxsize'a indirir (kilit tutulurken çağrılır).
+        Shrinks the entries down to maxsize (called with the lock held).
+        """
+        now = time.monotonic()
+        lifetime = self.ttl + self.stale_ttl
+        for key in [key for key, entry in self._entries.items() if now - entry[0] >= lifetime]:
+            del self._entries[key]
+
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def _load(self, key):
+        """
+        Yükleyiciyi çağırır ve başarılı sonucu saklar.
+        Calls the loader and stores a successful result.
+        """
+        value = self.loader(key)
+        if value is not None:
+            self.put(key, value)
+        return value
+
+    def _refresh_in_background(self, key):
+        """
+        Zaten yenilenmiyorsa anahtarı arka planda yeniler.
+        Refreshes the key in the background unless it is already refreshing.
+        """
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        def run():
+            try:
+                self.refresh(key)
+            except Exception as error:
+                logger.error("Arka plan yenileme hatası / Background refresh error: " + str(error))
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        thread = threading.Thread(target=run, name="cache-refresh-" + str(key), daemon=True)
+        thread.start()
+
+
+# ============================================================
+# Sürüm Önbelleği / Version Cache
+# ============================================================
+
+class VersionCache:
+    """
+    Tek bir veri sürümüne bağlı değerleri saklar; sürüm değişince hepsi atılır.
+    Keeps values tied to a single data version; all of them are dropped when
+    the version changes.
+
+    Örnek: kur verisi başına bir kez yazılan JSON gövdeleri.
+    Example: JSON bodies encoded once per rate snapshot.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._version = None
+        self._entries = {}
+
+    def get(self, version, key, build):
+        """
+        Sürüm ve anahtar için değeri döndürür; yoksa build() ile oluşturur.
+        Returns the value for a version and key, building it with build() if missing.
+
+        Parametreler / Parameters:
+            version: Verinin sürümü / Version of the data
+            key: Kayıt anahtarı / Entry key (örn: "USD")
+            build: Parametresiz fonksiyon / Function with no arguments
+        """
+        with self._lock:
+            if self._version == version and key in self._entries:
+                return self._entries[key]
+
+        # Kilit dışında oluştur; yavaş kodlama diğer okuyucuları bekletmez
+        # Build outside the lock so a slow encode does not block other readers
+        value = build()
+
+        with self._lock:
+            if self._version != version:
+                self._version = version
+                self._entries = {}
+            self._entries[key] = value
+        return value
+
+    def clear(self):
+        """
+        Tüm kayıtları siler.
+        Removes all entries.
+        """
+        with self._lock:
+            self._version = None
+            self._entries = {}
@@ -0,0 +1,125 @@
+# ============================================================
+# KurTakip - Yanıt Sıkıştırma / Response Compression
+# Accept-Encoding başlığına göre gzip ya da brotli ile sıkıştırır
+# Compresses responses with gzip or brotli based on Accept-Encoding
+# ============================================================
+
+# --- Kütüphaneleri içe aktar / Import libraries ---
+import gzip
+import os
+
+# brotli isteğe bağlıdır; kurulu değilse sadece gzip kullanılır
+# brotli is optional; without it only gzip is used
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Bu boyuttan küçük yanıtlar sıkıştırılmaz (bayt)
+# Responses smaller than this are not compressed (bytes)
+COMPRESS_MIN_SIZE = int(os.getenv("COMPRESS_MIN_SIZE", "1024"))
+
+# Sıkıştırılacak içerik türleri / Content types worth compressing
+COMPRESSIBLE_TYPES = {
+    "application/json",
+    "application/x-ndjson",
+    "application/x-msgpack",
+    "application/javascript",
+    "text/javascript",
+    "text/css",
+    "text/csv",
+    "text/html",
+    "text/plain",
+}
+
+# Gzip seviyesi (1-9) ve brotli kalitesi (0-11): hız / boyut dengesi
+# Gzip level (1-9) and brotli quality (0-11): speed / size trade-off
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+
+# Başlangıçta bir kez sıkıştırılan dosyalar için en yüksek seviyeler
+# Highest levels, for files compressed once at startup
+GZIP_BEST_LEVEL = 9
+BROTLI_BEST_QUALITY = 11
+
+
+def available_encodings():
+    """
+    Bu kurulumda desteklenen kodlamalar (tercih sırasıyla).
+    Encodings supported by this installation (in order of preference).
+    """
+    if brotli is not None:
+        return ["br", "gzip"]
+    return ["gzip"]
+
+
+def negotiate(accept_encodings):
+    """
+    İstemcinin kabul ettiği en iyi kodlamayı seçer.
+    Picks the best encoding the client accepts.
+
+    Parametre / Parameter:
+        accept_encodings: request.accept_encodings (werkzeug MIMEAccept)
+
+    Döndürür / Returns:
+        "br", "gzip" ya da None / or None
+    """
+    for encoding in available_encodings():
+        if accept_encodings[encoding] > 0:
+            return encoding
+    return None
+
+
+def compress(data, encoding, best=False):
+    """
+    Baytları verilen kodlamayla sıkıştırır.
+    Compresses bytes with the given encoding.
+
+    Parametreler / Parameters:
+        data: Sıkıştırılacak baytlar / Bytes to compress
+        encoding: "br" ya da "gzip" / "br" or "gzip"
+        best: En yüksek seviye (yavaş; önceden sıkıştırma için)
+              Highest level (slow; for precompression)
+    """
+    if encoding == "br":
+        return brotli.compress(data, quality=BROTLI_BEST_QUALITY if best else BROTLI_QUALITY)
+    return gzip.compress(data, compresslevel=GZIP_BEST_LEVEL if best else GZIP_LEVEL, mtime=0)
+
+
+def compress_response(request, response):
+    """
+    Uygun yanıtları istemcinin kabul ettiği kodlamayla sıkıştırır.
+    Compresses eligible responses with an encoding the client accepts.
+
+    Akış yanıtları, dosya yanıtları, küçük gövdeler ve zaten kodlanmış
+    yanıtlar olduğu gibi bırakılır.
+    Streaming responses, file responses, small bodies and responses that
+    are already encoded are left as they are.
+    """
+    response.vary.add("Accept-Encoding")
+
+    if response.status_code != 200 or response.direct_passthrough or response.is_streamed:
+        return response
+    if "Content-Encoding" in response.headers:
+        return response
+    if response.mimetype not in COMPRESSIBLE_TYPES:
+        return response
+
+    encoding = negotiate(request.accept_encodings)
+    if encoding is None:
+        return response
+
+    data = response.get_data()
+    if len(data) < COMPRESS_MIN_SIZE:
+        return response
+
+    response.set_data(compress(data, encoding))
+    response.headers["Content-Encoding"] = encoding
+
+    # Sıkıştırılmış gövde bayt bayt aynı değildir: ETag zayıf olur
+    # The compressed body is not byte-identical, so the ETag becomes weak
+    etag, weak = response.get_etag()
+    if etag is not None and not weak:
+        response.set_etag(etag, weak=True)
+
+    return response
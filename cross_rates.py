@@ -0,0 +1,235 @@
+# ============================================================
+# KurTakip - Çapraz Kur Motoru / Cross-Rate Engine
+# Tek bir çapa (anchor) kur verisinden tüm pariteleri hesaplar
+# Derives every currency pair from a single anchor snapshot
+# ============================================================
+
+# --- Kütüphaneleri içe aktar / Import libraries ---
+import hashlib
+import math
+import threading
+import time
+from array import array
+from collections import deque
+
+
+class RateMatrix:
+    """
+    Desteklenen tüm para birimleri için önceden hesaplanmış kur matrisi.
+    Precomputed rate matrix for all supported currencies.
+
+    Matris satır satır düz bir dizide (array) tutulur:
+    The matrix is stored row by row in a flat array:
+        values[i * n + j] = 1 birim codes[i] kaç codes[j] eder
+        values[i * n + j] = how much codes[j] one unit of codes[i] buys
+
+    Tüm çaprazlar aynı çapa verisinden üretildiği için birbiriyle tutarlıdır:
+    All crosses come from the same anchor snapshot so they are consistent:
+        rate(A, C) == rate(A, B) * rate(B, C)
+    """
+
+    def __init__(self, codes, anchor, anchor_rates, date=None, updated_at=None, created_at=None):
+        """
+        Parametreler / Parameters:
+            codes: Para birimi kodları / Currency codes (örn: ["USD", "EUR"])
+            anchor: Çapa para birimi / Anchor currency (örn: "USD")
+            anchor_rates: 1 çapa biriminin diğer birimlerdeki değeri / Value of one anchor unit in other currencies
+            date: Kur verisinin tarihi / Date of the rate snapshot
+            updated_at: Kaynağın veriyi güncellediği zaman (unix) / When the source updated the data (unix time)
+            created_at: Verinin çekildiği zaman (unix, varsayılan: şimdi) / When the data was fetched (unix, default: now)
+        """
+        self.codes = list(codes)
+        self.anchor = anchor
+        self.date = date
+        if created_at is None:
+            created_at = time.time()
+        self.created_at = created_at
+        if updated_at is None:
+            updated_at = self.created_at
+        self.updated_at = updated_at
+        self.index = {}
+        for position, code in enumerate(self.codes):
+            self.index[code] = position
+
+        # Her birimin çapa karşısındaki değeri (yoksa NaN)
+        # Value of each currency against the anchor (NaN if missing)
+        anchor_values = array("d")
+        for code in self.codes:
+            if code == anchor:
+                anchor_values.append(1.0)
+            else:
+                value = anchor_rates.get(code)
+                if value is None or value <= 0:
+                    anchor_values.append(math.nan)
+                else:
+                    anchor_values.append(float(value))
+        self.anchor_values = anchor_values
+
+        # Matrisi bir kez hesapla / Compute the matrix once
+        # A -> B = (çapa -> B) / (çapa -> A) / (anchor -> B) / (anchor -> A)
+        size = len(self.codes)
+        values = array("d", bytes(8 * size * size))
+        for i in range(size):
+            base_value = anchor_values[i]
+            row_start = i * size
+            for j in range(size):
+                values[row_start + j] = anchor_values[j] / base_value
+        self.values = values
+
+        # Verinin sürümü: aynı kurlar her süreçte aynı sürümü verir (ETag için)
+        # Version of the data: the same rates give the same version in every process (for ETags)
+        digest = hashlib.blake2b(digest_size=8)
+        digest.update(str(date).encode("utf-8"))
+        digest.update(",".join(self.codes).encode("ascii"))
+        digest.update(anchor_values.tobytes())
+        self.version = digest.hexdigest()
+
+    @classmethod
+    def from_snapshot(cls, snapshot, codes):
+        """
+        API yanıtından (çapa para birimi bazlı) matris oluşturur.
+        Builds a matrix from an API response based on the anchor currency.
+
+        Parametreler / Parameters:
+            snapshot: {"base": "USD", "date": "...", "rates": {...}}
+            codes: Matriste yer alacak para birimleri / Currencies to include
+
+        Döndürür / Returns:
+            RateMatrix ya da veri geçersizse None / RateMatrix, or None if the data is invalid
+        """
+        if snapshot is None:
+            return None
+
+        anchor = snapshot.get("base")
+        rates = snapshot.get("rates")
+        if anchor is None or rates is None:
+            return None
+
+        updated_at = snapshot.get("time_last_updated")
+        if not isinstance(updated_at, (int, float)):
+            updated_at = None
+
+        # Diskten okunan verinin asıl çekilme zamanı / When data read from disk was really fetched
+        created_at = snapshot.get("fetched_at")
+        if not isinstance(created_at, (int, float)):
+            created_at = None
+
+        return cls(codes, anchor, rates, snapshot.get("date"), updated_at, created_at)
+
+    def to_snapshot(self):
+        """
+        Matrisi from_snapshot() ile geri okunabilecek sözlüğe çevirir (diske yazmak için).
+        Turns the matrix into a dictionary from_snapshot() can read back (for saving to disk).
+        """
+        return {
+            "base": self.anchor,
+            "date": self.date,
+            "rates": self.row(self.anchor) or {},
+            "time_last_updated": self.updated_at,
+            "fetched_at": self.created_at,
+        }
+
+    def rate(self, base_currency, quote_currency):
+        """
+        1 birim base_currency'nin quote_currency karşılığını döndürür.
+        Returns how much quote_currency one unit of base_currency buys.
+
+        Döndürür / Returns:
+            Kur (float) ya da bilinmiyorsa None / Rate (float), or None if unknown
+        """
+        i = self.index.get(base_currency)
+        j = self.index.get(quote_currency)
+        if i is None or j is None:
+            return None
+
+        value = self.values[i * len(self.codes) + j]
+        if math.isnan(value):
+            return None
+        return value
+
+    def row(self, base_currency):
+        """
+        Bir para biriminin tüm kurlarını sözlük olarak döndürür.
+        Returns all rates of one currency as a dictionary.
+
+        Döndürür / Returns:
+            {"EUR": 0.95, ...} ya da bilinmiyorsa None / or None if unknown
+        """
+        i = self.index.get(base_currency)
+        if i is None or math.isnan(self.anchor_values[i]):
+            return None
+
+        size = len(self.codes)
+        row_start = i * size
+        result = {}
+        for j in range(size):
+            value = self.values[row_start + j]
+            if not math.isnan(value):
+                result[self.codes[j]] = value
+        return result
+
+
+class MatrixRing:
+    """
+    Son kur matrislerini tutan sabit boyutlu halka tampon.
+    Fixed-size ring buffer of recent rate matrices.
+
+    Aynı sürüm art arda eklenmez; en eski matris otomatik düşer.
+    The same version is never added twice in a row; the oldest drops out.
+    """
+
+    def __init__(self, size):
+        """
+        Parametre / Parameter:
+            size: Tutulacak en fazla matris / Maximum number of matrices kept
+        """
+        self._lock = threading.Lock()
+        self._items = deque(maxlen=size)
+
+    def __len__(self):
+        with self._lock:
+            return len(self._items)
+
+    def add(self, matrix):
+        """
+        Yeni bir matris ekler.
+        Adds a new matrix.
+        """
+        with self._lock:
+            if self._items and self._items[-1].version == matrix.version:
+                return
+            self._items.append(matrix)
+
+    def clear(self):
+        """
+        Tüm matrisleri siler.
+        Removes all matrices.
+        """
+        with self._lock:
+            self._items.clear()
+
+    def items(self):
+        """
+        Matrislerin kopyası (eskiden yeniye).
+        A copy of the matrices (oldest first).
+        """
+        with self._lock:
+            return list(self._items)
+
+    def at(self, timestamp):
+        """
+        Verilen zamanda geçerli olan matrisi (o an ya da öncesindeki son veri) döndürür.
+        Returns the matrix in effect at a time (the last data on or before it).
+
+        Parametre / Parameter:
+            timestamp: Unix zamanı / Unix time
+
+        Döndürür / Returns:
+            RateMatrix ya da tampon o kadar eskiye gitmiyorsa None
+            RateMatrix, or None if the buffer does not reach back that far
+        """
+        with self._lock:
+            for matrix in reversed(self._items):
+                if matrix.updated_at <= timestamp:
+                    return matrix
+        return None
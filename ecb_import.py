@@ -0,0 +1,208 @@
+# ============================================================
+# KurTakip - ECB Arşivi Yükleme / ECB Archive Import
+# ECB'nin eurofxref-hist CSV / ZIP arşivini yerel geçmiş kur deposuna yükler
+# Loads the ECB eurofxref-hist CSV / ZIP archive into the local history store
+# ============================================================
+#
+# Dosya satır satır okunur (tamamı belleğe alınmaz). Her gün için EUR
+# bazlı kurlardan tüm (temel, hedef) çiftleri hesaplanır ve toplu olarak
+# yazılır; sonunda her parite için yüklenen aralık "kapsanmış" işaretlenir.
+# The file is read line by line (never held in memory whole). For every day
+# all (base, quote) pairs are derived from the EUR based rates and written in
+# batches; at the end the loaded range of each pair is marked as covered.
+#
+# Dosya biçimi / File format:
+#   Date,USD,JPY,BGN,...,
+#   2024-12-02,1.0512,157.44,1.9558,...,
+# ============================================================
+
+# --- Kütüphaneleri içe aktar / Import libraries ---
+import csv
+import io
+import zipfile
+
+from history_store import parse_day
+
+# Tek seferde yazılan satır sayısı / Rows written per transaction
+IMPORT_BATCH_ROWS = 50000
+
+# ECB kurları 5-6 anlamlı basamaklıdır; çapraz kurlar da buna yuvarlanır
+# ECB rates carry 5-6 significant digits, so cross rates are rounded to match
+SIGNIFICANT_DIGITS = 6
+
+# Arşivin temel para birimi / Base currency of the archive
+ARCHIVE_BASE = "EUR"
+
+
+class ZipText(io.TextIOWrapper):
+    """
+    ZIP içindeki bir dosyayı yazı olarak okur; kapanınca ZIP'i de kapatır.
+    Reads a file inside a ZIP as text; closing it closes the ZIP as well.
+    """
+
+    def __init__(self, archive, name):
+        super().__init__(archive.open(name), encoding="utf-8", newline="")
+        self.archive = archive
+
+    def close(self):
+        try:
+            super().close()
+        finally:
+            self.archive.close()
+
+
+def open_archive(path):
+    """
+    CSV ya da ZIP içindeki CSV dosyasını yazı olarak açar.
+    Opens a CSV file, or the CSV inside a ZIP, as text.
+
+    Dönen dosya kapatılınca (ya da with bloğu bitince) ZIP de kapanır.
+    Closing the returned file (or leaving its with block) closes the ZIP too.
+
+    Hatalar / Raises:
+        ValueError: ZIP içinde CSV yoksa / If the ZIP holds no CSV
+    """
+    if zipfile.is_zipfile(path):
+        archive = zipfile.ZipFile(path)
+        try:
+            for name in archive.namelist():
+                if name.lower().endswith(".csv"):
+                    return ZipText(archive, name)
+        except Exception:
+            archive.close()
+            raise
+        archive.close()
+        raise ValueError("ZIP içinde CSV bulunamadı / No CSV found in the ZIP")
+
+    return open(path, "r", encoding="utf-8", newline="")
+
+
+def iter_fixings(lines, codes):
+    """
+    Arşivdeki her günün EUR bazlı kurlarını üretir.
+    Yields the EUR based rates of every day in the archive.
+
+    Parametreler / Parameters:
+        lines: Yazı satırları / Text lines
+        codes: Alınacak para birimleri / Currencies to keep
+
+    Üretir / Yields:
+        ("2024-12-02", {"EUR": 1.0, "USD": 1.0512, ...})
+    """
+    reader = csv.reader(lines)
+    header = next(reader, None)
+    if header is None:
+        return
+
+    # Gereksiz sütunları baştan ele / Drop unneeded columns up front
+    columns = []
+    for position, name in enumerate(header[1:], start=1):
+        code = name.strip().upper()
+        if code in codes and code != ARCHIVE_BASE:
+            columns.append((position, code))
+
+    for row in reader:
+        if not row or not row[0].strip():
+            continue
+
+        day_text = row[0].strip()
+        parse_day(day_text)
+
+        rates = {ARCHIVE_BASE: 1.0}
+        for position, code in columns:
+            if position >= len(row):
+                continue
+            value = row[position].strip()
+            if not value or value == "N/A":
+                continue
+            rates[code] = float(value)
+
+        yield day_text, rates
+
+
+def cross_rate(base_rate, quote_rate):
+    """
+    İki EUR bazlı kurdan çapraz kuru hesaplar (1 base = ? quote).
+    Computes the cross rate from two EUR based rates (1 base = ? quote).
+    """
+    return float("%.*g" % (SIGNIFICANT_DIGITS, quote_rate / base_rate))
+
+
+def cross_rows(day_text, rates):
+    """
+    Bir günün tüm (temel, hedef) çiftlerini üretir.
+    Yields every (base, quote) pair of one day.
+
+    Üretir / Yields:
+        (base, quote, "2024-12-02", kur / rate)
+    """
+    for base, base_rate in rates.items():
+        for quote, quote_rate in rates.items():
+            if base != quote:
+                yield (base, quote, day_text, cross_rate(base_rate, quote_rate))
+
+
+def import_archive(lines, store, codes, batch_rows=IMPORT_BATCH_ROWS):
+    """
+    Arşivi tek geçişte depoya yükler ve yüklenen aralıkları kapsanmış işaretler.
+    Loads the archive into the store in one pass and marks the loaded ranges covered.
+
+    Bir paritenin aralığı, iki para biriminin de arşivde bulunduğu ilk ve son
+    gündür; aradaki yayın olmayan günler de (ECB kaynağı kesin olduğundan) kapsanır.
+    A pair's range runs from the first to the last day both currencies appear
+    in the archive; days without a fixing in between are covered as well,
+    since the ECB archive is authoritative.
+
+    Parametreler / Parameters:
+        lines: Arşivin yazı satırları / Text lines of the archive
+        store: HistoryStore
+        codes: Desteklenen para birimleri / Supported currencies
+        batch_rows: Tek seferde yazılan satır sayısı / Rows per transaction
+
+    Döndürür / Returns:
+        {"days": gün sayısı / day count, "rows": satır sayısı / row count,
+         "pairs": parite sayısı / pair count, "start": ilk gün / first day, "end": son gün / last day}
+    """
+    first_seen = {}
+    last_seen = {}
+    buffer = []
+    day_count = 0
+    row_count = 0
+
+    for day_text, rates in iter_fixings(lines, codes):
+        day_count += 1
+        for code in rates:
+            if code not in first_seen or day_text < first_seen[code]:
+                first_seen[code] = day_text
+            if code not in last_seen or day_text > last_seen[code]:
+                last_seen[code] = day_text
+
+        buffer.extend(cross_rows(day_text, rates))
+        if len(buffer) >= batch_rows:
+            store.save_many(buffer)
+            row_count += len(buffer)
+            buffer = []
+
+    if buffer:
+        store.save_many(buffer)
+        row_count += len(buffer)
+
+    # Her paritenin yüklenen aralığını işaretle / Mark each pair's loaded range
+    pair_count = 0
+    for base in first_seen:
+        for quote in first_seen:
+            if base == quote:
+                continue
+            start_text = max(first_seen[base], first_seen[quote])
+            end_text = min(last_seen[base], last_seen[quote])
+            if start_text <= end_text:
+                store.mark_covered(base, quote, parse_day(start_text), parse_day(end_text))
+                pair_count += 1
+
+    return {
+        "days": day_count,
+        "rows": row_count,
+        "pairs": pair_count,
+        "start": min(first_seen.values()) if first_seen else None,
+        "end": max(last_seen.values()) if last_seen else None,
+    }
@@ -0,0 +1,55 @@
+# ============================================================
+# KurTakip - Gunicorn Ayarları / Gunicorn Settings
+# Üretim (production) sunucusu için ayar dosyası
+# Settings file for the production server
+# ============================================================
+#
+# Kullanım / Usage:
+#   gunicorn -c gunicorn.conf.py app:app
+#
+# Tüm işçiler (worker) kur verisini SHARED_CACHE_PATH dosyası üzerinden
+# paylaşır; internetten sadece bir işçi veri çeker.
+# All workers share the rate snapshot through the SHARED_CACHE_PATH file;
+# only one worker fetches from the internet.
+# ============================================================
+
+import multiprocessing
+import os
+
+# Dinlenecek adres / Address to listen on
+bind = "0.0.0.0:" + os.getenv("PORT", "5000")
+
+# İşçi sayısı: CPU çekirdeği başına 2 + 1 / Workers: 2 per CPU core + 1
+workers = int(os.getenv("WEB_CONCURRENCY", str(multiprocessing.cpu_count() * 2 + 1)))
+
+# Her işçide iş parçacıkları (dış API beklerken diğer istekler sürer).
+# Canlı kur akışları varsayılan olarak en fazla yarısını tutar (SSE_WSGI_MAX_STREAMS).
+# Threads per worker (other requests continue while one waits on an upstream API).
+# Live rate streams hold at most half of them by default (SSE_WSGI_MAX_STREAMS).
+worker_class = "gthread"
+threads = int(os.getenv("GUNICORN_THREADS", "4"))
+
+# Uygulamayı işçiler çatallanmadan önce bir kez yükle (bellek paylaşılır)
+# Load the app once before forking the workers (memory is shared)
+preload_app = True
+
+# İstek zaman aşımı (saniye) / Request timeout (seconds)
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "30"))
+
+# Erişim kayıtlarını standart çıktıya yaz / Write access logs to stdout
+accesslog = "-"
+
+
+def post_fork(server, worker):
+    """
+    Her işçi başladığında arka plan görevlerini başlatır.
+    Starts the background tasks when each worker starts.
+
+    İş parçacıkları çatallanmaya (fork) dayanmaz, bu yüzden ana süreçte değil
+    her işçide başlatılır. Paylaşılan dosya sayesinde yine tek istek atılır.
+    Threads do not survive a fork, so they start in each worker rather than
+    in the master. The shared file still keeps it to a single upstream call.
+    """
+    from app import start_background_tasks
+
+    start_background_tasks()
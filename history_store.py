@@ -0,0 +1,356 @@
+# ============================================================
+# KurTakip - Geçmiş Kur Deposu / Historical Rate Store
+# Frankfurter (ECB) geçmiş kurlarını yerel SQLite dosyasında saklar
+# Stores Frankfurter (ECB) historical rates in a local SQLite file
+# ============================================================
+
+# --- Kütüphaneleri içe aktar / Import libraries ---
+import os
+import sqlite3
+import threading
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+
+# Veritabanı tabloları / Database tables
+#   rates:    (base, quote, date) -> kur / rate
+#   coverage: bir parite için kaynaktan tamamen çekilmiş tarih aralıkları
+#             date ranges of a pair that were fully fetched from the source
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS rates (
+    base TEXT NOT NULL,
+    quote TEXT NOT NULL,
+    date TEXT NOT NULL,
+    rate REAL NOT NULL,
+    PRIMARY KEY (base, quote, date)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS coverage (
+    base TEXT NOT NULL,
+    quote TEXT NOT NULL,
+    start_date TEXT NOT NULL,
+    end_date TEXT NOT NULL,
+    checked_at REAL NOT NULL,
+    PRIMARY KEY (base, quote, start_date, end_date)
+) WITHOUT ROWID;
+"""
+
+
+def parse_day(text):
+    """
+    "YYYY-MM-DD" yazısını tarihe çevirir.
+    Converts "YYYY-MM-DD" text to a date.
+    """
+    return date.fromisoformat(text)
+
+
+def merge_intervals(intervals):
+    """
+    Çakışan ya da bitişik tarih aralıklarını birleştirir.
+    Merges overlapping or adjacent date ranges.
+
+    Birleşen aralık, bitişi en geç olan aralığın checked_at değerini alır;
+    çünkü bu değer sadece bugünü içeren kuyruk için önemlidir.
+    A merged range keeps the checked_at of the range that ends last, since
+    it only matters for a tail that includes today.
+
+    Parametre / Parameter:
+        intervals: [(başlangıç, bitiş, checked_at), ...]
+
+    Döndürür / Returns:
+        Başlangıca göre sıralı birleşik liste / Merged list sorted by start
+    """
+    merged = []
+    for start_day, end_day, checked_at in sorted(intervals):
+        if merged and start_day <= merged[-1][1] + timedelta(days=1):
+            last_start, last_end, last_checked = merged[-1]
+            if end_day > last_end:
+                merged[-1] = (last_start, end_day, checked_at)
+            elif end_day == last_end:
+                merged[-1] = (last_start, last_end, max(last_checked, checked_at))
+        else:
+            merged.append((start_day, end_day, checked_at))
+    return merged
+
+
+class HistoryStore:
+    """
+    (base, quote, date) anahtarlı yerel geçmiş kur deposu.
+    Local historical rate store keyed by (base, quote, date).
+
+    Geçmiş ECB kurları değişmez; bir aralık bir kez çekildikten sonra yerelden sunulur.
+    Past ECB fixings never change; once a range is fetched it is served locally.
+    Bugünü içeren aralıklar ise sadece recent_ttl saniye boyunca geçerli sayılır,
+    çünkü günün kuru henüz yayınlanmamış olabilir.
+    Ranges that include today are only trusted for recent_ttl seconds, because
+    today's fixing may not be published yet.
+    """
+
+    def __init__(self, path, recent_ttl=3600.0):
+        """
+        Parametreler / Parameters:
+            path: SQLite dosya yolu ya da ":memory:" / SQLite file path or ":memory:"
+            recent_ttl: Bugünü içeren aralıkların geçerlilik süresi (saniye)
+                        How long ranges that include today stay valid (seconds)
+        """
+        self.path = str(path)
+        self.recent_ttl = recent_ttl
+        self._lock = threading.Lock()
+        self._connection = None
+        self._pid = None
+
+    def _connect(self):
+        """
+        Bu süreç için veritabanı bağlantısını açar (gerekirse).
+        Opens the database connection for this process (if needed).
+
+        Süreç çatallanırsa (fork) yeni bir bağlantı açılır.
+        A new connection is opened if the process was forked.
+        """
+        if self._connection is not None and self._pid == os.getpid():
+            return self._connection
+
+        if self.path != ":memory:":
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+
+        connection = sqlite3.connect(self.path, check_same_thread=False)
+        if self.path != ":memory:":
+            connection.execute("PRAGMA journal_mode=WAL")
+        connection.executescript(SCHEMA)
+        connection.commit()
+
+        self._connection = connection
+        self._pid = os.getpid()
+        return connection
+
+    # --------------------------------------------------------
+    # Kurlar / Rates
+    # --------------------------------------------------------
+
+    def save_rates(self, base, quote, rates_by_date):
+        """
+        Bir paritenin kurlarını kaydeder.
+        Saves rates for a pair.
+
+        Parametreler / Parameters:
+            base: Temel para birimi / Base currency (örn: "USD")
+            quote: Hedef para birimi / Target currency (örn: "TRY")
+            rates_by_date: {"2024-12-02": 34.6, ...}
+        """
+        rows = []
+        for day_text, rate in rates_by_date.items():
+            rows.append((base, quote, day_text, float(rate)))
+
+        with self._lock:
+            connection = self._connect()
+            connection.executemany(
+                "INSERT OR REPLACE INTO rates (base, quote, date, rate) VALUES (?, ?, ?, ?)",
+                rows,
+            )
+            connection.commit()
+
+    def save_many(self, rows):
+        """
+        Birden fazla paritenin kurlarını tek işlemde kaydeder (toplu yükleme için).
+        Saves rates of many pairs in a single transaction (for bulk loads).
+
+        Parametre / Parameter:
+            rows: (base, quote, "2024-12-02", kur / rate) dörtlüleri / tuples
+        """
+        with self._lock:
+            connection = self._connect()
+            connection.executemany(
+                "INSERT OR REPLACE INTO rates (base, quote, date, rate) VALUES (?, ?, ?, ?)",
+                rows,
+            )
+            connection.commit()
+
+    def get_rates(self, base, quote, start_date, end_date):
+        """
+        Bir aralıktaki kurları tarihe göre sıralı döndürür.
+        Returns the rates in a range, sorted by date.
+
+        Döndürür / Returns:
+            [{"date": "2024-12-02", "rate": 34.6}, ...]
+        """
+        with self._lock:
+            connection = self._connect()
+            cursor = connection.execute(
+                "SELECT date, rate FROM rates "
+                "WHERE base = ? AND quote = ? AND date >= ? AND date <= ? "
+                "ORDER BY date",
+                (base, quote, start_date.isoformat(), end_date.isoformat()),
+            )
+            rows = cursor.fetchall()
+
+        result = []
+        for day_text, rate in rows:
+            result.append({"date": day_text, "rate": rate})
+        return result
+
+    def get_rate_on(self, base, quote, day):
+        """
+        Bir gün için geçerli olan kuru (o gün ya da öncesindeki son kur) döndürür.
+        Returns the rate in effect on a day (the last fixing on or before it).
+
+        Sadece gün kapsanmışsa ve aradaki günler bilinen bir aralıktaysa sonuç döner.
+        Only answers when the day is covered and no unknown days lie in between.
+
+        Döndürür / Returns:
+            {"date": "2024-11-29", "rate": 34.6} ya da None / or None
+        """
+        interval = self._covering_interval(base, quote, day, day)
+        if interval is None:
+            return None
+
+        interval_start = interval[0]
+        with self._lock:
+            connection = self._connect()
+            cursor = connection.execute(
+                "SELECT date, rate FROM rates "
+                "WHERE base = ? AND quote = ? AND date >= ? AND date <= ? "
+                "ORDER BY date DESC LIMIT 1",
+                (base, quote, interval_start.isoformat(), day.isoformat()),
+            )
+            row = cursor.fetchone()
+
+        if row is None:
+            return None
+        return {"date": row[0], "rate": row[1]}
+
+    # --------------------------------------------------------
+    # Kapsam / Coverage
+    # --------------------------------------------------------
+
+    def mark_covered(self, base, quote, start_date, end_date):
+        """
+        Bir aralığın kaynaktan tamamen çekildiğini kaydeder.
+        Records that a range was fully fetched from the source.
+
+        Çakışan ya da bitişik aralıklar tek bir aralıkta birleştirilir.
+        Overlapping or adjacent ranges are merged into a single range.
+        """
+        with self._lock:
+            connection = self._connect()
+            intervals = self._load_intervals(connection, base, quote, date.today())
+            intervals.append((start_date, end_date, time.time()))
+            merged = merge_intervals(intervals)
+
+            connection.execute(
+                "DELETE FROM coverage WHERE base = ? AND quote = ?",
+                (base, quote),
+            )
+            rows = []
+            for interval_start, interval_end, checked_at in merged:
+                rows.append((base, quote, interval_start.isoformat(), interval_end.isoformat(), checked_at))
+            connection.executemany(
+                "INSERT INTO coverage (base, quote, start_date, end_date, checked_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                rows,
+            )
+            connection.commit()
+
+    def covered_intervals(self, base, quote, today=None):
+        """
+        Bir parite için hâlâ geçerli olan kapsanmış aralıkları döndürür.
+        Returns the still-valid covered ranges for a pair.
+
+        Bugünü içeren ve recent_ttl süresini aşmış aralıklar dünde kesilir.
+        Ranges that include today and are older than recent_ttl are cut at yesterday.
+
+        Döndürür / Returns:
+            [(başlangıç, bitiş), ...] tarih çiftleri / list of (start, end) date pairs
+        """
+        if today is None:
+            today = date.today()
+
+        with self._lock:
+            connection = self._connect()
+            intervals = self._load_intervals(connection, base, quote, today)
+
+        result = []
+        for interval_start, interval_end, checked_at in intervals:
+            result.append((interval_start, interval_end))
+        return result
+
+    def missing_ranges(self, base, quote, start_date, end_date):
+        """
+        [start_date, end_date] aralığında yerelde bilinmeyen alt aralıkları bulur.
+        Finds the sub-ranges of [start_date, end_date] that are not known locally.
+
+        Döndürür / Returns:
+            [(başlangıç, bitiş), ...] tarih çiftleri, sıralı / sorted list of (start, end) date pairs
+        """
+        gaps = []
+        cursor_day = start_date
+
+        for interval_start, interval_end in self.covered_intervals(base, quote):
+            if interval_end < cursor_day:
+                continue
+            if interval_start > end_date:
+                break
+
+            # Kapsamdan önce kalan boşluk / Gap before this covered range
+            if interval_start > cursor_day:
+                gaps.append((cursor_day, interval_start - timedelta(days=1)))
+
+            cursor_day = max(cursor_day, interval_end + timedelta(days=1))
+            if cursor_day > end_date:
+                break
+
+        # Sondaki boşluk / Trailing gap
+        if cursor_day <= end_date:
+            gaps.append((cursor_day, end_date))
+
+        return gaps
+
+    def _load_intervals(self, connection, base, quote, today):
+        """
+        Kapsam satırlarını okur; eskimiş "bugün" kısımlarını dünde keser.
+        Reads coverage rows, cutting outdated "today" parts at yesterday.
+
+        Kilit tutulurken çağrılmalıdır. / Must be called with the lock held.
+
+        Döndürür / Returns:
+            [(başlangıç, bitiş, checked_at), ...] başlangıca göre sıralı / sorted by start
+        """
+        yesterday = today - timedelta(days=1)
+        now = time.time()
+
+        cursor = connection.execute(
+            "SELECT start_date, end_date, checked_at FROM coverage "
+            "WHERE base = ? AND quote = ? ORDER BY start_date",
+            (base, quote),
+        )
+
+        intervals = []
+        for start_text, end_text, checked_at in cursor.fetchall():
+            start_day = parse_day(start_text)
+            end_day = parse_day(end_text)
+
+            # Bugünün verisi eskimiş olabilir / Today's data may be outdated
+            if end_day >= today and now - checked_at >= self.recent_ttl:
+                end_day = yesterday
+
+            if start_day <= end_day:
+                intervals.append((start_day, end_day, checked_at))
+
+        return intervals
+
+    def is_covered(self, base, quote, start_date, end_date):
+        """
+        Aralığın tamamı yerelde biliniyor mu?
+        Is the whole range known locally?
+        """
+        return self._covering_interval(base, quote, start_date, end_date) is not None
+
+    def _covering_interval(self, base, quote, start_date, end_date):
+        """
+        [start_date, end_date] aralığını tamamen içeren kapsamı bulur.
+        Finds a covered range that fully contains [start_date, end_date].
+        """
+        for interval_start, interval_end in self.covered_intervals(base, quote):
+            if interval_start <= start_date and end_date <= interval_end:
+                return (interval_start, interval_end)
+        return None
@@ -0,0 +1,106 @@
+# ============================================================
+# KurTakip - Hızlı JSON / Fast JSON
+# Flask yanıtlarını orjson ile yazar; kurulu değilse standart json kullanılır
+# Serializes Flask responses with orjson; falls back to the stdlib json module
+# ============================================================
+
+# --- Kütüphaneleri içe aktar / Import libraries ---
+from flask.json.provider import DefaultJSONProvider
+
+# orjson isteğe bağlıdır; kurulu değilse Flask'ın standart kodlayıcısı kullanılır
+# orjson is optional; without it Flask's standard encoder is used
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def available():
+    """
+    Hızlı kodlayıcı kurulu mu? / Is the fast encoder installed?
+    """
+    return orjson is not None
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """
+    orjson kullanan JSON sağlayıcısı (app.json).
+    JSON provider backed by orjson (app.json).
+
+    Flask'ın varsayılanlarına uyar: anahtarlar sıralanır, girintiler
+    hata ayıklama kipinde eklenir, bilinmeyen türler default() ile çevrilir.
+    Özel json.dumps argümanları verilirse ya da orjson bir değeri yazamazsa
+    (örn. 64 bitten büyük tam sayılar) standart kodlayıcıya dönülür.
+    Follows Flask's defaults: keys are sorted, indentation is added in debug
+    mode, unknown types go through default(). With custom json.dumps arguments,
+    or when orjson cannot encode a value (e.g. integers wider than 64 bits),
+    the standard encoder is used instead.
+    """
+
+    def _options(self, indent=False):
+        """
+        Sağlayıcı ayarlarına karşılık gelen orjson seçenekleri.
+        orjson options matching the provider's settings.
+        """
+        options = orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            options |= orjson.OPT_SORT_KEYS
+        if indent:
+            options |= orjson.OPT_INDENT_2
+        return options
+
+    def dump_bytes(self, obj, indent=False):
+        """
+        Veriyi UTF-8 JSON baytlarına çevirir.
+        Serializes data to UTF-8 JSON bytes.
+        """
+        if orjson is not None:
+            try:
+                return orjson.dumps(obj, default=self.default, option=self._options(indent))
+            except orjson.JSONEncodeError:
+                pass
+
+        if indent:
+            text = super().dumps(obj, indent=2)
+        else:
+            text = super().dumps(obj, separators=(",", ":"))
+        return text.encode("utf-8")
+
+    def dumps(self, obj, **kwargs):
+        """
+        Veriyi JSON yazısına çevirir.
+        Serializes data to a JSON string.
+        """
+        if orjson is None or kwargs:
+            return super().dumps(obj, **kwargs)
+        return self.dump_bytes(obj).decode("utf-8")
+
+    def loads(self, s, **kwargs):
+        """
+        JSON yazısını ya da baytlarını okur.
+        Parses a JSON string or bytes.
+        """
+        if orjson is None or kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        """
+        Veriyi JSON yanıtına çevirir (jsonify bunu çağırır).
+        Turns data into a JSON response (called by jsonify).
+        """
+        obj = self._prepare_response_obj(args, kwargs)
+        return self.bytes_response(self.dump_bytes(obj, self.indented()))
+
+    def indented(self):
+        """
+        Yanıtlar girintili mi yazılmalı? / Should responses be indented?
+        """
+        return self.compact is False or (self.compact is None and self._app.debug)
+
+    def bytes_response(self, body):
+        """
+        Hazır JSON baytlarından yanıt oluşturur (tekrar kodlamadan).
+        Builds a response from ready JSON bytes (without encoding again).
+        """
+        return self._app.response_class(body + b"\n", mimetype=self.mimetype)
@@ -0,0 +1,232 @@
+# ============================================================
+# KurTakip - Para Hesapları / Money Arithmetic
+# Dönüşüm sonuçlarını para biriminin kuruş hanesine tam olarak yuvarlar
+# Rounds conversion results exactly to each currency's minor unit
+# ============================================================
+#
+# Miktar ve kur ölçeklenmiş tam sayılara çevrilir, çarpım ve yuvarlama
+# tamamen tam sayılarla yapılır. Böylece float kayması olmaz ve her
+# çağrıda Decimal bağlamı kurmak gerekmez.
+# Amounts and rates are turned into scaled integers and the product and
+# rounding are done entirely in integers, so there is no float drift and
+# no Decimal context has to be set up per call.
+# ============================================================
+
+# --- Kütüphaneleri içe aktar / Import libraries ---
+import os
+from decimal import Decimal, InvalidOperation
+
+# Kuruş hanesi sayısı farklı olan para birimleri (diğerleri 2)
+# Currencies whose minor unit is not 2 digits (all others use 2)
+MINOR_UNITS = {
+    "JPY": 0,
+    "KRW": 0,
+}
+DEFAULT_MINOR_UNITS = 2
+
+# Miktarın en fazla tam sayı ve ondalık hane sayısı: sonuç float'a sığar,
+# çok büyük üsler ("1e400", "1e-999999") hesaplamayı şişirmez
+# Most integer and decimal digits an amount may have, so the result fits a
+# float and huge exponents ("1e400", "1e-999999") cannot blow up the arithmetic
+MAX_INTEGER_DIGITS = 15
+MAX_DECIMAL_DIGITS = 20
+
+# Desteklenen yuvarlama kipleri / Supported rounding modes
+ROUNDING_MODES = ("half_up", "half_even", "half_down", "up", "down", "ceiling", "floor")
+
+# Varsayılan yuvarlama kipi / Default rounding mode
+ROUNDING_MODE = os.getenv("ROUNDING_MODE", "half_up").lower()
+
+
+def minor_units(currency_code):
+    """
+    Para biriminin kuruş hanesi sayısını döndürür (JPY: 0, USD: 2).
+    Returns the number of minor-unit digits of a currency (JPY: 0, USD: 2).
+    """
+    return MINOR_UNITS.get(currency_code, DEFAULT_MINOR_UNITS)
+
+
+def parse_rounding(name):
+    """
+    Yuvarlama kipini doğrular.
+    Validates a rounding mode.
+
+    Döndürür / Returns:
+        Kip adı (küçük harf) / Mode name (lower case)
+
+    Hatalar / Raises:
+        ValueError: Kip bilinmiyorsa / If the mode is unknown
+    """
+    mode = str(name or "").strip().lower()
+    if mode not in ROUNDING_MODES:
+        raise ValueError("Geçersiz yuvarlama kipi / Invalid rounding mode: " + str(name))
+    return mode
+
+
+def decimal_parts(value):
+    """
+    Sayıyı (işaret, basamaklar, üs) üçlüsüne ayırır.
+    Splits a number into a (sign, digits, exponent) triple.
+
+    Hatalar / Raises:
+        ValueError: Sonlu bir sayı değilse / If it is not a finite number
+    """
+    try:
+        sign, digits, exponent = Decimal(str(value)).as_tuple()
+    except InvalidOperation:
+        raise ValueError("Geçersiz miktar / Invalid amount")
+
+    if not isinstance(exponent, int):
+        raise ValueError("Geçersiz miktar / Invalid amount")
+    return sign, digits, exponent
+
+
+def scaled_units(sign, digits, exponent):
+    """
+    (işaret, basamaklar, üs) üçlüsünü (tam sayı, ondalık hane) çiftine çevirir.
+    Turns a (sign, digits, exponent) triple into an (integer, decimal digits) pair.
+    """
+    units = 0
+    for digit in digits:
+        units = units * 10 + digit
+    if sign:
+        units = -units
+
+    if exponent >= 0:
+        return units * 10 ** exponent, 0
+    return units, -exponent
+
+
+def parse_amount(value):
+    """
+    Miktarı (tam sayı, ondalık hane) çiftine çevirir: "12.50" -> (1250, 2).
+    Turns an amount into an (integer, decimal digits) pair: "12.50" -> (1250, 2).
+
+    Float değerler en kısa yazılışlarıyla okunur (0.1 -> "0.1").
+    Floats are read through their shortest form (0.1 -> "0.1").
+
+    Hatalar / Raises:
+        ValueError: Miktar sayı değilse ya da izin verilen aralıkta değilse
+                    If the amount is not a finite number or is out of range
+    """
+    sign, digits, exponent = decimal_parts(value)
+
+    # Basamaklar üs uygulanmadan sayılır / Digits are counted before the exponent is applied
+    significant = digits
+    while len(significant) > 1 and significant[0] == 0:
+        significant = significant[1:]
+    if significant == (0,):
+        return 0, 0
+    if len(significant) + exponent > MAX_INTEGER_DIGITS:
+        raise ValueError("Miktar çok büyük / Amount too large")
+    if -exponent > MAX_DECIMAL_DIGITS:
+        raise ValueError("Miktarda çok fazla ondalık hane var / Amount has too many decimal digits")
+
+    return scaled_units(sign, digits, exponent)
+
+
+def scale_rate(rate):
+    """
+    Kuru kendi üssüyle (tam sayı, ondalık hane) çiftine çevirir: 0.00072 -> (72, 5).
+    Turns a rate into an (integer, decimal digits) pair keeping its own exponent: 0.00072 -> (72, 5).
+
+    Sabit bir hane sayısına yuvarlanmaz; küçük çapraz kurlar (örn. KRW -> GBP)
+    tüm anlamlı basamaklarını korur.
+    It is not rounded to a fixed number of places, so small cross rates
+    (e.g. KRW -> GBP) keep all of their significant digits.
+    """
+    return scaled_units(*decimal_parts(rate))
+
+
+def scale_rates(rates):
+    """
+    Bir kur satırının tamamını ölçeklenmiş tam sayılara çevirir (toplu işlemler için).
+    Scales a whole rate row to integers (for batch conversions).
+
+    Parametre / Parameter:
+        rates: {"TRY": 35.0, ...}
+
+    Döndürür / Returns:
+        {"TRY": (350, 1), ...}
+    """
+    scaled = {}
+    for code, rate in rates.items():
+        scaled[code] = scale_rate(rate)
+    return scaled
+
+
+def divide_rounded(numerator, denominator, rounding):
+    """
+    Tam sayı bölmesini verilen kiple yuvarlar (denominator > 0).
+    Divides integers, rounding with the given mode (denominator > 0).
+    """
+    negative = numerator < 0
+    quotient, remainder = divmod(abs(numerator), denominator)
+
+    if remainder:
+        twice = remainder * 2
+        if rounding == "half_up":
+            round_away = twice >= denominator
+        elif rounding == "half_even":
+            round_away = twice > denominator or (twice == denominator and quotient % 2 == 1)
+        elif rounding == "half_down":
+            round_away = twice > denominator
+        elif rounding == "up":
+            round_away = True
+        elif rounding == "down":
+            round_away = False
+        elif rounding == "ceiling":
+            round_away = not negative
+        elif rounding == "floor":
+            round_away = negative
+        else:
+            raise ValueError("Geçersiz yuvarlama kipi / Invalid rounding mode: " + str(rounding))
+
+        if round_away:
+            quotient += 1
+
+    if negative:
+        return -quotient
+    return quotient
+
+
+def convert_scaled(amount, rate_units, currency_code, rounding=ROUNDING_MODE):
+    """
+    Önceden ölçeklenmiş miktar ve kurla dönüşüm yapar.
+    Converts with a pre-scaled amount and rate.
+
+    Parametreler / Parameters:
+        amount: parse_amount() sonucu / Result of parse_amount()
+        rate_units: scale_rate() sonucu / Result of scale_rate()
+        currency_code: Hedef para birimi / Target currency
+        rounding: Yuvarlama kipi / Rounding mode
+
+    Döndürür / Returns:
+        Hedef para biriminin kuruş hanesine yuvarlanmış sonuç
+        The result rounded to the target currency's minor unit
+    """
+    amount_units, amount_digits = amount
+    rate_value, rate_digits = rate_units
+    digits = minor_units(currency_code)
+
+    product = amount_units * rate_value
+    shift = amount_digits + rate_digits - digits
+
+    if shift > 0:
+        result_units = divide_rounded(product, 10 ** shift, rounding)
+    else:
+        result_units = product * 10 ** -shift
+
+    # Tam sayı bölmesi doğru yuvarlanır; JSON'da tam olarak "12.35" yazılır
+    # Integer true division is correctly rounded, so JSON shows exactly "12.35"
+    return result_units / 10 ** digits
+
+
+def convert_amount(amount, rate, currency_code, rounding=ROUNDING_MODE):
+    """
+    Miktarı kurla çevirir ve hedef para biriminin kuruş hanesine yuvarlar.
+    Converts an amount at a rate and rounds to the target's minor unit.
+
+    Örnek / Example: convert_amount("100", 35.12345, "TRY") -> 3512.35
+    """
+    return convert_scaled(parse_amount(amount), scale_rate(rate), currency_code, rounding)
@@ -0,0 +1,475 @@
+# ============================================================
+# KurTakip - Kur Kaynakları / Rate Providers
+# Aynı veriyi birden fazla kaynaktan, yedekli ve hızlı almayı sağlar
+# Fetches the same data from several sources, with failover and hedging
+# ============================================================
+#
+# Her veri türü (güncel kurlar, geçmiş seriler, tek gün kurları) için
+# sıralı bir kaynak listesi tanımlanır. İstek önce ilk kaynağa gider:
+# - Kaynak hata verirse ya da boş dönerse hemen bir sonrakine geçilir (failover).
+# - Kaynak, kendi gecikme yüzdeliğini (örn. p95) aşacak kadar yavaşsa sıradaki
+#   kaynağa da aynı istek gönderilir ve ilk gelen başarılı yanıt kullanılır (hedging).
+# Her kaynağın gecikmesi ve hata sayıları ayrı tutulur (/api/providers).
+# Every data type (current rates, historical series, single-day rates) has an
+# ordered list of sources. A request goes to the first source first:
+# - If it fails or returns nothing, the next source is tried at once (failover).
+# - If it is slower than its own latency percentile (e.g. p95), the same
+#   request is also sent to the next source and the first success wins (hedging).
+# Latency and error counts are tracked per source (/api/providers).
+# ============================================================
+
+# --- Kütüphaneleri içe aktar / Import libraries ---
+import logging
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import requests
+
+import upstream
+
+# --- Log ayarları / Logging setup ---
+logger = logging.getLogger(__name__)
+
+
+# ============================================================
+# Ayarlar / Settings
+# ============================================================
+
+# Yedek isteğin gönderildiği gecikme yüzdeliği / Latency percentile that triggers a hedge
+HEDGE_PERCENTILE = float(os.getenv("PROVIDER_HEDGE_PERCENTILE", "95"))
+
+# Yeterli ölçüm yokken yedek istek için beklenen süre (saniye)
+# How long to wait before hedging while there are too few samples (seconds)
+HEDGE_DEFAULT_DELAY = float(os.getenv("PROVIDER_HEDGE_DELAY", "1.0"))
+
+# Yüzdelik hesaplamak için gereken en az ölçüm / Samples needed before the percentile is used
+HEDGE_MIN_SAMPLES = 20
+
+# Kaynak başına saklanan son gecikme ölçümleri / Recent latency samples kept per source
+LATENCY_WINDOW = 200
+
+# Kaynak istekleri için iş parçacığı sayısı / Worker threads for provider requests
+PROVIDER_WORKERS = int(os.getenv("PROVIDER_WORKERS", "8"))
+
+
+class ProviderError(requests.RequestException):
+    """
+    Kaynak kullanılabilir bir yanıt vermediğinde fırlatılır.
+    Raised when a provider gives no usable answer.
+    """
+
+
+# ============================================================
+# Kaynaklar / Providers
+# ============================================================
+
+class Provider:
+    """
+    Kur kaynağı arayüzü. Desteklenmeyen veri türleri ProviderError fırlatır.
+    Rate provider interface. Unsupported data types raise ProviderError.
+    """
+
+    name = "provider"
+
+    def latest(self, base_currency):
+        """
+        Güncel kurlar / Current rates.
+
+        Döndürür / Returns:
+            {"base": "USD", "date": "2024-12-02", "rates": {"TRY": 34.6, ...}}
+        """
+        raise ProviderError(self.name + ": güncel kur yok / no current rates")
+
+    def series(self, base_currency, quote_currencies, start_date, end_date):
+        """
+        Bir tarih aralığındaki kurlar / Rates over a date range.
+
+        Döndürür / Returns:
+            {"TRY": {"2024-12-02": 34.6, ...}, ...}
+        """
+        raise ProviderError(self.name + ": geçmiş seri yok / no historical series")
+
+    def on_date(self, base_currency, date_text):
+        """
+        Bir tarihteki tüm kurlar / All rates on one date.
+
+        Döndürür / Returns:
+            {"date": kurun tarihi / fixing date, "rates": {"TRY": 34.6, ...}}
+        """
+        raise ProviderError(self.name + ": tarihli kur yok / no rates on date")
+
+
+def read_json(response):
+    """
+    Başarılı yanıtın JSON gövdesini döndürür.
+    Returns the JSON body of a successful response.
+
+    Hatalar / Raises:
+        ProviderError: Durum kodu 200 değilse / If the status code is not 200
+    """
+    if response.status_code != 200:
+        raise ProviderError("HTTP " + str(response.status_code) + ": " + response.url)
+    return response.json()
+
+
+class ExchangeRateApiProvider(Provider):
+    """
+    exchangerate-api.com (sadece güncel kurlar / current rates only).
+    """
+
+    def __init__(self, url, timeout, name="exchangerate-api"):
+        self.name = name
+        self.url = url
+        self.timeout = timeout
+
+    def latest(self, base_currency):
+        data = read_json(upstream.get(self.url + "/" + base_currency, timeout=self.timeout))
+        if "rates" not in data:
+            raise ProviderError(self.name + ": beklenmeyen yanıt / unexpected response")
+        return data
+
+
+class FrankfurterProvider(Provider):
+    """
+    Frankfurter API (ECB referans kurları / ECB reference rates).
+    """
+
+    def __init__(self, url, timeout, name="frankfurter"):
+        self.name = name
+        self.url = url
+        self.timeout = timeout
+
+    def latest(self, base_currency):
+        response = upstream.get(self.url + "/latest", params={"from": base_currency}, timeout=self.timeout)
+        data = read_json(response)
+        if "rates" not in data:
+            raise ProviderError(self.name + ": beklenmeyen yanıt / unexpected response")
+
+        # Frankfurter temel birimi listelemez / Frankfurter leaves the base out of the list
+        rates = dict(data["rates"])
+        rates[base_currency] = 1.0
+        return {"base": base_currency, "date": data.get("date"), "rates": rates}
+
+    def series(self, base_currency, quote_currencies, start_date, end_date):
+        url = self.url + "/" + start_date.strftime("%Y-%m-%d") + ".." + end_date.strftime("%Y-%m-%d")
+        api_params = {"from": base_currency, "to": ",".join(quote_currencies)}
+
+        # Geçmiş veri daha uzun sürebilir / Historical data may take longer
+        data = read_json(upstream.get(url, params=api_params, timeout=self.timeout * 2))
+        if "rates" not in data:
+            raise ProviderError(self.name + ": beklenmeyen yanıt / unexpected response")
+
+        # Her hedef para biriminin kurlarını ayıkla / Pick each target currency's rates
+        result = {}
+        for quote_currency in quote_currencies:
+            result[quote_currency] = {}
+
+        for current_date, day_rates in data["rates"].items():
+            for quote_currency in quote_currencies:
+                if quote_currency in day_rates:
+                    result[quote_currency][current_date] = float(day_rates[quote_currency])
+
+        return result
+
+    def on_date(self, base_currency, date_text):
+        response = upstream.get(self.url + "/" + date_text, params={"from": base_currency}, timeout=self.timeout)
+        response.raise_for_status()
+
+        data = response.json()
+        rates = {}
+        for code, rate in data.get("rates", {}).items():
+            rates[code] = float(rate)
+        return {"date": data.get("date", date_text), "rates": rates}
+
+
+class FakeProvider(Provider):
+    """
+    İnternete çıkmayan, hazır veri döndüren kaynak (testler için).
+    Provider returning canned data without any network call (for tests).
+
+    delay ile yavaş, error ile hatalı bir kaynak taklit edilir.
+    delay imitates a slow source, error a failing one.
+    """
+
+    def __init__(self, name="fake", rates=None, history=None, delay=0.0, error=None):
+        """
+        Parametreler / Parameters:
+            name: Kaynağın adı / Provider name
+            rates: Çapa bazlı güncel kurlar / Current rates of the anchor ({"USD": 1.0, "TRY": 34.6})
+            history: Günlük kurlar / Daily rates ({"2024-12-02": {"TRY": 34.6, ...}})
+            delay: Her çağrıda bekleme (saniye) / Wait on every call (seconds)
+            error: Fırlatılacak hata / Exception to raise
+        """
+        self.name = name
+        self.rates = rates or {}
+        self.history = history or {}
+        self.delay = delay
+        self.error = error
+        self.calls = 0
+
+    def _answer(self):
+        self.calls += 1
+        if self.delay > 0:
+            time.sleep(self.delay)
+        if self.error is not None:
+            raise self.error
+
+    def latest(self, base_currency):
+        self._answer()
+        if base_currency not in self.rates:
+            return None
+        return {"base": base_currency, "date": None, "rates": dict(self.rates)}
+
+    def series(self, base_currency, quote_currencies, start_date, end_date):
+        self._answer()
+        start_text = start_date.isoformat()
+        end_text = end_date.isoformat()
+
+        result = {}
+        for quote_currency in quote_currencies:
+            result[quote_currency] = {}
+        for day_text, day_rates in self.history.items():
+            if start_text <= day_text <= end_text:
+                for quote_currency in quote_currencies:
+                    if quote_currency in day_rates:
+                        result[quote_currency][day_text] = day_rates[quote_currency]
+        return result
+
+    def on_date(self, base_currency, date_text):
+        self._answer()
+        known = [day_text for day_text in self.history if day_text <= date_text]
+        if len(known) == 0:
+            return None
+        day_text = max(known)
+        return {"date": day_text, "rates": dict(self.history[day_text])}
+
+
+# ============================================================
+# İstatistikler / Statistics
+# ============================================================
+
+class ProviderStats:
+    """
+    Bir kaynağın son gecikmeleri ve başarı / hata sayıları.
+    A provider's recent latencies and success / error counts.
+    """
+
+    def __init__(self, window=LATENCY_WINDOW):
+        self._lock = threading.Lock()
+        self.latencies = deque(maxlen=window)
+        self.successes = 0
+        self.errors = 0
+        self.hedges = 0
+        self.last_error = None
+
+    def record_success(self, latency):
+        with self._lock:
+            self.successes += 1
+            self.latencies.append(latency)
+
+    def record_error(self, error):
+        with self._lock:
+            self.errors += 1
+            self.last_error = str(error)
+
+    def record_hedge(self):
+        with self._lock:
+            self.hedges += 1
+
+    def percentile(self, percent, min_samples=HEDGE_MIN_SAMPLES):
+        """
+        Son başarılı çağrıların gecikme yüzdeliği (saniye); ölçüm azsa None.
+        Latency percentile of recent successful calls (seconds); None with too few samples.
+        """
+        with self._lock:
+            samples = sorted(self.latencies)
+        if len(samples) == 0 or len(samples) < min_samples:
+            return None
+
+        # En yakın sıra yöntemi / Nearest-rank method
+        rank = int(round(percent / 100.0 * len(samples) + 0.5)) - 1
+        rank = min(max(rank, 0), len(samples) - 1)
+        return samples[rank]
+
+    def snapshot(self):
+        """
+        İstatistiklerin JSON'a yazılabilir özeti.
+        A JSON-ready summary of the statistics.
+        """
+        p50 = self.percentile(50, min_samples=1)
+        p95 = self.percentile(95, min_samples=1)
+        with self._lock:
+            return {
+                "successes": self.successes,
+                "errors": self.errors,
+                "hedges": self.hedges,
+                "last_error": self.last_error,
+                "samples": len(self.latencies),
+                "p50_ms": None if p50 is None else round(p50 * 1000, 1),
+                "p95_ms": None if p95 is None else round(p95 * 1000, 1),
+            }
+
+
+# ============================================================
+# Kaynak Havuzu / Provider Pool
+# ============================================================
+
+# Tüm havuzların paylaştığı iş parçacığı havuzu (uygulamanınkinden ayrı: iç içe beklemede kilitlenmez)
+# Thread pool shared by all provider pools (separate from the app's, so nested waits cannot deadlock)
+_executor = ThreadPoolExecutor(max_workers=PROVIDER_WORKERS, thread_name_prefix="kurtakip-provider")
+
+
+class ProviderPool:
+    """
+    Tek bir veri türü için sıralı kaynaklar; yedekli ve hedge'li çağrı yapar.
+    Ordered providers for one data type; calls them with failover and hedging.
+    """
+
+    def __init__(self, providers, kind, hedge_percentile=HEDGE_PERCENTILE,
+                 hedge_delay=HEDGE_DEFAULT_DELAY, executor=None, validate=None):
+        """
+        Parametreler / Parameters:
+            providers: Tercih sırasıyla kaynaklar / Providers in order of preference
+            kind: Çağrılan metot / Method to call ("latest", "series", "on_date")
+            hedge_percentile: Yedek isteği tetikleyen gecikme yüzdeliği / Latency percentile that triggers a hedge
+            hedge_delay: Ölçüm azken yedek istek öncesi bekleme / Wait before hedging with too few samples
+            executor: İş parçacığı havuzu (varsayılan: paylaşılan) / Thread pool (default: the shared one)
+            validate: Sonucu denetler, kullanılamazsa ProviderError fırlatır; reddedilen sonuç
+                      hata sayılır ve sıradaki kaynak denenir / Checks a result and raises
+                      ProviderError if it is unusable; a rejected result counts as an error
+                      and the next provider is tried
+        """
+        self.providers = list(providers)
+        self.kind = kind
+        self.hedge_percentile = hedge_percentile
+        self.hedge_delay = hedge_delay
+        self.executor = executor or _executor
+        self.validate = validate
+        self.stats = {}
+        for provider in self.providers:
+            self.stats[provider.name] = ProviderStats()
+
+    def hedge_after(self, provider):
+        """
+        Kaynağa yedek istek gönderilmeden önce ne kadar beklenir (saniye).
+        How long to wait on a provider before hedging (seconds).
+        """
+        latency = self.stats[provider.name].percentile(self.hedge_percentile)
+        if latency is None:
+            return self.hedge_delay
+        return latency
+
+    def _run(self, provider, args):
+        """
+        Kaynağı çağırır ve sonucu istatistiklere yazar.
+        Calls a provider and records the outcome in its statistics.
+        """
+        stats = self.stats[provider.name]
+        started = time.monotonic()
+        try:
+            result = getattr(provider, self.kind)(*args)
+            if result is None:
+                raise ProviderError(provider.name + ": veri yok / no data")
+            if self.validate is not None:
+                self.validate(provider, result)
+        except Exception as error:
+            stats.record_error(error)
+            logger.warning("Kaynak hatası / Provider error (" + provider.name + "): " + str(error))
+            raise
+
+        stats.record_success(time.monotonic() - started)
+        return result
+
+    def call(self, *args):
+        """
+        Kaynakları sırayla dener; yavaş kaynağa yedek istek gönderir.
+        Tries the providers in order, hedging slow ones.
+
+        Döndürür / Returns:
+            İlk başarılı kaynağın sonucu / The result of the first successful provider
+
+        Hatalar / Raises:
+            Tüm kaynaklar başarısızsa son hata / The last error if every provider failed
+        """
+        if len(self.providers) == 0:
+            raise ProviderError("Kaynak tanımlı değil / No providers configured: " + self.kind)
+
+        # Tek kaynakta yedek yok: doğrudan çağır / A single provider cannot hedge: call it inline
+        if len(self.providers) == 1:
+            return self._run(self.providers[0], args)
+
+        pending = {}
+        last_error = None
+        next_index = 0
+        failed = True
+
+        while True:
+            # Hata sonrası hemen sıradakine geç (failover) / After an error fail over at once
+            if failed:
+                failed = False
+                if next_index < len(self.providers):
+                    provider = self.providers[next_index]
+                    pending[self.executor.submit(self._run, provider, args)] = provider
+                    next_index += 1
+                elif len(pending) == 0:
+                    raise last_error
+
+            # Son başlatılan kaynağın yüzdeliği kadar bekle / Wait for the newest provider's percentile
+            timeout = None
+            if next_index < len(self.providers):
+                timeout = self.hedge_after(self.providers[next_index - 1])
+
+            done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+
+            if len(done) == 0:
+                # Yavaş kaynak: sıradakine de gönder (hedge) / Slow provider: also ask the next one
+                provider = self.providers[next_index]
+                self.stats[provider.name].record_hedge()
+                pending[self.executor.submit(self._run, provider, args)] = provider
+                next_index += 1
+                continue
+
+            for future in done:
+                pending.pop(future)
+                try:
+                    return future.result()
+                except Exception as error:
+                    last_error = error
+                    failed = True
+
+    def snapshot(self):
+        """
+        Kaynakların sırası ve istatistikleri / The providers' order and statistics.
+        """
+        result = []
+        for provider in self.providers:
+            item = {"name": provider.name}
+            item.update(self.stats[provider.name].snapshot())
+            result.append(item)
+        return result
+
+
+def build_providers(names_text, factories):
+    """
+    Virgülle ayrılmış ad listesinden kaynakları oluşturur.
+    Builds providers from a comma-separated list of names.
+
+    Parametreler / Parameters:
+        names_text: Örn. "exchangerate-api,frankfurter"
+        factories: Ad -> kaynak üreten fonksiyon / Name -> function creating the provider
+
+    Hatalar / Raises:
+        ValueError: Bilinmeyen kaynak adında / On an unknown provider name
+    """
+    result = []
+    for part in names_text.split(","):
+        name = part.strip().lower()
+        if not name:
+            continue
+        if name not in factories:
+            raise ValueError("Bilinmeyen kaynak / Unknown provider: " + name)
+        result.append(factories[name]())
+    return result
@@ -0,0 +1,131 @@
+# ============================================================
+# KurTakip - Arka Plan Yenileyici / Background Refresher
+# Kurları kullanıcı isteklerinden bağımsız olarak düzenli yeniler
+# Refreshes rates on a schedule, independent of user requests
+# ============================================================
+
+# --- Kütüphaneleri içe aktar / Import libraries ---
+import logging
+import os
+import threading
+from datetime import datetime, timedelta, timezone
+
+# --- Log ayarları / Logging setup ---
+logger = logging.getLogger(__name__)
+
+
+def next_daily_run(now, hour, minute):
+    """
+    Verilen saatin (UTC) bir sonraki gerçekleşme zamanını bulur.
+    Finds the next occurrence of the given time of day (UTC).
+
+    Parametreler / Parameters:
+        now: Şu anki zaman (UTC) / Current time (UTC)
+        hour, minute: Günlük çalışma saati / Daily run time
+
+    Döndürür / Returns:
+        datetime (UTC)
+    """
+    run_at = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+    if run_at <= now:
+        run_at = run_at + timedelta(days=1)
+    return run_at
+
+
+class RateRefresher:
+    """
+    Güncel kurları belirli aralıklarla, geçmiş kurları ise günde bir kez
+    (ECB yayın saatinden sonra) arka planda yeniler.
+    Refreshes current rates on an interval and historical rates once a day
+    (after the ECB publication time) in the background.
+
+    Yeni veri önbelleğe tek adımda yazılır; istekler her zaman tam bir
+    kur verisi görür ve hiçbir istek internete çıkmak zorunda kalmaz.
+    New data is written to the cache in one step; requests always see a
+    complete snapshot and never have to go to the network.
+    """
+
+    def __init__(self, refresh_rates, interval, refresh_history=None, history_time=(15, 30)):
+        """
+        Parametreler / Parameters:
+            refresh_rates: Güncel kurları yenileyen fonksiyon / Function refreshing current rates
+            interval: Kur yenileme aralığı (saniye) / Rate refresh interval (seconds)
+            refresh_history: Son günlerin geçmiş kurlarını yenileyen fonksiyon (isteğe bağlı)
+                             Function refreshing recent historical rates (optional)
+            history_time: Geçmiş kurların yenilendiği saat (UTC) / Daily history refresh time (UTC)
+        """
+        self.refresh_rates = refresh_rates
+        self.interval = interval
+        self.refresh_history = refresh_history
+        self.history_time = history_time
+        self._stop = threading.Event()
+        self._thread = None
+        self._pid = None
+
+    def start(self, delay=0.0):
+        """
+        Yenileyiciyi başlatır (zaten çalışıyorsa bir şey yapmaz).
+        Starts the refresher (does nothing if it is already running).
+
+        Parametre / Parameter:
+            delay: İlk yenilemeden önce beklenecek süre (saniye; eldeki veri tazeyse)
+                   Time to wait before the first refresh (seconds; when the data at hand is fresh)
+        """
+        if self.is_running():
+            return
+
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, args=(delay,), name="rate-refresher", daemon=True)
+        self._pid = os.getpid()
+        self._thread.start()
+        logger.info("Kur yenileyici başlatıldı / Rate refresher started (" + str(self.interval) + " s)")
+
+    def stop(self):
+        """
+        Yenileyiciyi durdurur.
+        Stops the refresher.
+        """
+        self._stop.set()
+
+    def is_running(self):
+        """
+        Yenileyici bu süreçte çalışıyor mu?
+        Is the refresher running in this process?
+
+        Çatallanan (fork) süreçlere iş parçacıkları aktarılmaz.
+        Threads are not carried over into forked processes.
+        """
+        if self._thread is None or self._pid != os.getpid():
+            return False
+        return self._thread.is_alive() and not self._stop.is_set()
+
+    def _run(self, delay=0.0):
+        """
+        Yenileme döngüsü.
+        Refresh loop.
+        """
+        history_hour, history_minute = self.history_time
+        next_history = next_daily_run(datetime.now(timezone.utc), history_hour, history_minute)
+
+        if delay > 0:
+            self._stop.wait(delay)
+
+        while not self._stop.is_set():
+            self._safely(self.refresh_rates)
+
+            now = datetime.now(timezone.utc)
+            if self.refresh_history is not None and now >= next_history:
+                self._safely(self.refresh_history)
+                next_history = next_daily_run(now, history_hour, history_minute)
+
+            self._stop.wait(self.interval)
+
+    def _safely(self, function):
+        """
+        Bir yenileme fonksiyonunu çalıştırır; hata döngüyü durdurmaz.
+        Runs a refresh function; an error does not stop the loop.
+        """
+        try:
+            function()
+        except Exception as error:
+            logger.error("Yenileme hatası / Refresh error: " + str(error))
@@ -0,0 +1,127 @@
+# ============================================================
+# KurTakip - Süreçler Arası Paylaşılan Önbellek / Cross-Process Shared Cache
+# Birden fazla sunucu işçisinin (worker) aynı kur verisini paylaşmasını sağlar
+# Lets several server workers share the same rate snapshot
+# ============================================================
+
+# --- Kütüphaneleri içe aktar / Import libraries ---
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+# fcntl sadece POSIX sistemlerde var (Windows'ta kilit atlanır)
+# fcntl only exists on POSIX systems (locking is skipped on Windows)
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+# --- Log ayarları / Logging setup ---
+logger = logging.getLogger(__name__)
+
+
+class SharedSnapshotFile:
+    """
+    Yerel bir JSON dosyasında tutulan, süreçler arası paylaşılan kur verisi.
+    A rate snapshot shared between processes through a local JSON file.
+
+    - Yazma atomiktir (geçici dosya + os.replace); okuyan yarım dosya görmez.
+      Writes are atomic (temp file + os.replace); readers never see half a file.
+    - Kilit dosyası ile aynı anda sadece bir süreç internetten veri çeker.
+      A lock file makes sure only one process fetches from the internet at a time.
+    """
+
+    def __init__(self, path):
+        """
+        Parametre / Parameter:
+            path: Paylaşılan dosyanın yolu / Path of the shared file
+        """
+        self.path = Path(path)
+        self.lock_path = Path(str(path) + ".lock")
+        self._thread_lock = threading.Lock()
+
+    def read(self):
+        """
+        Dosyadaki veriyi ve yazılma zamanını okur.
+        Reads the data in the file and when it was written.
+
+        Döndürür / Returns:
+            (veri / data, yazılma zamanı / written at (unix time)) ya da None / or None
+        """
+        try:
+            with open(self.path, "r", encoding="utf-8") as file:
+                content = json.load(file)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as error:
+            logger.error("Paylaşılan önbellek okunamadı / Could not read shared cache: " + str(error))
+            return None
+
+        if "data" not in content or "written_at" not in content:
+            return None
+        return content["data"], content["written_at"]
+
+    def read_fresh(self, max_age):
+        """
+        Veri max_age saniyeden yeniyse döndürür.
+        Returns the data if it is newer than max_age seconds.
+
+        Döndürür / Returns:
+            Veri ya da None / Data or None
+        """
+        result = self.read()
+        if result is None:
+            return None
+
+        data, written_at = result
+        if time.time() - written_at >= max_age:
+            return None
+        return data
+
+    def write(self, data):
+        """
+        Veriyi dosyaya atomik olarak yazar.
+        Writes the data to the file atomically.
+        """
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        content = {"written_at": time.time(), "data": data}
+
+        handle, temp_path = tempfile.mkstemp(dir=str(self.path.parent), prefix=self.path.name + ".")
+        try:
+            with os.fdopen(handle, "w", encoding="utf-8") as file:
+                json.dump(content, file)
+            os.replace(temp_path, self.path)
+        except OSError as error:
+            logger.error("Paylaşılan önbellek yazılamadı / Could not write shared cache: " + str(error))
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+
+    @contextmanager
+    def lock(self):
+        """
+        Süreçler (ve iş parçacıkları) arası özel kilit.
+        Exclusive lock across processes (and threads).
+
+        Kullanım / Usage:
+            with shared.lock():
+                ...
+        """
+        with self._thread_lock:
+            if fcntl is None:
+                yield
+                return
+
+            self.lock_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.lock_path, "a") as lock_file:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
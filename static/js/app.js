@@ -1,5 +1,5 @@
 const API = '/api', $ = id => document.getElementById(id);
-let chart = null, currencies = { fiat: {} }, pair = { base: '', quote: '', name: '' }, comparisons = [];
+let chart = null, currencies = { fiat: {} }, pair = { base: '', quote: '', name: '' }, comparisons = [], live = null;
 const KEYS = { THEME: 'kurtakip_theme', FAVS: 'kurtakip_favorites', HIST: 'kurtakip_history' };
 const EMOJIS = { 'USD': '🇺🇸', 'EUR': '🇪🇺', 'TRY': '🇹🇷', 'GBP': '🇬🇧', 'JPY': '🇯🇵', 'CHF': '🇨🇭', 'CAD': '🇨🇦', 'AUD': '🇦🇺', 'CNY': '🇨🇳', 'INR': '🇮🇳', 'RUB': '🇷🇺', 'BRL': '🇧🇷', 'ZAR': '🇿🇦', 'KRW': '🇰🇷', 'MXN': '🇲🇽', 'SAR': '🇸🇦', 'AED': '🇦🇪', 'SEK': '🇸🇪', 'NOK': '🇳🇴', 'DKK': '🇩🇰', 'PLN': '🇵🇱', 'SGD': '🇸🇬', 'NZD': '🇳🇿' };
 
@@ -21,7 +21,7 @@ document.addEventListener('DOMContentLoaded', async () => {
         });
         if (dfs[id] && !sel.value) sel.value = dfs[id];
     });
-    loadFavorites(); loadHistory();
+    loadFavorites(); loadHistory(); startLive();
     $('convertBtn').addEventListener('click', convert); $('multiConvertBtn').addEventListener('click', multiConvert);
     $('currencySearch').addEventListener('input', searchCurrencies); $('amount').addEventListener('keypress', e => e.key === 'Enter' && convert());
     $('themeToggle').addEventListener('click', () => { const dark = document.documentElement.classList.toggle('dark'); localStorage.setItem(KEYS.THEME, dark ? 'dark' : 'light'); notify(dark ? 'Karanlık mod aktif' : 'Aydınlık mod aktif', 'success'); });
@@ -48,13 +48,34 @@ function loadFavorites() {
     fv.forEach(async f => {
         const c = document.createElement('div'); c.className = 'card p-5 cursor-pointer relative group';
         try {
-            const r = await (await fetch(`${API}/rates/${f.base}`)).json(), rt = r.rates?.[f.quote] || '-';
-            c.innerHTML = `<button class="star-btn active absolute top-3 right-3" onclick="event.stopPropagation(); removeFav('${f.base}','${f.quote}')"><i class="fas fa-star"></i></button><h3 class="font-semibold">${f.name}</h3><p class="stat-value text-2xl mt-2">${fmt(rt)}</p><p class="text-sm text-muted mt-1">${f.base}/${f.quote}</p>`;
+            const rt = liveRate(f.base, f.quote) ?? (await (await fetch(`${API}/rates/${f.base}`)).json()).rates?.[f.quote] ?? '-';
+            c.innerHTML = `<button class="star-btn active absolute top-3 right-3" onclick="event.stopPropagation(); removeFav('${f.base}','${f.quote}')"><i class="fas fa-star"></i></button><h3 class="font-semibold">${f.name}</h3><p class="stat-value text-2xl mt-2" data-live="${f.base}/${f.quote}">${fmt(rt)}</p><p class="text-sm text-muted mt-1">${f.base}/${f.quote}</p>`;
             c.addEventListener('click', () => showChart(f.base, f.quote, f.name));
         } catch { c.innerHTML = `<h3 class="font-semibold">${f.name}</h3><p class="text-sm text-muted">Veri yüklenemedi</p>`; }
         box.appendChild(c);
     });
 }
+// Canlı kurlar: tek SSE bağlantısı çapa kurlarını taşır, çaprazlar tarayıcıda hesaplanır
+// Live rates: one SSE connection carries the anchor rates, crosses are computed in the browser
+// Akış açılamıyorsa (WSGI işçi iş parçacıkları dolu) kurlar aralıklarla yoklanır
+// If the stream cannot be opened (WSGI worker threads are busy) the rates are polled periodically
+async function startLive() {
+    let status = { available: false, base: 'EUR', poll_interval: 60 };
+    try { status = await (await fetch(`${API}/stream/status`)).json(); } catch (e) {}
+    if (!window.EventSource || !status.available) return startPolling(status.base, status.poll_interval);
+    const es = new EventSource(`${API}/stream/rates`);
+    const apply = e => { const d = JSON.parse(e.data); live = Object.assign(e.type === 'snapshot' || !live ? {} : live, d.rates); live[d.base] = 1; refreshLive(); };
+    es.addEventListener('snapshot', apply); es.addEventListener('rates', apply);
+    es.onerror = () => { if (es.readyState === EventSource.CLOSED) startPolling(status.base, status.poll_interval); };
+}
+let polling = null;
+function startPolling(base, seconds) {
+    if (polling) return;
+    const poll = async () => { try { const d = await (await fetch(`${API}/rates/${base}`)).json(); if (d.rates) { live = Object.assign({}, d.rates); live[base] = 1; refreshLive(); } } catch (e) {} };
+    poll(); polling = setInterval(poll, Math.max(seconds, 5) * 1000);
+}
+const liveRate = (b, q) => live && live[b] && live[q] ? live[q] / live[b] : null;
+function refreshLive() { document.querySelectorAll('[data-live]').forEach(el => { const [b, q] = el.dataset.live.split('/'), r = liveRate(b, q); if (r != null) el.textContent = fmt(r); }); }
 window.removeFav = (b, q) => { saveFavs(getFavs().filter(f => !(f.base === b && f.quote === q))); loadFavorites(); notify('Kaldırıldı', 'success'); };
 window.toggleFav = (b, q, n) => {
     let fv = getFavs(); if (fv.find(f => f.base === b && f.quote === q)) fv = fv.filter(f => !(f.base === b && f.quote === q)); else fv.push({ base: b, quote: q, name: n });
@@ -82,7 +103,7 @@ async function loadPopularPairs() {
             if (!p?.rate) return;
             const c = document.createElement('div'), cls = p.change_24h >= 0 ? 'positive' : 'negative', icon = p.change_24h >= 0 ? 'fa-arrow-up' : 'fa-arrow-down';
             c.className = 'card p-5 cursor-pointer relative group';
-            c.innerHTML = `<button class="star-btn absolute top-4 right-4 ${isFav(p.base, p.quote) ? 'active' : ''}" onclick="event.stopPropagation(); toggleFav('${p.base}','${p.quote}','${p.name}')"><i class="fas fa-star"></i></button><div class="flex justify-between items-start mb-3 pr-8"><h3 class="font-semibold">${p.name}</h3><span class="text-xs ${cls} flex items-center"><i class="fas ${icon} mr-1"></i>${Math.abs(p.change_24h).toFixed(2)}%</span></div><p class="stat-value text-2xl">${fmt(p.rate)}</p><p class="text-sm text-muted mt-2">${p.base}/${p.quote}</p>`;
+            c.innerHTML = `<button class="star-btn absolute top-4 right-4 ${isFav(p.base, p.quote) ? 'active' : ''}" onclick="event.stopPropagation(); toggleFav('${p.base}','${p.quote}','${p.name}')"><i class="fas fa-star"></i></button><div class="flex justify-between items-start mb-3 pr-8"><h3 class="font-semibold">${p.name}</h3><span class="text-xs ${cls} flex items-center"><i class="fas ${icon} mr-1"></i>${p.change_24h == null ? '-' : Math.abs(p.change_24h).toFixed(2) + '%'}</span></div><p class="stat-value text-2xl" data-live="${p.base}/${p.quote}">${fmt(p.rate)}</p><p class="text-sm text-muted mt-2">${p.base}/${p.quote}</p>`;
             c.addEventListener('click', () => showChart(p.base, p.quote, p.name)); bx.appendChild(c);
         });
     } catch { notify('Popüler pariteler alınamadı', 'error'); }
@@ -160,9 +181,10 @@ function removeComparison() { comparisons = []; $('removeCompareBtn').classList.
 
 async function loadChartData(b, q, days = 7) {
     try {
-        const r = await fetch(`${API}/history/${b}/${q}?days=${days}`), m = await r.json(); if (!r.ok || !m) return;
-        const cd = await Promise.all(comparisons.map(async c => { const cr = await fetch(`${API}/history/${b}/${c}?days=${days}`); return cr.ok ? { currency: c, data: (await cr.json()).data } : null; }));
-        renderChart(m, cd.filter(Boolean));
+        const qs = [q, ...comparisons.filter(c => c !== q && c !== b)];
+        const r = await fetch(`${API}/history/${b}?quotes=${qs.join(',')}&days=${days}`), h = await r.json(); if (!r.ok || !h?.series) return;
+        const rows = c => h.dates.map((date, i) => ({ date, rate: h.series[c]?.[i] ?? null }));
+        renderChart({ base: b, quote: q, data: rows(q) }, qs.slice(1).map(c => ({ currency: c, data: rows(c) })));
     } catch { notify('Grafik hatası', 'error'); }
 }
 
@@ -0,0 +1,193 @@
+# ============================================================
+# KurTakip - Hazır Dosyalar / Prebuilt Assets
+# Değişmeyen yanıtları (sayfa, JS, CSS, sabit JSON) başlangıçta bir kez hazırlar
+# Prepares unchanging responses (page, JS, CSS, fixed JSON) once at startup
+# ============================================================
+#
+# Her dosya bir kez okunur, gzip / brotli halleri önceden sıkıştırılır ve
+# içerik özetinden güçlü bir ETag üretilir. JS ve CSS ayrıca adında içerik
+# özeti olan bir adresle sunulur (örn. /js/app.3f2a9c1b.js); index.html bu
+# adreslere yönlendirilir, böylece bu dosyalar "immutable" önbelleğe alınabilir.
+# Every file is read once, its gzip / brotli forms are precompressed and a
+# strong ETag is derived from the content hash. JS and CSS are also served
+# under a content-hashed name (e.g. /js/app.3f2a9c1b.js) that index.html is
+# rewritten to use, so those files can be cached as "immutable".
+# ============================================================
+
+# --- Kütüphaneleri içe aktar / Import libraries ---
+import hashlib
+import mimetypes
+from pathlib import Path
+
+from werkzeug.http import is_resource_modified
+
+import compression
+
+# Adında içerik özeti olan dosyaların önbellek süresi (1 yıl)
+# Cache lifetime of content-hashed files (1 year)
+IMMUTABLE_MAX_AGE = 31536000
+
+# Dosya adına eklenen özet uzunluğu / Length of the hash added to file names
+NAME_HASH_LENGTH = 10
+
+# Sayfaya dahil edilen dosyalar: adres -> static klasöründeki yol
+# Files referenced by the page: URL -> path inside the static folder
+PAGE_ASSETS = {
+    "/js/app.js": "js/app.js",
+    "/css/style.css": "css/style.css",
+}
+
+# Özel içerik türleri / Content types that need to be forced
+MIMETYPES = {
+    ".js": "application/javascript",
+    ".css": "text/css",
+    ".html": "text/html",
+}
+
+
+class Asset:
+    """
+    Önceden hazırlanmış bir yanıt gövdesi ve sıkıştırılmış halleri.
+    A prebuilt response body and its compressed forms.
+    """
+
+    def __init__(self, body, mimetype):
+        """
+        Parametreler / Parameters:
+            body: Gövde baytları / Body bytes
+            mimetype: İçerik türü / Content type (örn: "text/css")
+        """
+        self.body = body
+        self.mimetype = mimetype
+        self.digest = hashlib.blake2b(body, digest_size=16).hexdigest()
+        self.etag = self.digest
+
+        # Sadece gerçekten küçülen haller saklanır / Only forms that actually shrink are kept
+        self.variants = {}
+        if mimetype in compression.COMPRESSIBLE_TYPES:
+            for encoding in compression.available_encodings():
+                compressed = compression.compress(body, encoding, best=True)
+                if len(compressed) < len(body):
+                    self.variants[encoding] = compressed
+
+    def encoding_for(self, accept_encodings):
+        """
+        İstemcinin kabul ettiği en iyi hazır sıkıştırma (yoksa None).
+        The best precompressed form the client accepts (None if there is none).
+        """
+        for encoding in compression.available_encodings():
+            if encoding in self.variants and accept_encodings[encoding] > 0:
+                return encoding
+        return None
+
+    def response(self, request, response_class, max_age, immutable=False):
+        """
+        Koşullu GET ve Accept-Encoding'e uygun yanıtı oluşturur.
+        Builds the response honouring conditional GET and Accept-Encoding.
+
+        Parametreler / Parameters:
+            request: Flask isteği / Flask request
+            response_class: app.response_class
+            max_age: Cache-Control max-age (saniye / seconds); 0 = her seferinde doğrula / always revalidate
+            immutable: Adında içerik özeti olan dosyalar için / For content-hashed files
+        """
+        encoding = self.encoding_for(request.accept_encodings)
+
+        # Her gösterim bayt bayt farklıdır: ETag kodlamayı da içerir
+        # Every representation has different bytes, so the ETag includes the encoding
+        etag = self.etag
+        if encoding is not None:
+            etag = etag + "-" + encoding
+
+        if is_resource_modified(request.environ, etag=etag):
+            if encoding is None:
+                response = response_class(self.body, mimetype=self.mimetype)
+            else:
+                response = response_class(self.variants[encoding], mimetype=self.mimetype)
+                response.headers["Content-Encoding"] = encoding
+        else:
+            response = response_class(status=304)
+
+        response.set_etag(etag)
+        response.vary.add("Accept-Encoding")
+        response.cache_control.public = True
+        if max_age > 0:
+            response.cache_control.max_age = max_age
+        else:
+            response.cache_control.no_cache = True
+        if immutable:
+            response.cache_control.immutable = True
+        return response
+
+
+def mimetype_for(path):
+    """
+    Dosya uzantısından içerik türünü bulur.
+    Finds the content type from a file extension.
+    """
+    suffix = Path(path).suffix.lower()
+    if suffix in MIMETYPES:
+        return MIMETYPES[suffix]
+    return mimetypes.guess_type(str(path))[0] or "application/octet-stream"
+
+
+def hashed_url(url, asset):
+    """
+    Adrese içerik özetini ekler: /js/app.js -> /js/app.<özet / hash>.js
+    Adds the content hash to a URL: /js/app.js -> /js/app.<hash>.js
+    """
+    stem, dot, suffix = url.rpartition(".")
+    return stem + "." + asset.digest[:NAME_HASH_LENGTH] + dot + suffix
+
+
+class AssetBundle:
+    """
+    Sayfa ve dosyalarının tamamı (adres -> Asset).
+    The page and all its files (URL -> Asset).
+    """
+
+    def __init__(self, static_dir):
+        """
+        Parametre / Parameter:
+            static_dir: static klasörü / The static folder
+        """
+        self.static_dir = Path(static_dir)
+        self.assets = {}
+        self.immutable = set()
+        self.urls = {}
+
+        for url, relative_path in PAGE_ASSETS.items():
+            path = self.static_dir / relative_path
+            asset = Asset(path.read_bytes(), mimetype_for(path))
+
+            # Eski adres de çalışmaya devam eder / The plain URL keeps working
+            hashed = hashed_url(url, asset)
+            self.assets[url] = asset
+            self.assets[hashed] = asset
+            self.immutable.add(hashed)
+            self.urls[url] = hashed
+
+        self.page = Asset(self.rewrite_page((self.static_dir / "index.html").read_text("utf-8")),
+                          "text/html")
+
+    def rewrite_page(self, html):
+        """
+        Sayfadaki dosya adreslerini içerik özetli adreslerle değiştirir.
+        Replaces the file URLs in the page with their content-hashed URLs.
+        """
+        for url, hashed in self.urls.items():
+            html = html.replace('"' + url + '"', '"' + hashed + '"')
+        return html.encode("utf-8")
+
+    def get(self, url):
+        """
+        Adresin dosyasını döndürür.
+        Returns the asset for a URL.
+
+        Döndürür / Returns:
+            (Asset, immutable mı / is immutable) ya da bulunamazsa None / or None if not found
+        """
+        asset = self.assets.get(url)
+        if asset is None:
+            return None
+        return asset, url in self.immutable
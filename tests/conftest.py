@@ -4,6 +4,7 @@ Testlerin ortak ayarlarını içerir.
 Contains shared settings for all tests.
 """
 
+import os
 import sys
 from pathlib import Path
 import pytest
@@ -12,7 +13,15 @@ import pytest
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
+# Testler gerçek veri dosyalarına yazmasın
+# Tests must not write to the real data files
+os.environ["HISTORY_DB_PATH"] = ":memory:"
+os.environ["SHARED_CACHE_PATH"] = ""
+os.environ["WARM_STATE_PATH"] = ""
+
 from app import app as flask_app
+from app import analytics_cache, history_store, rate_cache, rates_body_cache, snapshot_ring
+from history_store import HistoryStore
 
 
 @pytest.fixture
@@ -22,9 +31,28 @@ def app():
     Prepares the Flask app for testing.
     """
     flask_app.config['TESTING'] = True
+
+    # Testler birbirinin önbelleğini görmesin / Tests must not share cached rates
+    rate_cache.clear()
+    snapshot_ring.clear()
+    analytics_cache.clear()
+    rates_body_cache.clear()
     return flask_app
 
 
+@pytest.fixture
+def store(monkeypatch):
+    """
+    Her test için boş bir bellek içi geçmiş kur deposu kurar.
+    Installs an empty in-memory historical rate store for each test.
+    """
+    import app as app_module
+
+    empty_store = HistoryStore(":memory:", recent_ttl=history_store.recent_ttl)
+    monkeypatch.setattr(app_module, "history_store", empty_store)
+    return empty_store
+
+
 @pytest.fixture
 def client(app):
     """
@@ -0,0 +1,60 @@
+"""
+KurTakip - Kur Analizi Testleri / Rate Analytics Tests
+"""
+
+import math
+
+import pytest
+
+import analytics
+
+
+def make_points(values):
+    return [{"date": "2024-12-" + str(day + 1).zfill(2), "rate": value} for day, value in enumerate(values)]
+
+
+def test_rolling_mean_std():
+    """
+    Hareketli değerler doğrudan hesaplananla aynı olmalı.
+    Rolling values must match a direct computation.
+    """
+    values = [35.0, 35.2, 34.9, 35.5, 36.0, 35.8]
+    means, deviations = analytics.rolling_mean_std(values, 3)
+
+    assert means[:2] == [None, None]
+    for index in range(2, len(values)):
+        window = values[index - 2:index + 1]
+        mean = sum(window) / 3
+        assert means[index] == pytest.approx(mean)
+        assert deviations[index] == pytest.approx(math.sqrt(sum((v - mean) ** 2 for v in window) / 2))
+
+
+def test_drawdown():
+    """
+    En büyük düşüş zirveden dibe ölçülmeli.
+    The worst drawdown must be measured from peak to trough.
+    """
+    values = [10.0, 12.0, 9.0, 11.0, 13.0, 12.0]
+    result, worst_index, peak_index = analytics.drawdowns(values)
+
+    assert result[0] == 0
+    assert result[2] == pytest.approx(-25.0)
+    assert (worst_index, peak_index) == (2, 1)
+
+
+def test_summarize():
+    """
+    Özet en düşük / en yüksek ve yüzde değişimi içermeli.
+    The summary must hold min / max and the percent change.
+    """
+    result = analytics.summarize(make_points([10.0, 12.0, 9.0, 11.0, 12.5]), 2)
+    summary = result["summary"]
+
+    assert summary["min"] == {"date": "2024-12-03", "rate": 9.0}
+    assert summary["max"] == {"date": "2024-12-05", "rate": 12.5}
+    assert summary["change_percent"] == 25.0
+    assert summary["max_drawdown"] == {"percent": -25.0, "peak_date": "2024-12-02", "trough_date": "2024-12-03"}
+    assert summary["volatility_daily"] > 0
+    assert result["rolling_mean"] == [None, 11.0, 10.5, 10.0, 11.75]
+
+    assert analytics.summarize([], 2) is None
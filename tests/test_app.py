@@ -156,6 +156,24 @@ def test_negative_amount(client):
     assert response.status_code in [200, 400, 422]
 
 
+def test_huge_amount_rejected(client, monkeypatch):
+    """
+    Sonlu ama çok büyük miktarlar 500 değil 400 dönmeli.
+    Finite but huge amounts must return 400, not 500.
+    """
+    import app as app_module
+
+    monkeypatch.setattr(app_module, "fetch_rates", lambda base_currency: {
+        "base": "USD", "date": "2024-12-02", "rates": {"EUR": 0.9, "TRY": 35.0}
+    })
+
+    for amount in ["1e400", "1e16", "1e-999999"]:
+        response = client.get("/api/convert?from_currency=USD&to_currency=TRY&amount=" + amount)
+        assert response.status_code == 400
+        response = client.get("/api/multi-convert?from_currency=USD&amount=" + amount)
+        assert response.status_code == 400
+
+
 def test_homepage(client):
     """
     Ana sayfanın açıldığını test eder.
@@ -230,6 +248,25 @@ def test_compare_dates(client):
         assert "change_direction" in data
 
 
+def test_date_before_first_fixing(client):
+    """
+    İlk ECB kurundan (1999-01-04) önceki tarihler 400 döndürmeli.
+    Dates before the first ECB fixing (1999-01-04) should return 400.
+    """
+    for url in [
+        "/api/fixing-date/0001-01-01",
+        "/api/fixing-date/1999-01-03",
+        "/api/rate-on-date/USD/EUR/0001-01-01",
+        "/api/compare-dates/USD/EUR?start_date=0001-01-01&end_date=2024-12-01",
+    ]:
+        response = client.get(url)
+        assert response.status_code == 400
+        assert "1999-01-04" in response.get_json()["error"]
+
+    data = client.get("/api/fixing-date/1999-01-04").get_json()
+    assert data["fixing_date"] == "1999-01-04"
+
+
 def test_compare_no_dates(client):
     """
     Tarih parametresi olmadan hata döndürmeli.
@@ -254,3 +291,968 @@ def test_compare_bad_currency(client):
 
     data = response.get_json()
     assert "error" in data
+
+
+# ============================================================
+# Önbellek Testleri / Cache Tests
+# ============================================================
+
+def test_rates_are_cached(client, monkeypatch):
+    """
+    Aynı temel para birimi için tekrar eden istekler tek API çağrısı yapmalı.
+    Repeated requests for the same base must make a single API call.
+    """
+    import app as app_module
+
+    calls = []
+
+    def fake_fetch(base_currency):
+        calls.append(base_currency)
+        return {"base": base_currency, "date": "2024-12-02", "rates": {"EUR": 0.95}}
+
+    monkeypatch.setattr(app_module, "fetch_rates", fake_fetch)
+
+    first = client.get("/api/rates/USD")
+    second = client.get("/api/convert?from_currency=USD&to_currency=EUR&amount=10")
+
+    assert first.status_code == 200
+    assert second.status_code == 200
+    assert calls == ["USD"]
+
+
+def test_all_pairs_from_one_fetch(client, monkeypatch):
+    """
+    Farklı temel para birimleri tek bir çapa çağrısından hesaplanmalı.
+    Different base currencies must be derived from a single anchor call.
+    """
+    import app as app_module
+
+    calls = []
+
+    def fake_fetch(base_currency):
+        calls.append(base_currency)
+        return {"base": "USD", "date": "2024-12-02", "rates": {"EUR": 0.5, "TRY": 35.0}}
+
+    monkeypatch.setattr(app_module, "fetch_rates", fake_fetch)
+
+    response = client.get("/api/convert?from_currency=EUR&to_currency=TRY&amount=2")
+    assert response.get_json()["result"] == 140.0
+
+    response = client.get("/api/rates/TRY")
+    assert response.get_json()["rates"]["EUR"] == 0.5 / 35.0
+
+    response = client.get("/api/multi-convert?from_currency=EUR&amount=1&to_currencies=USD,TRY")
+    assert len(response.get_json()["conversions"]) == 2
+
+    assert calls == ["USD"]
+
+
+def test_popular_pairs_deadline(client, monkeypatch):
+    """
+    Yavaş bir kaynak popüler pariteleri toplam süreden fazla bekletmemeli.
+    A slow upstream must not hold popular pairs past the overall deadline.
+    """
+    import threading
+    import time
+    import app as app_module
+
+    release = threading.Event()
+
+    def slow_fetch(base_currency):
+        release.wait(5)
+        return None
+
+    monkeypatch.setattr(app_module, "fetch_rates", slow_fetch)
+    monkeypatch.setattr(app_module, "POPULAR_PAIRS_DEADLINE", 0.1)
+
+    started = time.monotonic()
+    response = client.get("/api/popular-pairs")
+    elapsed = time.monotonic() - started
+    release.set()
+
+    assert response.status_code == 200
+    assert response.get_json() == []
+    assert elapsed < 1
+
+
+def test_get_rates_many_single_matrix(monkeypatch):
+    """
+    Tüm temel birimler tek bir kur matrisinden okunmalı; tekrarlar bir kez dönmeli.
+    Every base must be read from a single rate matrix; repeats must appear once.
+    """
+    import app as app_module
+    from cross_rates import RateMatrix
+
+    calls = []
+    matrix = RateMatrix(["USD", "EUR", "GBP", "TRY"], "USD", {"EUR": 0.5, "GBP": 0.8, "TRY": 35.0})
+
+    def fake_get_rate_matrix():
+        calls.append(1)
+        return matrix
+
+    monkeypatch.setattr(app_module, "get_rate_matrix", fake_get_rate_matrix)
+
+    results = app_module.get_rates_many(["USD", "EUR", "USD", "GBP", "EUR", "XXX"], 1)
+
+    assert len(calls) == 1
+    assert list(results) == ["USD", "EUR", "GBP"]
+    assert results["EUR"]["rates"]["TRY"] == 70.0
+
+
+# ============================================================
+# Geçmiş Kur Deposu Testleri / Historical Store Tests
+# ============================================================
+
+def test_history_served_from_store(client, store, monkeypatch):
+    """
+    Aynı geçmiş aralık ikinci kez internetten çekilmemeli.
+    The same historical range must not be fetched twice.
+    """
+    import app as app_module
+
+    calls = []
+
+    def fake_fetch(base_currency, quote_currency, start_date, end_date):
+        calls.append((start_date, end_date))
+        return {start_date.isoformat(): 34.0, end_date.isoformat(): 35.0}
+
+    monkeypatch.setattr(app_module, "fetch_historical_range", fake_fetch)
+
+    first = client.get("/api/history/USD/TRY?days=7")
+    second = client.get("/api/history/USD/TRY?days=7")
+
+    assert first.status_code == 200
+    assert first.get_json()["data"] == second.get_json()["data"]
+    assert len(first.get_json()["data"]) == 2
+    assert len(calls) == 1
+
+
+def test_compare_dates_from_store(client, store, monkeypatch):
+    """
+    Daha önce sorulan tarihler yerel depodan yanıtlanmalı.
+    Dates asked before must be answered from the local store.
+    """
+    import app as app_module
+
+    calls = []
+
+    def fake_fetch(base_currency, date_text):
+        calls.append(date_text)
+        rate = 30.0 if date_text == "2024-11-01" else 33.0
+        return {"date": date_text, "rates": {"TRY": rate, "EUR": rate / 35}}
+
+    monkeypatch.setattr(app_module, "fetch_rates_on_date", fake_fetch)
+
+    url = "/api/compare-dates/USD/TRY?start_date=2024-11-01&end_date=2024-12-02"
+    first = client.get(url)
+    second = client.get(url)
+    on_date = client.get("/api/rate-on-date/USD/TRY/2024-12-02")
+
+    assert first.get_json()["change_percent"] == 10.0
+    assert second.get_json() == first.get_json()
+    assert on_date.get_json()["rate"] == 33.0
+    assert sorted(calls) == ["2024-11-01", "2024-12-02"]
+
+    # Aynı günün diğer hedefleri de kaydedildi / The day's other targets were stored too
+    other = client.get("/api/rate-on-date/USD/EUR/2024-12-02")
+    assert other.get_json()["rate"] == 33.0 / 35
+    assert len(calls) == 2
+
+
+def test_rate_on_date_single_flight(client, store, monkeypatch):
+    """
+    Aynı tarih için eşzamanlı istekler tek bir API çağrısını paylaşmalı.
+    Concurrent requests for the same date must share a single API call.
+    """
+    import threading
+    import time
+    import app as app_module
+
+    calls = []
+
+    def slow_fetch(base_currency, date_text):
+        calls.append((base_currency, date_text))
+        time.sleep(0.1)
+        return {"date": "2023-06-09", "rates": {"TRY": 34.6, "EUR": 0.95}}
+
+    monkeypatch.setattr(app_module, "fetch_rates_on_date", slow_fetch)
+
+    results = []
+
+    def ask(quote_currency):
+        found = app_module.get_rate_on_date("USD", quote_currency, "2023-06-10")
+        results.append(found["rate"] if found is not None else None)
+
+    threads = [threading.Thread(target=ask, args=(code,)) for code in ["TRY", "EUR", "TRY"]]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # Cumartesi, cuma kuruna çevrilir / Saturday resolves to Friday's fixing
+    assert calls == [("USD", "2023-06-09")]
+    assert sorted(results) == [0.95, 34.6, 34.6]
+
+    # Kaynakta olmayan hedef / A target the source does not carry
+    assert app_module.get_rate_on_date("USD", "GBP", "2023-06-10") is None
+
+
+def test_history_fetches_only_new_days(client, store, monkeypatch):
+    """
+    Pencere büyüyünce sadece yeni günler çekilmeli.
+    When the window grows only the new days must be fetched.
+    """
+    from datetime import date, timedelta
+    import app as app_module
+
+    calls = []
+
+    def fake_fetch(base_currency, quote_currency, start_date, end_date):
+        calls.append((start_date, end_date))
+        return {start_date.isoformat(): 34.0}
+
+    monkeypatch.setattr(app_module, "fetch_historical_range", fake_fetch)
+
+    client.get("/api/history/USD/TRY?days=30")
+    client.get("/api/history/USD/TRY?days=90")
+
+    today = date.today()
+    assert calls == [
+        (today - timedelta(days=30), today),
+        (today - timedelta(days=90), today - timedelta(days=31)),
+    ]
+
+
+def test_history_batch_single_fetch(client, store, monkeypatch):
+    """
+    Birden fazla hedef tek istekte çekilmeli ve sütun biçiminde dönmeli.
+    Several targets must be fetched in one request and returned as columns.
+    """
+    from datetime import date, timedelta
+    import app as app_module
+
+    calls = []
+    day_1 = (date.today() - timedelta(days=2)).isoformat()
+    day_2 = (date.today() - timedelta(days=1)).isoformat()
+
+    def fake_fetch(base_currency, quote_currencies, start_date, end_date):
+        calls.append(list(quote_currencies))
+        return {
+            "TRY": {day_1: 34.6, day_2: 34.7},
+            "EUR": {day_2: 0.95},
+        }
+
+    monkeypatch.setattr(app_module, "fetch_historical_series", fake_fetch)
+
+    response = client.get("/api/history/USD?quotes=TRY,eur&days=30")
+    assert response.status_code == 200
+
+    data = response.get_json()
+    assert data["quotes"] == ["TRY", "EUR"]
+    assert data["dates"] == [day_1, day_2]
+    assert data["series"] == {"TRY": [34.6, 34.7], "EUR": [None, 0.95]}
+    assert calls == [["TRY", "EUR"]]
+
+    # İkinci istek yerel depodan / Second request comes from the local store
+    client.get("/api/history/USD?quotes=TRY,EUR&days=30")
+    assert len(calls) == 1
+
+
+def test_history_batch_requires_quotes(client):
+    """
+    quotes parametresi olmadan hata dönmeli.
+    Must return an error without the quotes parameter.
+    """
+    response = client.get("/api/history/USD?days=30")
+    assert response.status_code == 400
+
+    response = client.get("/api/history/USD?quotes=INVALID")
+    assert response.status_code == 400
+
+
+def test_refresher_snapshot_used_without_network(client, monkeypatch):
+    """
+    Yenileyici çalışırken istekler yayınlanmış veriyi kullanmalı.
+    While the refresher runs requests must use the published snapshot.
+    """
+    import app as app_module
+
+    calls = []
+
+    def fake_fetch(base_currency):
+        calls.append(base_currency)
+        return {"base": "USD", "date": "2024-12-02", "rates": {"TRY": 35.0}}
+
+    monkeypatch.setattr(app_module, "fetch_rates", fake_fetch)
+    monkeypatch.setattr(app_module.rate_refresher, "is_running", lambda: True)
+    monkeypatch.setattr(app_module.rate_cache, "ttl", 0)
+    monkeypatch.setattr(app_module.rate_cache, "stale_ttl", 0)
+
+    # Yenileyici veriyi yayınlar / The refresher publishes the snapshot
+    app_module.refresh_current_rates()
+
+    # Süresi dolmuş olsa bile istek internete çıkmaz
+    # The request does not go to the network even though the entry expired
+    response = client.get("/api/rates/USD")
+    assert response.get_json()["rates"]["TRY"] == 35.0
+    assert calls == ["USD"]
+
+
+def test_refresher_snapshot_age_limit(client, monkeypatch):
+    """
+    Yenileyici çalışsa da TTL + bayat süresinden eski veri sunulmamalı.
+    Even while the refresher runs, data older than TTL + stale time must not be served.
+    """
+    import app as app_module
+    from cross_rates import RateMatrix
+
+    monkeypatch.setattr(app_module.rate_refresher, "is_running", lambda: True)
+    monkeypatch.setattr(app_module, "fetch_rates", lambda base_currency: None)
+
+    limit = app_module.RATE_CACHE_TTL + app_module.RATE_CACHE_STALE_TTL
+    old_matrix = RateMatrix(app_module.CURRENCIES, "USD", {"TRY": 30.0})
+
+    # Sınırın içinde: yayınlanmış veri kullanılır / Within the limit: the published data is used
+    app_module.rate_cache.put("USD", old_matrix, age=limit - 60)
+    assert app_module.get_rate_matrix() is old_matrix
+
+    # Sınırın dışında ve kaynak kapalı: eski veri sunulmaz / Past the limit with the upstream down: not served
+    app_module.rate_cache.put("USD", old_matrix, age=limit + 60)
+    assert app_module.get_rate_matrix() is None
+    assert client.get("/api/rates/USD").status_code != 200
+
+    # Kaynak dönünce yeni veri çekilir / Once the upstream is back fresh data is fetched
+    monkeypatch.setattr(app_module, "fetch_rates", lambda base_currency: {
+        "base": "USD", "date": "2024-12-02", "rates": {"TRY": 35.0}
+    })
+    assert app_module.get_rate_matrix().rate("USD", "TRY") == 35.0
+
+
+def test_workers_share_snapshot_file(client, monkeypatch, tmp_path):
+    """
+    Bir işçinin çektiği kur verisi diğer işçiler tarafından dosyadan okunmalı.
+    Rates fetched by one worker must be read from the file by the others.
+    """
+    import app as app_module
+    from shared_cache import SharedSnapshotFile
+
+    calls = []
+
+    def fake_fetch(base_currency):
+        calls.append(base_currency)
+        return {"base": "USD", "date": "2024-12-02", "rates": {"TRY": 35.0}}
+
+    monkeypatch.setattr(app_module, "fetch_rates", fake_fetch)
+    monkeypatch.setattr(app_module, "shared_snapshot", SharedSnapshotFile(tmp_path / "rates.json"))
+
+    assert client.get("/api/rates/USD").status_code == 200
+
+    # Başka bir işçiyi taklit et: kendi bellek önbelleği boş
+    # Simulate another worker: its in-memory cache is empty
+    app_module.rate_cache.clear()
+    response = client.get("/api/rates/TRY")
+
+    assert response.get_json()["rates"]["USD"] == 1 / 35.0
+    assert calls == ["USD"]
+
+
+# ============================================================
+# Toplu Dönüşüm Testleri / Batch Conversion Tests
+# ============================================================
+
+def test_convert_batch(client, monkeypatch):
+    """
+    Toplu dönüşüm tek kur çağrısıyla tüm satırları çevirmeli.
+    Batch conversion must convert every row with a single rate fetch.
+    """
+    import app as app_module
+
+    calls = []
+
+    def fake_fetch(base_currency):
+        calls.append(base_currency)
+        return {"base": "USD", "date": "2024-12-02", "rates": {"EUR": 0.5, "TRY": 35.0}}
+
+    monkeypatch.setattr(app_module, "fetch_rates", fake_fetch)
+
+    response = client.post("/api/convert/batch", json=[
+        {"from": "USD", "to": "TRY", "amount": 10},
+        {"from": "EUR", "to": "USD", "amount": 3},
+        {"from": "USD", "to": "INVALID", "amount": 1},
+    ])
+    assert response.status_code == 200
+
+    data = response.get_json()
+    assert data["count"] == 3
+    assert data["errors"] == 1
+    assert data["results"][0]["result"] == 350.0
+    assert data["results"][1]["result"] == 6.0
+    assert calls == ["USD"]
+
+    response = client.post(
+        "/api/convert/batch",
+        data="from,to,amount\nTRY,USD,35\n",
+        content_type="text/csv",
+    )
+    assert response.get_json()["results"][0]["result"] == 1.0
+
+
+def test_convert_batch_bad_body(client):
+    """
+    Okunamayan gövde ve desteklenmeyen tür hata döndürmeli.
+    An unreadable body or unsupported type must return an error.
+    """
+    response = client.post("/api/convert/batch", data="{", content_type="application/json")
+    assert response.status_code == 400
+
+    response = client.post("/api/convert/batch", data="x", content_type="text/plain")
+    assert response.status_code == 415
+
+
+def test_convert_stream(client, monkeypatch):
+    """
+    Akış dönüşümü her satır için bir sonuç satırı döndürmeli.
+    Streaming conversion must return one result line per input line.
+    """
+    import json
+    import app as app_module
+
+    monkeypatch.setattr(app_module, "fetch_rates", lambda base_currency: {
+        "base": "USD", "date": "2024-12-02", "rates": {"TRY": 35.0}
+    })
+
+    body = '{"from": "USD", "to": "TRY", "amount": 2}\nnot json\n{"from": "TRY", "to": "USD", "amount": 70}\n'
+    response = client.post("/api/convert/stream", data=body, content_type="application/x-ndjson")
+    assert response.status_code == 200
+    assert response.mimetype == "application/x-ndjson"
+
+    lines = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    assert [line["row"] for line in lines] == [0, 1, 2]
+    assert lines[0]["result"] == 70.0
+    assert "error" in lines[1]
+    assert lines[2]["result"] == 2.0
+
+    response = client.post("/api/convert/stream", data="from,to,amount\nUSD,TRY,1\n", content_type="text/csv")
+    assert response.get_data(as_text=True).splitlines() == [
+        "row,from,to,amount,rate,result,error",
+        "0,USD,TRY,1.0,35.0,35.0,",
+    ]
+
+
+def test_convert_file_command(app, monkeypatch, tmp_path):
+    """
+    convert-file komutu dosyayı satır satır çevirmeli.
+    The convert-file command must convert a file line by line.
+    """
+    import app as app_module
+
+    monkeypatch.setattr(app_module, "fetch_rates", lambda base_currency: {
+        "base": "USD", "date": "2024-12-02", "rates": {"TRY": 35.0}
+    })
+
+    input_path = tmp_path / "rows.csv"
+    output_path = tmp_path / "out.csv"
+    input_path.write_text("from,to,amount\nUSD,TRY,3\n")
+
+    result = app.test_cli_runner().invoke(args=["convert-file", str(input_path), str(output_path)])
+
+    assert result.exit_code == 0, result.output
+    assert output_path.read_text().splitlines()[1] == "0,USD,TRY,3.0,35.0,105.0,"
+
+
+def test_convert_rounds_to_minor_units(client, monkeypatch):
+    """
+    Sonuç hedef para biriminin kuruş hanesine yuvarlanmalı.
+    The result must be rounded to the target currency's minor unit.
+    """
+    import app as app_module
+
+    monkeypatch.setattr(app_module, "fetch_rates", lambda base_currency: {
+        "base": "USD", "date": "2024-12-02", "rates": {"JPY": 151.236, "TRY": 35.125}
+    })
+
+    response = client.get("/api/convert?from_currency=USD&to_currency=JPY&amount=1")
+    assert response.get_json()["result"] == 151.0
+
+    response = client.get("/api/convert?from_currency=USD&to_currency=TRY&amount=1&rounding=half_up")
+    assert response.get_json()["result"] == 35.13
+
+    response = client.get("/api/convert?from_currency=USD&to_currency=TRY&amount=1&rounding=half_even")
+    assert response.get_json()["result"] == 35.12
+    assert response.get_json()["rounding"] == "half_even"
+
+    response = client.get("/api/convert?from_currency=USD&to_currency=TRY&amount=1&rounding=sideways")
+    assert response.status_code == 400
+
+
+def test_conditional_get(client, store, monkeypatch):
+    """
+    Veri değişmediyse tekrar eden istekler 304 almalı.
+    Repeat requests must get 304 while the data is unchanged.
+    """
+    import app as app_module
+
+    snapshot = {"base": "USD", "date": "2024-12-02", "rates": {"EUR": 0.9, "TRY": 35.0}}
+    monkeypatch.setattr(app_module, "fetch_rates", lambda base_currency: snapshot)
+    monkeypatch.setattr(app_module, "fetch_historical_range", lambda base_currency, quote_currency, start_date, end_date: {
+        end_date.isoformat(): 35.0
+    })
+
+    for url in ["/api/rates/USD", "/api/currencies", "/api/popular-pairs", "/api/history/USD/TRY?days=7"]:
+        first = client.get(url)
+        assert first.status_code == 200
+        assert first.headers["ETag"]
+        assert "max-age" in first.headers["Cache-Control"]
+
+        second = client.get(url, headers={"If-None-Match": first.headers["ETag"]})
+        assert second.status_code == 304
+        assert second.data == b""
+
+    # Yeni kurlar yeni bir ETag verir / New rates give a new ETag
+    etag = client.get("/api/rates/USD").headers["ETag"]
+    snapshot = {"base": "USD", "date": "2024-12-03", "rates": {"EUR": 0.91, "TRY": 35.5}}
+    app_module.rate_cache.clear()
+
+    response = client.get("/api/rates/USD", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.get_json()["rates"]["TRY"] == 35.5
+
+
+def test_fetch_rates_rejects_partial_provider(monkeypatch):
+    """
+    Desteklenen kodların bir kısmını vermeyen kaynak (örn. ECB'de SAR yok) kullanılmamalı.
+    A provider missing some supported codes (e.g. ECB has no SAR) must not be used.
+    """
+    import requests
+    import app as app_module
+    import providers
+
+    full = {code: 1.0 for code in app_module.CURRENCIES}
+    subset = {code: 1.0 for code in app_module.CURRENCIES if code not in ("SAR", "AED", "RUB")}
+
+    failing = providers.FakeProvider("primary", error=requests.ConnectionError("down"))
+    fallback = providers.FakeProvider("fallback", rates=subset)
+    monkeypatch.setattr(app_module, "rate_providers", providers.ProviderPool(
+        [failing, fallback], "latest", validate=app_module.require_all_currencies
+    ))
+    assert app_module.fetch_rates("USD") is None
+    assert "SAR" in app_module.rate_providers.stats["fallback"].last_error
+
+    complete = providers.FakeProvider("complete", rates=full)
+    monkeypatch.setattr(app_module, "rate_providers", providers.ProviderPool(
+        [failing, fallback, complete], "latest", validate=app_module.require_all_currencies
+    ))
+    assert set(app_module.fetch_rates("USD")["rates"]) == set(app_module.CURRENCIES)
+
+
+def test_stream_rates(client, monkeypatch):
+    """
+    Canlı akış bağlanınca tüm kurları, sonra değişiklikleri göndermeli.
+    The live stream must send all rates on connect, then the changes.
+    """
+    import app as app_module
+    from cross_rates import RateMatrix
+
+    import broadcast
+
+    monkeypatch.setattr(app_module, "start_background_tasks", lambda: None)
+    monkeypatch.setattr(app_module, "wsgi_streams", broadcast.StreamSlots(1))
+    monkeypatch.setattr(app_module, "fetch_rates", lambda base_currency: {
+        "base": "USD", "date": "2024-12-02", "rates": {"EUR": 0.9, "TRY": 35.0}
+    })
+
+    response = client.get("/api/stream/rates?base=EUR", buffered=False)
+    assert response.mimetype == "text/event-stream"
+
+    chunks = response.response
+    assert next(chunks).startswith(b"retry:")
+    assert b"event: snapshot" in next(chunks)
+
+    # Yeni kur verisi önbelleğe yazılınca yayınlanır / A new snapshot is published when cached
+    app_module.rate_cache.put(app_module.ANCHOR_CURRENCY, RateMatrix.from_snapshot(
+        {"base": "USD", "date": "2024-12-02", "rates": {"EUR": 0.9, "TRY": 36.0}}, app_module.CURRENCIES
+    ))
+    event = next(chunks)
+    assert b"event: rates" in event
+    assert b'"rates":{"TRY":40.0}' in event
+
+    response.close()
+    assert client.get("/api/stream/rates?base=XXX").status_code == 404
+
+
+def test_stream_rates_wsgi_limit(client, monkeypatch):
+    """
+    WSGI modunda akış sınırı dolunca 503 dönmeli ve sayfaya yoklama önerilmeli.
+    In WSGI mode a full stream limit must return 503 and point the page to polling.
+    """
+    import app as app_module
+    import broadcast
+
+    monkeypatch.setattr(app_module, "start_background_tasks", lambda: None)
+    monkeypatch.setattr(app_module, "fetch_rates", lambda base_currency: {
+        "base": "USD", "date": "2024-12-02", "rates": {"EUR": 0.9, "TRY": 35.0}
+    })
+
+    # Varsayılan: WSGI modunda akış yok / Default: no streams in WSGI mode
+    monkeypatch.setitem(app_module.app.config, "ASYNC_STREAMS", False)
+    monkeypatch.setattr(app_module, "wsgi_streams", broadcast.StreamSlots(0))
+    status = client.get("/api/stream/status").get_json()
+    assert status["available"] is False
+    assert status["poll_interval"] == app_module.LIVE_POLL_INTERVAL
+
+    response = client.get("/api/stream/rates?base=TRY")
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == str(app_module.LIVE_POLL_INTERVAL)
+    assert response.get_json()["poll"] == "/api/rates/TRY"
+
+    # Tek yer: açık akış kapanınca yer boşalmalı / One slot: freed when the open stream closes
+    monkeypatch.setattr(app_module, "wsgi_streams", broadcast.StreamSlots(1))
+    response = client.get("/api/stream/rates", buffered=False)
+    assert response.status_code == 200
+    assert client.get("/api/stream/status").get_json()["available"] is False
+    assert client.get("/api/stream/rates").status_code == 503
+
+    response.close()
+    assert client.get("/api/stream/status").get_json()["available"] is True
+
+    # ASGI modunda akış her zaman açılabilir / Streams are always available in ASGI mode
+    monkeypatch.setitem(app_module.app.config, "ASYNC_STREAMS", True)
+    monkeypatch.setattr(app_module, "wsgi_streams", broadcast.StreamSlots(0))
+    assert client.get("/api/stream/status").get_json()["available"] is True
+
+
+def test_popular_pairs_change_24h(client, store, monkeypatch):
+    """
+    24 saatlik değişim yerel veriden (önce bellek, sonra depo) hesaplanmalı.
+    The 24h change must come from local data (memory first, then the store).
+    """
+    import time
+    from datetime import datetime, timedelta
+    import pytest
+    import app as app_module
+    from cross_rates import RateMatrix
+
+    monkeypatch.setattr(app_module, "fetch_rates", lambda base_currency: {
+        "base": "USD", "date": "2024-12-02", "rates": {"EUR": 0.9, "TRY": 35.0}
+    })
+
+    # Dünkü kur depoda / Yesterday's fixing is in the store
+    yesterday = datetime.fromtimestamp(time.time()).date() - timedelta(days=1)
+    store.save_rates("USD", "TRY", {yesterday.isoformat(): 28.0})
+    store.mark_covered("USD", "TRY", yesterday, yesterday)
+
+    pairs = {(item["base"], item["quote"]): item for item in client.get("/api/popular-pairs").get_json()}
+    assert pairs[("USD", "TRY")]["change_24h"] == 25.0
+    assert pairs[("EUR", "TRY")]["change_24h"] is None
+
+    # Bellekteki bir gün önceki veri önceliklidir / A day-old snapshot in memory comes first
+    app_module.snapshot_ring.add(RateMatrix.from_snapshot(
+        {"base": "USD", "date": "2024-12-01", "rates": {"EUR": 1.0, "TRY": 31.5}, "time_last_updated": time.time() - 90000},
+        app_module.CURRENCIES,
+    ))
+
+    pairs = {(item["base"], item["quote"]): item for item in client.get("/api/popular-pairs").get_json()}
+    assert pairs[("USD", "TRY")]["change_24h"] == pytest.approx(11.1111, abs=1e-4)
+    assert pairs[("EUR", "TRY")]["change_24h"] == pytest.approx(23.4568, abs=1e-4)
+
+
+def test_analytics_cached(client, store, monkeypatch):
+    """
+    Analiz sonucu (çift, pencere) başına bir kez hesaplanmalı.
+    Analytics must be computed once per (pair, window).
+    """
+    from datetime import datetime, timedelta
+    import app as app_module
+
+    calls = []
+
+    def fake_fetch(base_currency, quote_currency, start_date, end_date):
+        calls.append((start_date, end_date))
+        result = {}
+        for offset in range(5):
+            day = end_date - timedelta(days=offset)
+            result[day.isoformat()] = 30.0 + offset
+        return result
+
+    monkeypatch.setattr(app_module, "USE_REAL_HISTORICAL_DATA", True)
+    monkeypatch.setattr(app_module, "fetch_historical_range", fake_fetch)
+
+    first = client.get("/api/analytics/USD/TRY?days=7&window=2")
+    second = client.get("/api/analytics/USD/TRY?days=7&window=2")
+
+    assert first.status_code == 200
+    data = first.get_json()
+    assert data["summary"]["max"]["rate"] == 34.0
+    assert data["summary"]["last"]["date"] == datetime.now().date().isoformat()
+    assert len(data["rolling_mean"]) == len(data["dates"]) == 5
+    assert second.get_json() == data
+    assert len(calls) == 1
+
+    assert client.get("/api/analytics/USD/TRY?days=7&window=30").status_code == 400
+
+
+def test_history_columnar_format(client, store, monkeypatch):
+    """
+    format=columnar başlangıç + adım + kur dizisi döndürmeli (eksik günler null).
+    format=columnar must return start + step + a rate array (missing days null).
+    """
+    from datetime import datetime, timedelta
+    import gzip
+    import app as app_module
+
+    today = datetime.now().date()
+
+    def fake_fetch(base_currency, quote_currency, start_date, end_date):
+        return {(today - timedelta(days=3)).isoformat(): 34.0, today.isoformat(): 35.0}
+
+    monkeypatch.setattr(app_module, "USE_REAL_HISTORICAL_DATA", True)
+    monkeypatch.setattr(app_module, "fetch_historical_range", fake_fetch)
+
+    data = client.get("/api/history/USD/TRY?days=7&format=columnar").get_json()
+    assert data["start"] == (today - timedelta(days=3)).isoformat()
+    assert data["step"] == 1
+    assert data["rates"] == [34.0, None, None, 35.0]
+    assert "data" not in data
+
+    assert client.get("/api/history/USD/TRY?days=7&format=xml").status_code == 400
+
+    # Büyük yanıtlar sıkıştırılır / Large responses are compressed
+    def full_fetch(base_currency, quote_currency, start_date, end_date):
+        days = (end_date - start_date).days + 1
+        return {(start_date + timedelta(days=offset)).isoformat(): 35.0 for offset in range(days)}
+
+    monkeypatch.setattr(app_module, "fetch_historical_range", full_fetch)
+    plain = client.get("/api/history/USD/TRY?days=365")
+    response = client.get("/api/history/USD/TRY?days=365", headers={"Accept-Encoding": "gzip"})
+
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert gzip.decompress(response.data) == plain.data
+    assert len(response.data) < len(plain.data) / 5
+
+
+def test_rates_body_encoded_once(client, monkeypatch):
+    """
+    /api/rates gövdesi kur verisi başına bir kez yazılmalı.
+    The /api/rates body must be encoded once per rate snapshot.
+    """
+    import app as app_module
+
+    snapshot = {"base": "USD", "date": "2024-12-02", "rates": {"EUR": 0.9, "TRY": 35.0}}
+    monkeypatch.setattr(app_module, "fetch_rates", lambda base_currency: snapshot)
+
+    calls = []
+    dump_bytes = app_module.app.json.dump_bytes
+
+    def counting_dump(obj, indent=False):
+        calls.append(obj)
+        return dump_bytes(obj, indent)
+
+    monkeypatch.setattr(app_module.app.json, "dump_bytes", counting_dump)
+
+    first = client.get("/api/rates/USD")
+    second = client.get("/api/rates/USD")
+    assert first.data == second.data
+    assert first.get_json()["rates"]["TRY"] == 35.0
+    assert len(calls) == 1
+
+    # Başka bir temel birim ayrı yazılır / Another base is encoded separately
+    assert client.get("/api/rates/EUR").get_json()["base"] == "EUR"
+    assert len(calls) == 2
+
+
+def test_static_assets(client):
+    """
+    Sayfa içerik özetli JS / CSS adreslerini kullanmalı; bunlar uzun süre önbelleğe alınmalı.
+    The page must use content-hashed JS / CSS URLs, which are cached for a long time.
+    """
+    import re
+
+    page = client.get("/")
+    assert page.status_code == 200
+    assert "no-cache" in page.headers["Cache-Control"]
+
+    html = page.get_data(as_text=True)
+    js_url = re.search(r'src="(/js/app\.[0-9a-f]+\.js)"', html).group(1)
+    css_url = re.search(r'href="(/css/style\.[0-9a-f]+\.css)"', html).group(1)
+
+    for url in [js_url, css_url]:
+        response = client.get(url)
+        assert response.status_code == 200
+        assert "immutable" in response.headers["Cache-Control"]
+
+    # Eski adresler aynı içeriği verir / The plain URLs serve the same content
+    assert client.get("/js/app.js").data == client.get(js_url).data
+    assert client.get("/css/style.css").mimetype == "text/css"
+    assert client.get("/js/missing.js").status_code == 404
+
+    # Önceden sıkıştırılmış hal / Precompressed form
+    response = client.get(js_url, headers={"Accept-Encoding": "gzip"})
+    assert response.headers["Content-Encoding"] == "gzip"
+
+    # Sabit JSON yanıtları hazır baytlardan döner / Fixed JSON responses come from prebuilt bytes
+    first = client.get("/api/currencies")
+    assert first.get_json()["total"] > 0
+    second = client.get("/api/currencies", headers={"If-None-Match": first.headers["ETag"]})
+    assert second.status_code == 304
+
+
+def test_fixing_date_offline(client, store, monkeypatch):
+    """
+    Hafta sonu ve tatiller internete çıkmadan önceki iş gününe çevrilmeli.
+    Weekends and holidays must resolve to the previous business day offline.
+    """
+    import app as app_module
+
+    calls = []
+
+    def fake_fetch(base_currency, date_text):
+        calls.append(date_text)
+        return {"date": date_text, "rates": {"TRY": 34.6}}
+
+    monkeypatch.setattr(app_module, "fetch_rates_on_date", fake_fetch)
+
+    data = client.get("/api/fixing-date/2024-12-01").get_json()
+    assert data == {"date": "2024-12-01", "fixing_date": "2024-11-29", "is_business_day": False}
+    assert client.get("/api/fixing-date/2024-12-26").get_json()["fixing_date"] == "2024-12-24"
+    assert client.get("/api/fixing-date/yesterday").status_code == 400
+
+    # Cumartesi ve pazar aynı cuma kurunu paylaşır / Saturday and Sunday share Friday's fixing
+    saturday = client.get("/api/rate-on-date/USD/TRY/2023-06-10").get_json()
+    sunday = client.get("/api/rate-on-date/USD/TRY/2023-06-11").get_json()
+    assert saturday["fixing_date"] == sunday["fixing_date"] == "2023-06-09"
+    assert sunday["rate"] == 34.6
+    assert calls == ["2023-06-09"]
+
+
+def test_history_fill_locf(client, store, monkeypatch):
+    """
+    fill=locf eksik günleri önceki kurla doldurmalı.
+    fill=locf must fill missing days with the previous rate.
+    """
+    from datetime import date, timedelta
+    import app as app_module
+
+    today = date.today()
+    day_1 = (today - timedelta(days=3)).isoformat()
+    day_2 = (today - timedelta(days=1)).isoformat()
+
+    monkeypatch.setattr(app_module, "fetch_historical_range", lambda base_currency, quote_currency, start_date, end_date: {
+        day_1: 34.0,
+        day_2: 35.0,
+    })
+
+    plain = client.get("/api/history/USD/TRY?days=7").get_json()
+    assert [item["date"] for item in plain["data"]] == [day_1, day_2]
+
+    filled = client.get("/api/history/USD/TRY?days=7&fill=locf").get_json()
+    assert filled["fill"] == "locf"
+    assert [item["rate"] for item in filled["data"]] == [34.0, 34.0, 35.0, 35.0]
+    assert filled["data"][1]["fixing_date"] == day_1
+    assert "fixing_date" not in filled["data"][2]
+
+    assert client.get("/api/history/USD/TRY?days=7&fill=zero").status_code == 400
+
+
+def test_import_ecb_command(app, store, monkeypatch, tmp_path):
+    """
+    import-ecb komutu arşivi yüklemeli; geçmiş veri sonra internete çıkmadan dönmeli.
+    The import-ecb command must load the archive; history is then served offline.
+    """
+    from datetime import date, timedelta
+    import app as app_module
+
+    def no_network(*args):
+        raise AssertionError("network call")
+
+    monkeypatch.setattr(app_module, "fetch_historical_range", no_network)
+
+    # Son 10 günün arşivi (en yeni başta) / Archive of the last 10 days (newest first)
+    lines = ["Date,USD,TRY,"]
+    for offset in range(0, 11):
+        day = date.today() - timedelta(days=offset)
+        lines.append(day.isoformat() + ",1.05," + str(36 + offset / 10) + ",")
+    archive_path = tmp_path / "eurofxref-hist.csv"
+    archive_path.write_text("\n".join(lines) + "\n")
+
+    result = app.test_cli_runner().invoke(args=["import-ecb", str(archive_path)])
+    assert result.exit_code == 0, result.output
+    assert "11" in result.output
+
+    response = app.test_client().get("/api/history/USD/TRY?days=7")
+    assert response.status_code == 200
+    assert len(response.get_json()["data"]) == 8
+
+
+def test_warm_start(app, monkeypatch, tmp_path):
+    """
+    Kaydedilen kur verisi yeniden başlatmada internete çıkmadan yüklenmeli.
+    Saved rate snapshots must be reloaded on restart without a network call.
+    """
+    import time
+    import app as app_module
+    from shared_cache import SharedSnapshotFile
+
+    monkeypatch.setattr(app_module, "warm_state", SharedSnapshotFile(tmp_path / "warm_state.json"))
+    monkeypatch.setattr(app_module, "fetch_rates", lambda base_currency: {
+        "base": "USD", "date": "2024-12-02", "rates": {"EUR": 0.9, "TRY": 35.0}
+    })
+
+    matrix = app_module.get_rate_matrix()
+    assert app_module.save_warm_state()
+
+    # Yeniden başlatma / Restart
+    app_module.rate_cache.clear()
+    app_module.snapshot_ring.clear()
+    monkeypatch.setattr(app_module, "fetch_rates", lambda base_currency: None)
+
+    loaded = app_module.load_warm_state()
+    assert loaded.version == matrix.version
+    assert app_module.rate_cache.peek("USD") is loaded
+    assert len(app_module.snapshot_ring) == 1
+    assert app.test_client().get("/api/rates/USD").get_json()["rates"]["TRY"] == 35.0
+
+    # Taze veri ilk yenilemeyi erteler / Fresh data postpones the first refresh
+    assert app_module.first_refresh_delay() > app_module.RATE_REFRESH_INTERVAL * 0.9
+
+    # Eski dosya kullanılmaz / An old file is ignored
+    app_module.rate_cache.clear()
+    monkeypatch.setattr(app_module.time, "time", lambda: matrix.created_at + app_module.WARM_STATE_MAX_AGE + 60)
+    assert app_module.load_warm_state() is None
+    assert app_module.rate_cache.peek("USD") is None
+
+
+def test_history_provider_failover(app, store, monkeypatch):
+    """
+    Geçmiş kaynaklarından biri düşünce sıradaki kullanılmalı; hepsi düşünce sahte veri değil 503 dönmeli.
+    When a historical provider is down the next one must be used; with all down a 503, not fake data.
+    """
+    from datetime import date, timedelta
+    import requests
+    import app as app_module
+    from providers import FakeProvider, ProviderPool
+
+    day_text = (date.today() - timedelta(days=3)).isoformat()
+    broken = FakeProvider("broken", error=requests.ConnectionError("down"))
+    backup = FakeProvider("backup", history={day_text: {"TRY": 35.0}})
+
+    monkeypatch.setattr(app_module, "USE_REAL_HISTORICAL_DATA", True)
+    monkeypatch.setattr(app_module, "series_providers", ProviderPool([broken, backup], "series"))
+
+    response = app.test_client().get("/api/history/USD/TRY?days=7")
+    assert response.status_code == 200
+    assert response.get_json()["data"] == [{"date": day_text, "rate": 35.0}]
+
+    stats = app.test_client().get("/api/providers").get_json()["history"]
+    assert [item["name"] for item in stats] == ["broken", "backup"]
+    assert stats[0]["errors"] == 1
+    assert stats[1]["successes"] == 1
+
+    # Yeni bir aralık, tüm kaynaklar kapalı / A new range with every provider down
+    monkeypatch.setattr(app_module, "series_providers", ProviderPool([broken], "series"))
+    response = app.test_client().get("/api/history/USD/TRY?days=30")
+    assert response.status_code == 503
+    assert "Retry-After" in response.headers
+    assert "data" not in response.get_json()
+
+    response = app.test_client().get("/api/history/USD?quotes=TRY,EUR&days=30")
+    assert response.status_code == 503
@@ -0,0 +1,147 @@
+"""
+KurTakip - ASGI Testleri / ASGI Tests
+Uygulamanın ASGI sunucusunda çalıştığını test eder.
+Tests that the application runs on an ASGI server.
+"""
+
+import asyncio
+import json
+
+from asgi import AsgiRouter, application
+
+
+def call_asgi(app, method, path, query=b"", body=b"", headers=None):
+    """
+    ASGI uygulamasını sahte bir sunucu gibi çağırır.
+    Calls an ASGI application like a fake server would.
+
+    Döndürür / Returns:
+        (durum kodu / status, başlıklar / headers, gövde / body)
+    """
+    scope = {
+        "type": "http",
+        "method": method,
+        "path": path,
+        "query_string": query,
+        "headers": headers or [],
+        "http_version": "1.1",
+        "scheme": "http",
+        "server": ("testserver", 80),
+        "client": ("127.0.0.1", 1234),
+    }
+    incoming = [{"type": "http.request", "body": body, "more_body": False}]
+    sent = []
+
+    async def receive():
+        return incoming.pop(0)
+
+    async def send(message):
+        sent.append(message)
+
+    asyncio.run(app(scope, receive, send))
+
+    start = sent[0]
+    body_bytes = b"".join(message.get("body", b"") for message in sent[1:])
+    return start["status"], dict(start["headers"]), body_bytes
+
+
+def test_asgi_api_info():
+    """
+    /api adresi ASGI üzerinden çalışmalı.
+    The /api endpoint must work over ASGI.
+    """
+    status, headers, body = call_asgi(application, "GET", "/api")
+
+    assert status == 200
+    assert headers[b"content-type"] == b"application/json"
+    assert "version" in json.loads(body)
+
+
+def test_asgi_request_body_and_streaming():
+    """
+    İstek gövdesi okunmalı, akış yanıtları parça parça gönderilmeli.
+    The request body must be readable and streamed responses sent in chunks.
+    """
+
+    def echo_app(environ, start_response):
+        data = environ["wsgi.input"].read()
+        start_response("201 Created", [("Content-Type", "text/plain")])
+        return iter([b"got:", data])
+
+    status, headers, body = call_asgi(AsgiRouter(echo_app, threads=2), "POST", "/echo", body=b"hello")
+
+    assert status == 201
+    assert body == b"got:hello"
+
+
+def test_asgi_lifespan_runs_startup():
+    """
+    Sunucu başlarken başlatma fonksiyonları bir kez çağrılmalı.
+    The startup functions must be called once when the server starts.
+    """
+    started = []
+    router = AsgiRouter(lambda environ, start_response: [], on_startup=[lambda: started.append(True)])
+    incoming = [{"type": "lifespan.startup"}, {"type": "lifespan.shutdown"}]
+    sent = []
+
+    async def receive():
+        return incoming.pop(0)
+
+    async def send(message):
+        sent.append(message["type"])
+
+    asyncio.run(router({"type": "lifespan"}, receive, send))
+
+    assert started == [True]
+    assert sent == ["lifespan.startup.complete", "lifespan.shutdown.complete"]
+
+
+def test_asgi_stream_rates(app, monkeypatch):
+    """
+    Canlı akış olay döngüsünde çalışmalı ve kopunca aboneliği bırakmalı.
+    The live stream must run on the event loop and unsubscribe on disconnect.
+    """
+    import app as app_module
+    import asgi as asgi_module
+    from cross_rates import RateMatrix
+
+    monkeypatch.setattr(asgi_module, "start_background_tasks", lambda: None)
+    monkeypatch.setattr(app_module, "fetch_rates", lambda base_currency: {
+        "base": "USD", "date": "2024-12-02", "rates": {"EUR": 0.9, "TRY": 35.0}
+    })
+
+    scope = {"type": "http", "method": "GET", "path": "/api/stream/rates", "query_string": b"base=USD", "headers": []}
+    sent = []
+
+    async def run():
+        disconnect = asyncio.Event()
+        incoming = [{"type": "http.request", "body": b"", "more_body": False}]
+
+        async def receive():
+            if incoming:
+                return incoming.pop(0)
+            await disconnect.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            sent.append(message)
+
+        task = asyncio.ensure_future(application(scope, receive, send))
+        while len(sent) < 3:
+            await asyncio.sleep(0.01)
+
+        app_module.rate_cache.put(app_module.ANCHOR_CURRENCY, RateMatrix.from_snapshot(
+            {"base": "USD", "date": "2024-12-02", "rates": {"EUR": 0.9, "TRY": 36.0}}, app_module.CURRENCIES
+        ))
+        while len(sent) < 4:
+            await asyncio.sleep(0.01)
+
+        disconnect.set()
+        await asyncio.wait_for(task, 1)
+
+    asyncio.run(run())
+
+    assert sent[0]["status"] == 200
+    assert b"event: snapshot" in sent[2]["body"]
+    assert b'"rates":{"TRY":36.0}' in sent[3]["body"]
+    assert app_module.rate_broadcaster.subscriber_count() == 0
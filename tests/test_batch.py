@@ -0,0 +1,81 @@
+"""
+KurTakip - Toplu Dönüşüm Testleri / Batch Conversion Tests
+Gövde okuma ve gruplu dönüşümü test eder.
+Tests body parsing and grouped conversion.
+"""
+
+import pytest
+
+from batch import convert_rows, detect_format, parse_rows
+from cross_rates import RateMatrix
+
+
+MATRIX = RateMatrix("USD EUR TRY".split(), "USD", {"EUR": 0.5, "TRY": 35.0})
+
+
+def is_valid(code):
+    return code in ("USD", "EUR", "TRY")
+
+
+def test_detect_format():
+    assert detect_format("application/json; charset=utf-8") == "json"
+    assert detect_format("text/csv") == "csv"
+    assert detect_format("application/x-ndjson") == "ndjson"
+    assert detect_format("text/plain") is None
+
+
+def test_parse_csv_and_ndjson():
+    """
+    CSV ve NDJSON gövdeleri aynı satırları üretmeli.
+    CSV and NDJSON bodies must yield the same rows.
+    """
+    csv_rows = parse_rows("from,to,amount\nUSD,TRY,10\n", "csv")
+    ndjson_rows = parse_rows('{"from": "USD", "to": "TRY", "amount": "10"}\n\n', "ndjson")
+
+    assert csv_rows == ndjson_rows == [{"from": "USD", "to": "TRY", "amount": "10"}]
+
+    with pytest.raises(ValueError):
+        parse_rows('{"from": "USD"}', "json")
+
+
+def test_convert_rows_keeps_order_and_marks_errors():
+    """
+    Sonuçlar gelen sırayla dönmeli; hatalı satırlar işaretlenmeli.
+    Results keep the input order and bad rows are marked.
+    """
+    rows = [
+        {"from": "EUR", "to": "TRY", "amount": 2},
+        {"from": "USD", "to": "XXX", "amount": 1},
+        {"from_currency": "usd", "to_currency": "eur", "amount": 4},
+        {"from": "USD", "to": "TRY", "amount": -1},
+    ]
+
+    results = convert_rows(rows, MATRIX, is_valid)
+
+    assert results[0]["result"] == pytest.approx(140.0)
+    assert results[1] == {"row": 1, "error": "Geçersiz para birimi / Invalid currency"}
+    assert results[2]["from"] == "USD"
+    assert results[2]["result"] == pytest.approx(2.0)
+    assert "error" in results[3]
+
+
+def test_batch_amount_read_from_text():
+    """
+    Toplu dönüşüm miktarı float'a çevirmeden okumalı (/api/convert ile aynı sonuç).
+    Batch conversion must read the amount without a float round trip (same result as /api/convert).
+    """
+    import money
+
+    rows = [
+        {"from": "USD", "to": "EUR", "amount": "2.00999999999999999"},
+        {"from": "USD", "to": "TRY", "amount": "1e400"},
+        {"from": "USD", "to": "TRY", "amount": True},
+    ]
+
+    results = convert_rows(rows, MATRIX, is_valid)
+
+    # float("2.00999999999999999") == 2.01 -> 1.01 olurdu / would give 1.01
+    assert results[0]["result"] == money.convert_amount("2.00999999999999999", 0.5, "EUR")
+    assert results[0]["result"] == 1.0
+    assert "error" in results[1]
+    assert "error" in results[2]
@@ -0,0 +1,120 @@
+"""
+KurTakip - Canlı Yayın Testleri / Live Broadcast Tests
+"""
+
+import json
+
+from broadcast import RateBroadcaster, StreamSlots, Subscription, iter_events
+from cross_rates import RateMatrix
+
+CODES = ["USD", "EUR", "TRY"]
+
+
+def make_matrix(eur, try_rate, date="2024-12-02"):
+    return RateMatrix.from_snapshot({"base": "USD", "date": date, "rates": {"EUR": eur, "TRY": try_rate}}, CODES)
+
+
+def parse_event(chunk):
+    """
+    SSE olayını (ad, veri) ikilisine çevirir.
+    Parses an SSE event into an (event, data) pair.
+    """
+    fields = {}
+    for line in chunk.decode("utf-8").strip().split("\n"):
+        name, _, value = line.partition(": ")
+        fields[name] = value
+    return fields["event"], json.loads(fields["data"])
+
+
+def test_diff_contains_only_changes():
+    """
+    Güncelleme sadece değişen kurları taşımalı.
+    An update must carry only the rates that changed.
+    """
+    broadcaster = RateBroadcaster()
+    subscription = Subscription()
+    broadcaster.subscribe(subscription.deliver)
+
+    broadcaster.publish(make_matrix(0.9, 35.0))
+    broadcaster.publish(make_matrix(0.9, 35.5))
+
+    first, _ = subscription.next(1)
+    second, _ = subscription.next(1)
+
+    assert parse_event(first.diff_event("USD")) == ("snapshot", {
+        "base": "USD", "date": "2024-12-02", "rates": {"USD": 1.0, "EUR": 0.9, "TRY": 35.0}
+    })
+    assert parse_event(second.diff_event("USD"))[1]["rates"] == {"TRY": 35.5}
+    assert set(parse_event(second.diff_event("EUR"))[1]["rates"]) == {"TRY"}
+
+    # Olay bir kez oluşturulur ve paylaşılır / The event is built once and shared
+    assert second.diff_event("USD") is second.diff_event("USD")
+
+
+def test_same_version_is_not_published():
+    """
+    Aynı kur verisi tekrar yayınlanmamalı.
+    The same snapshot must not be published twice.
+    """
+    broadcaster = RateBroadcaster()
+    subscription = Subscription()
+    broadcaster.subscribe(subscription.deliver)
+
+    broadcaster.publish(make_matrix(0.9, 35.0))
+    broadcaster.publish(make_matrix(0.9, 35.0))
+
+    assert subscription.next(0.01) is not None
+    assert subscription.next(0.01) is None
+
+
+def test_slow_subscriber_gets_full_snapshot():
+    """
+    Yetişemeyen abone tam veriye geçmeli.
+    A subscriber that falls behind must be resynced with a full snapshot.
+    """
+    subscription = Subscription(maxsize=1)
+    subscription.deliver("old")
+    subscription.deliver("new")
+
+    assert subscription.next(0.01) == ("new", True)
+
+
+def test_iter_events():
+    """
+    Akış önce tüm kurları, sonra değişiklikleri göndermeli.
+    The stream must send all rates first, then the changes.
+    """
+    broadcaster = RateBroadcaster()
+    broadcaster.publish(make_matrix(0.9, 35.0))
+
+    events = iter_events(broadcaster, "USD", heartbeat=0.01)
+    assert next(events).startswith(b"retry:")
+    assert parse_event(next(events))[0] == "snapshot"
+    assert next(events) == b": ping\n\n"
+
+    broadcaster.publish(make_matrix(0.9, 36.0))
+    assert parse_event(next(events)) == ("rates", {"base": "USD", "date": "2024-12-02", "rates": {"TRY": 36.0}})
+
+    events.close()
+    assert broadcaster.subscriber_count() == 0
+
+
+def test_stream_slots():
+    """
+    Akış sınırı aşılmamalı; bırakılan yer yeniden kullanılabilmeli.
+    The stream limit must hold and a released slot must be reusable.
+    """
+    slots = StreamSlots(2)
+    assert slots.acquire() and slots.acquire()
+    assert not slots.acquire()
+    assert not slots.available()
+
+    slots.release()
+    assert slots.available()
+    assert slots.acquire()
+
+    closed = StreamSlots(0)
+    assert not closed.available()
+    assert not closed.acquire()
+    closed.release()
+    assert not closed.available()
@@ -0,0 +1,88 @@
+"""
+KurTakip - İş Günü Takvimi Testleri / Business-Day Calendar Tests
+"""
+
+from datetime import date
+
+import pytest
+
+import business_days
+
+
+def test_easter_sunday():
+    """
+    Paskalya tarihleri bilinen değerlerle eşleşmeli.
+    Easter dates must match known values.
+    """
+    assert business_days.easter_sunday(2000) == date(2000, 4, 23)
+    assert business_days.easter_sunday(2024) == date(2024, 3, 31)
+    assert business_days.easter_sunday(2025) == date(2025, 4, 20)
+    assert business_days.easter_sunday(2038) == date(2038, 4, 25)
+
+
+def test_target_holidays():
+    """
+    TARGET tatilleri ve hafta sonları iş günü sayılmamalı.
+    TARGET holidays and weekends must not count as business days.
+    """
+    assert business_days.target_holidays(2024) == {
+        date(2024, 1, 1), date(2024, 3, 29), date(2024, 4, 1),
+        date(2024, 5, 1), date(2024, 12, 25), date(2024, 12, 26),
+    }
+    assert business_days.is_business_day(date(2024, 12, 2))
+    assert not business_days.is_business_day(date(2024, 12, 1))
+    assert not business_days.is_business_day(date(2024, 3, 29))
+
+
+def test_fixing_date():
+    """
+    Geçerli kur günü o gün ya da önceki son iş günü olmalı.
+    The fixing date must be the day itself or the last business day before it.
+    """
+    assert business_days.fixing_date(date(2024, 12, 2)) == date(2024, 12, 2)
+    assert business_days.fixing_date(date(2024, 12, 1)) == date(2024, 11, 29)
+    assert business_days.fixing_date(date(2024, 4, 1)) == date(2024, 3, 28)
+
+    # Yıl sınırı / Year boundary
+    assert business_days.fixing_date(date(2022, 1, 1)) == date(2021, 12, 31)
+    assert business_days.fixing_date(date(2023, 1, 1)) == date(2022, 12, 30)
+
+    # İlk ECB kurundan önce geçerli kur yoktur / No fixing applies before the first ECB rate
+    assert business_days.fixing_date(date(1999, 1, 4)) == date(1999, 1, 4)
+    with pytest.raises(ValueError):
+        business_days.fixing_date(date(1999, 1, 3))
+    with pytest.raises(ValueError):
+        business_days.fixing_date(date(1, 1, 1))
+    assert not business_days.has_business_day(date(1, 1, 1), date(1999, 1, 1))
+
+
+def test_business_days_between():
+    """
+    Aralıktaki iş günleri (yıl sınırı dahil) doğru sayılmalı.
+    Business days in a range (across a year boundary) must be counted correctly.
+    """
+    days = business_days.business_days_between(date(2024, 12, 23), date(2025, 1, 3))
+    assert days == [
+        date(2024, 12, 23), date(2024, 12, 24), date(2024, 12, 27),
+        date(2024, 12, 30), date(2024, 12, 31), date(2025, 1, 2), date(2025, 1, 3),
+    ]
+    assert business_days.has_business_day(date(2024, 11, 30), date(2024, 12, 2))
+    assert not business_days.has_business_day(date(2024, 11, 30), date(2024, 12, 1))
+    assert not business_days.has_business_day(date(2024, 12, 25), date(2024, 12, 26))
+
+
+def test_fill_forward():
+    """
+    Eksik günler önceki kurla doldurulmalı.
+    Missing days must carry the previous rate.
+    """
+    points = [{"date": "2024-11-29", "rate": 34.6}, {"date": "2024-12-02", "rate": 34.8}]
+
+    filled = business_days.fill_forward(points, date(2024, 12, 3))
+    assert [item["date"] for item in filled] == [
+        "2024-11-29", "2024-11-30", "2024-12-01", "2024-12-02", "2024-12-03",
+    ]
+    assert [item["rate"] for item in filled] == [34.6, 34.6, 34.6, 34.8, 34.8]
+    assert filled[1]["fixing_date"] == "2024-11-29"
+    assert "fixing_date" not in filled[3]
+    assert business_days.fill_forward([], date(2024, 12, 3)) == []
@@ -0,0 +1,200 @@
+"""
+KurTakip - Önbellek Testleri / Cache Tests
+Önbellek ve tekil uçuş davranışını test eder.
+Tests the cache and single-flight behaviour.
+"""
+
+import threading
+import time
+
+from cache import SingleFlight, TTLCache, VersionCache
+
+
+def test_fresh_value_is_cached():
+    """
+    Taze değer için yükleyici tekrar çağrılmamalı.
+    The loader must not be called again for a fresh value.
+    """
+    calls = []
+
+    def loader(key):
+        calls.append(key)
+        return {"base": key}
+
+    cache = TTLCache(loader, ttl=60)
+    assert cache.get("USD") == {"base": "USD"}
+    assert cache.get("USD") == {"base": "USD"}
+    assert calls == ["USD"]
+
+
+def test_failed_load_is_not_cached():
+    """
+    None sonucu önbelleğe alınmamalı.
+    A None result must not be cached.
+    """
+    calls = []
+
+    def loader(key):
+        calls.append(key)
+        return None
+
+    cache = TTLCache(loader, ttl=60)
+    assert cache.get("USD") is None
+    assert cache.get("USD") is None
+    assert len(calls) == 2
+
+
+def test_stale_value_served_while_refreshing():
+    """
+    Bayat değer hemen döner, yenisi arka planda yüklenir.
+    A stale value is returned at once and the new one loads in the background.
+    """
+    versions = iter([1, 2])
+    cache = TTLCache(lambda key: next(versions), ttl=0.01, stale_ttl=60)
+
+    assert cache.get("USD") == 1
+    time.sleep(0.02)
+
+    # Bayat değer döner / Stale value is returned
+    assert cache.get("USD") == 1
+
+    # Arka plan yenilemesini bekle / Wait for the background refresh
+    for _ in range(100):
+        if cache.peek("USD") == 2:
+            break
+        time.sleep(0.01)
+    assert cache.peek("USD") == 2
+
+
+def test_put_with_age():
+    """
+    Yaşıyla yazılan değer bayat sayılmalı ve arka planda yenilenmeli.
+    A value stored with an age must count as stale and refresh in the background.
+    """
+    loaded = threading.Event()
+
+    def loader(key):
+        loaded.set()
+        return "new"
+
+    cache = TTLCache(loader=loader, ttl=10, stale_ttl=100)
+    cache.put("USD", "old", age=50)
+
+    assert 50 <= cache.age("USD") < 51
+    assert cache.get("USD") == "old"
+    assert loaded.wait(2)
+    assert cache.age("EUR") is None
+
+    # Çok eski değer hiç sunulmaz / A value that is too old is never served
+    cache.put("EUR", "ancient", age=500)
+    assert cache.get("EUR") == "new"
+
+
+def test_peek_max_age():
+    """
+    peek() sınırdan eski değeri döndürmemeli.
+    peek() must not return a value older than the limit.
+    """
+    cache = TTLCache(loader=lambda key: None, ttl=10)
+    cache.put("USD", "old", age=100)
+
+    assert cache.peek("USD") == "old"
+    assert cache.peek("USD", max_age=200) == "old"
+    assert cache.peek("USD", max_age=50) is None
+    assert cache.peek("EUR", max_age=50) is None
+
+
+def test_maxsize_evicts_expired_then_least_recently_used():
+    """
+    Sınır aşılınca önce süresi dolan, sonra en uzun süredir kullanılmayan kayıt atılmalı.
+    Past the limit expired entries must go first, then the least recently used one.
+    """
+    cache = TTLCache(loader=lambda key: key.lower(), ttl=10, maxsize=3)
+    cache.put("OLD", "old", age=100)
+    cache.put("USD", "usd")
+    cache.put("EUR", "eur")
+
+    # Süresi dolan kayıt, yeni kayıttan önce gider / The expired entry goes before any fresh one
+    cache.put("TRY", "try")
+    assert cache.peek("OLD") is None
+    assert cache.peek("USD") == "usd"
+
+    # USD kullanıldı; en eski kullanılan EUR atılır / USD was used, so EUR is the LRU entry
+    assert cache.get("USD") == "usd"
+    assert cache.get("GBP") == "gbp"
+    assert cache.peek("EUR") is None
+    assert [cache.peek(key) for key in ("TRY", "USD", "GBP")] == ["try", "usd", "gbp"]
+
+
+def test_concurrent_misses_are_coalesced():
+    """
+    Aynı anahtar için eşzamanlı istekler tek yükleme yapmalı.
+    Concurrent requests for the same key must trigger a single load.
+    """
+    calls = []
+    release = threading.Event()
+
+    def loader(key):
+        calls.append(key)
+        release.wait(1)
+        return key
+
+    cache = TTLCache(loader, ttl=60)
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(cache.get("EUR")))
+        for _ in range(10)
+    ]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.05)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert calls == ["EUR"]
+    assert results == ["EUR"] * 10
+
+
+def test_single_flight_propagates_errors():
+    """
+    Hata tüm bekleyenlere iletilmeli.
+    The error must be raised to the caller.
+    """
+    flight = SingleFlight()
+
+    def fail():
+        raise ValueError("boom")
+
+    try:
+        flight.do("x", fail)
+        assert False
+    except ValueError:
+        pass
+
+    # Hatadan sonra anahtar serbest kalmalı / Key must be released after an error
+    assert flight.do("x", lambda: 5) == 5
+
+
+def test_version_cache():
+    """
+    Değer sürüm başına bir kez oluşturulmalı, yeni sürüm eskileri silmeli.
+    A value must be built once per version; a new version drops the old ones.
+    """
+    cache = VersionCache()
+    calls = []
+
+    def build(value):
+        def run():
+            calls.append(value)
+            return value
+        return run
+
+    assert cache.get("v1", "USD", build("a")) == "a"
+    assert cache.get("v1", "USD", build("b")) == "a"
+    assert cache.get("v1", "EUR", build("c")) == "c"
+    assert calls == ["a", "c"]
+
+    assert cache.get("v2", "USD", build("d")) == "d"
+    assert cache.get("v2", "EUR", build("e")) == "e"
+    assert calls == ["a", "c", "d", "e"]
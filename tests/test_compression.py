@@ -0,0 +1,45 @@
+"""
+KurTakip - Yanıt Sıkıştırma Testleri / Response Compression Tests
+"""
+
+import gzip
+
+from flask import Flask, Response, request
+from werkzeug.datastructures import Accept
+
+import compression
+
+
+def test_negotiate():
+    """
+    İstemcinin kabul ettiği kodlama seçilmeli.
+    The encoding the client accepts must be chosen.
+    """
+    assert compression.negotiate(Accept([("gzip", 1)])) == "gzip"
+    assert compression.negotiate(Accept([("identity", 1)])) is None
+    assert compression.negotiate(Accept([("gzip", 0)])) is None
+
+
+def test_compress_response():
+    """
+    Büyük JSON yanıtı sıkıştırılmalı, küçüğü ve akışlar olduğu gibi kalmalı.
+    A large JSON response must be compressed; small ones and streams are left alone.
+    """
+    app = Flask(__name__)
+    body = b'{"rates": [' + b",".join([b"35.1234"] * 1000) + b"]}"
+
+    with app.test_request_context(headers={"Accept-Encoding": "gzip"}):
+        response = Response(body, mimetype="application/json")
+        response.set_etag("abc")
+        response = compression.compress_response(request, response)
+
+        assert response.headers["Content-Encoding"] == "gzip"
+        assert gzip.decompress(response.get_data()) == body
+        assert response.get_etag() == ("abc", True)
+        assert "Accept-Encoding" in response.headers["Vary"]
+
+        small = compression.compress_response(request, Response(b"{}", mimetype="application/json"))
+        assert "Content-Encoding" not in small.headers
+
+        streamed = compression.compress_response(request, Response(iter([body]), mimetype="application/json"))
+        assert "Content-Encoding" not in streamed.headers
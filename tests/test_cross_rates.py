@@ -0,0 +1,105 @@
+"""
+KurTakip - Çapraz Kur Testleri / Cross-Rate Tests
+Tek çapa verisinden hesaplanan kur matrisini test eder.
+Tests the rate matrix derived from a single anchor snapshot.
+"""
+
+import pytest
+
+from cross_rates import RateMatrix
+
+
+SNAPSHOT = {
+    "base": "USD",
+    "date": "2024-12-02",
+    "rates": {"USD": 1, "EUR": 0.5, "TRY": 35.0, "GBP": 0.25},
+}
+
+
+def test_cross_rates_are_triangulated():
+    """
+    Çapraz kurlar çapa üzerinden tutarlı olmalı.
+    Cross rates must be consistent through the anchor.
+    """
+    matrix = RateMatrix.from_snapshot(SNAPSHOT, ["USD", "EUR", "TRY", "GBP"])
+
+    assert matrix.date == "2024-12-02"
+    assert matrix.rate("USD", "TRY") == pytest.approx(35.0)
+    assert matrix.rate("EUR", "TRY") == pytest.approx(70.0)
+    assert matrix.rate("EUR", "GBP") == pytest.approx(0.5)
+    assert matrix.rate("GBP", "GBP") == pytest.approx(1.0)
+
+    # A -> B -> C == A -> C
+    via_eur = matrix.rate("GBP", "EUR") * matrix.rate("EUR", "TRY")
+    assert via_eur == pytest.approx(matrix.rate("GBP", "TRY"))
+
+
+def test_missing_currency_is_skipped():
+    """
+    Çapa verisinde olmayan birimler None dönmeli ve satırda yer almamalı.
+    Currencies missing from the anchor return None and are left out of rows.
+    """
+    matrix = RateMatrix.from_snapshot(SNAPSHOT, ["USD", "EUR", "JPY"])
+
+    assert matrix.rate("USD", "JPY") is None
+    assert matrix.rate("JPY", "USD") is None
+    assert matrix.row("JPY") is None
+    assert matrix.row("EUR") == pytest.approx({"USD": 2.0, "EUR": 1.0})
+
+
+def test_invalid_snapshot():
+    """
+    Geçersiz veri için matris oluşturulmamalı.
+    No matrix is built from invalid data.
+    """
+    assert RateMatrix.from_snapshot(None, ["USD"]) is None
+    assert RateMatrix.from_snapshot({"date": "2024-12-02"}, ["USD"]) is None
+
+
+def test_version_follows_rates():
+    """
+    Aynı kurlar aynı sürümü, farklı kurlar farklı sürümü vermeli.
+    The same rates must give the same version, different rates a different one.
+    """
+    codes = ["USD", "EUR", "TRY"]
+    first = RateMatrix.from_snapshot(SNAPSHOT, codes)
+    second = RateMatrix.from_snapshot(dict(SNAPSHOT), codes)
+    changed = RateMatrix.from_snapshot(dict(SNAPSHOT, rates={"EUR": 0.6, "TRY": 35.0}), codes)
+
+    assert first.version == second.version
+    assert first.version != changed.version
+
+
+def test_matrix_ring():
+    """
+    Halka tampon verilen zamandaki son matrisi bulmalı ve en eskiyi düşürmeli.
+    The ring must find the last matrix at a given time and drop the oldest.
+    """
+    from cross_rates import MatrixRing
+
+    ring = MatrixRing(2)
+    for updated_at, try_rate in [(100, 34.0), (200, 35.0), (200, 35.0), (300, 36.0)]:
+        ring.add(RateMatrix(["USD", "TRY"], "USD", {"TRY": try_rate}, "2024-12-02", updated_at))
+
+    assert len(ring) == 2
+    assert ring.at(150) is None
+    assert ring.at(250).rate("USD", "TRY") == 35.0
+    assert ring.at(1000).rate("USD", "TRY") == 36.0
+    assert [matrix.updated_at for matrix in ring.items()] == [200, 300]
+
+
+def test_snapshot_round_trip():
+    """
+    Diske yazılan matris aynı sürüm ve zamanlarla geri okunmalı.
+    A matrix written to disk must read back with the same version and times.
+    """
+    import json
+
+    codes = ["USD", "EUR", "TRY"]
+    matrix = RateMatrix(codes, "USD", {"EUR": 0.9, "TRY": 35.0}, "2024-12-02", 1000.0, 2000.0)
+
+    loaded = RateMatrix.from_snapshot(json.loads(json.dumps(matrix.to_snapshot())), codes)
+    assert loaded.version == matrix.version
+    assert loaded.updated_at == 1000.0
+    assert loaded.created_at == 2000.0
+    assert loaded.rate("EUR", "TRY") == matrix.rate("EUR", "TRY")
@@ -0,0 +1,94 @@
+"""
+KurTakip - ECB Arşivi Yükleme Testleri / ECB Archive Import Tests
+"""
+
+import io
+import zipfile
+from datetime import date
+
+import ecb_import
+from history_store import HistoryStore
+
+ARCHIVE = (
+    "Date,USD,JPY,BGN,TRY,\n"
+    "2024-12-03,1.05,157.5,1.9558,36.5,\n"
+    "2024-12-02,1.0512,157.44,1.9558,N/A,\n"
+    "2024-11-29,1.0560,158.3,1.9558,36.6,\n"
+)
+
+
+def test_iter_fixings():
+    """
+    Desteklenmeyen sütunlar ve N/A değerleri atlanmalı; EUR her zaman 1 olmalı.
+    Unsupported columns and N/A values must be skipped; EUR is always 1.
+    """
+    fixings = list(ecb_import.iter_fixings(io.StringIO(ARCHIVE), {"EUR", "USD", "JPY", "TRY"}))
+
+    assert [day for day, _ in fixings] == ["2024-12-03", "2024-12-02", "2024-11-29"]
+    assert fixings[1][1] == {"EUR": 1.0, "USD": 1.0512, "JPY": 157.44}
+
+
+def test_cross_rate():
+    """
+    Çapraz kur EUR üzerinden hesaplanıp 6 anlamlı basamağa yuvarlanmalı.
+    Cross rates are derived through EUR and rounded to 6 significant digits.
+    """
+    assert ecb_import.cross_rate(1.0, 1.05) == 1.05
+    assert ecb_import.cross_rate(1.05, 36.5) == 34.7619
+    assert ecb_import.cross_rate(36.5, 1.05) == 0.0287671
+
+
+def test_import_archive():
+    """
+    Tüm pariteler yazılmalı ve yüklenen aralıklar kapsanmış olmalı.
+    Every pair must be written and the loaded ranges must be covered.
+    """
+    store = HistoryStore(":memory:")
+    summary = ecb_import.import_archive(io.StringIO(ARCHIVE), store, {"EUR", "USD", "JPY", "TRY"}, batch_rows=5)
+
+    assert summary["days"] == 3
+    assert summary["pairs"] == 12
+    assert summary["start"] == "2024-11-29"
+    assert summary["end"] == "2024-12-03"
+
+    rows = store.get_rates("USD", "TRY", date(2024, 11, 29), date(2024, 12, 3))
+    assert rows == [
+        {"date": "2024-11-29", "rate": 34.6591},
+        {"date": "2024-12-03", "rate": 34.7619},
+    ]
+    assert store.get_rates("EUR", "USD", date(2024, 12, 2), date(2024, 12, 2)) == [{"date": "2024-12-02", "rate": 1.0512}]
+
+    # Yayın olmayan günler de kapsanır / Days without a fixing are covered too
+    assert store.missing_ranges("USD", "TRY", date(2024, 11, 29), date(2024, 12, 3)) == []
+    assert store.get_rate_on("JPY", "USD", date(2024, 12, 1)) == {"date": "2024-11-29", "rate": 0.00667088}
+
+
+def test_open_zip_archive(tmp_path):
+    """
+    ZIP içindeki CSV açılabilmeli.
+    The CSV inside a ZIP must be readable.
+    """
+    path = tmp_path / "eurofxref-hist.zip"
+    with zipfile.ZipFile(path, "w") as archive:
+        archive.writestr("eurofxref-hist.csv", ARCHIVE)
+
+    with ecb_import.open_archive(path) as lines:
+        assert lines.readline().startswith("Date,USD")
+
+    # Dosya kapanınca ZIP de kapanmalı / Closing the file must close the ZIP too
+    assert lines.closed
+    assert lines.archive.fp is None
+
+    lines = ecb_import.open_archive(path)
+    lines.close()
+    assert lines.archive.fp is None
+
+    empty_path = tmp_path / "empty.zip"
+    with zipfile.ZipFile(empty_path, "w") as archive:
+        archive.writestr("readme.txt", "")
+
+    try:
+        ecb_import.open_archive(empty_path)
+        assert False
+    except ValueError:
+        pass
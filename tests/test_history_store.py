@@ -0,0 +1,105 @@
+"""
+KurTakip - Geçmiş Kur Deposu Testleri / Historical Rate Store Tests
+Yerel SQLite deposunu test eder.
+Tests the local SQLite store.
+"""
+
+from datetime import date, timedelta
+
+from history_store import HistoryStore
+
+
+def test_save_and_read_range(tmp_path):
+    """
+    Kaydedilen kurlar tarihe göre sıralı okunmalı ve dosyada kalmalı.
+    Saved rates must be read back sorted by date and persist in the file.
+    """
+    path = tmp_path / "history.sqlite3"
+    store = HistoryStore(path)
+    store.save_rates("USD", "TRY", {"2024-12-03": 34.7, "2024-12-02": 34.6})
+
+    reopened = HistoryStore(path)
+    rows = reopened.get_rates("USD", "TRY", date(2024, 12, 1), date(2024, 12, 31))
+
+    assert rows == [
+        {"date": "2024-12-02", "rate": 34.6},
+        {"date": "2024-12-03", "rate": 34.7},
+    ]
+    assert reopened.get_rates("EUR", "TRY", date(2024, 12, 1), date(2024, 12, 31)) == []
+
+
+def test_coverage():
+    """
+    Sadece kapsanmış aralıklar yerelde biliniyor sayılmalı.
+    Only covered ranges count as known locally.
+    """
+    store = HistoryStore(":memory:")
+    store.mark_covered("USD", "TRY", date(2024, 11, 1), date(2024, 11, 30))
+
+    assert store.is_covered("USD", "TRY", date(2024, 11, 5), date(2024, 11, 20))
+    assert not store.is_covered("USD", "TRY", date(2024, 10, 31), date(2024, 11, 20))
+    assert not store.is_covered("USD", "EUR", date(2024, 11, 5), date(2024, 11, 20))
+
+
+def test_recent_coverage_expires():
+    """
+    Bugünü içeren kapsam recent_ttl dolunca dünde kesilmeli.
+    Coverage that includes today is cut at yesterday once recent_ttl passes.
+    """
+    today = date.today()
+    store = HistoryStore(":memory:", recent_ttl=0)
+    store.mark_covered("USD", "TRY", today - timedelta(days=10), today)
+
+    assert store.is_covered("USD", "TRY", today - timedelta(days=10), today - timedelta(days=1))
+    assert not store.is_covered("USD", "TRY", today, today)
+
+
+def test_rate_on_weekend_uses_last_fixing():
+    """
+    Hafta sonu için son iş gününün kuru dönmeli.
+    A weekend day must return the last business day's fixing.
+    """
+    store = HistoryStore(":memory:")
+    store.save_rates("USD", "TRY", {"2024-11-29": 34.6})
+    store.mark_covered("USD", "TRY", date(2024, 11, 29), date(2024, 11, 30))
+
+    assert store.get_rate_on("USD", "TRY", date(2024, 11, 30)) == {"date": "2024-11-29", "rate": 34.6}
+    assert store.get_rate_on("USD", "TRY", date(2024, 12, 1)) is None
+
+
+def test_missing_ranges_and_merge():
+    """
+    Sadece bilinmeyen alt aralıklar dönmeli; bitişik aralıklar birleşmeli.
+    Only unknown sub-ranges are returned; adjacent ranges are merged.
+    """
+    store = HistoryStore(":memory:")
+    store.mark_covered("USD", "TRY", date(2024, 11, 10), date(2024, 11, 20))
+    store.mark_covered("USD", "TRY", date(2024, 11, 25), date(2024, 11, 30))
+
+    gaps = store.missing_ranges("USD", "TRY", date(2024, 11, 1), date(2024, 12, 5))
+    assert gaps == [
+        (date(2024, 11, 1), date(2024, 11, 9)),
+        (date(2024, 11, 21), date(2024, 11, 24)),
+        (date(2024, 12, 1), date(2024, 12, 5)),
+    ]
+
+    # Boşluğu doldur, aralıklar birleşsin / Fill the gap so ranges merge
+    store.mark_covered("USD", "TRY", date(2024, 11, 21), date(2024, 11, 24))
+    assert store.covered_intervals("USD", "TRY") == [(date(2024, 11, 10), date(2024, 11, 30))]
+    assert store.missing_ranges("USD", "TRY", date(2024, 11, 12), date(2024, 11, 28)) == []
+
+
+def test_save_many():
+    """
+    Birden fazla paritenin kurları tek çağrıda kaydedilebilmeli.
+    Rates of several pairs must be saved in one call.
+    """
+    store = HistoryStore(":memory:")
+    store.save_many([
+        ("USD", "TRY", "2024-12-02", 34.6),
+        ("TRY", "USD", "2024-12-02", 0.0289),
+        ("USD", "TRY", "2024-12-03", 34.7),
+    ])
+
+    assert len(store.get_rates("USD", "TRY", date(2024, 12, 1), date(2024, 12, 31))) == 2
+    assert store.get_rates("TRY", "USD", date(2024, 12, 1), date(2024, 12, 31)) == [{"date": "2024-12-02", "rate": 0.0289}]
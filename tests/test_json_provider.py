@@ -0,0 +1,83 @@
+"""
+KurTakip - Hızlı JSON Testleri / Fast JSON Tests
+"""
+
+import json
+from datetime import date
+from decimal import Decimal
+
+from flask import Flask, jsonify
+
+import json_provider
+from json_provider import FastJSONProvider
+
+
+def make_app():
+    app = Flask(__name__)
+    app.json = FastJSONProvider(app)
+    return app
+
+
+def test_dumps_matches_stdlib():
+    """
+    Çıktı standart kodlayıcıyla aynı veriyi taşımalı (sıralı anahtarlar dahil).
+    The output must carry the same data as the stdlib encoder (keys sorted).
+    """
+    app = make_app()
+    data = {"rates": {"TRY": 35.1, "EUR": 0.9}, "base": "USD", "name": "Türk Lirası", "n": None}
+
+    text = app.json.dumps(data)
+    assert json.loads(text) == data
+    assert text.index('"base"') < text.index('"n"') < text.index('"rates"')
+    assert text.index('"EUR"') < text.index('"TRY"')
+    assert app.json.loads(text) == data
+    assert app.json.loads(text.encode("utf-8")) == data
+
+
+def test_unusual_values():
+    """
+    Decimal, tarih, sayı anahtarları ve çok büyük tam sayılar yazılabilmeli.
+    Decimals, dates, integer keys and very large integers must be encodable.
+    """
+    app = make_app()
+
+    data = json.loads(app.json.dumps({"amount": Decimal("1.50"), 1: "one"}))
+    assert data == {"amount": "1.50", "1": "one"}
+    assert json.loads(app.json.dumps({"big": 2 ** 70})) == {"big": 2 ** 70}
+    assert json.loads(app.json.dumps({"day": date(2024, 12, 2)}))["day"]
+
+    # Özel argümanlar standart kodlayıcıya gider / Custom arguments go to the stdlib encoder
+    assert app.json.dumps({"a": 1}, indent=4) == json.dumps({"a": 1}, indent=4)
+
+
+def test_jsonify_response():
+    """
+    jsonify hızlı kodlayıcıyla geçerli bir JSON yanıtı döndürmeli.
+    jsonify must return a valid JSON response through the fast encoder.
+    """
+    app = make_app()
+
+    with app.app_context():
+        response = jsonify({"base": "USD", "rates": {"TRY": 35.0}})
+
+    assert response.mimetype == "application/json"
+    assert response.get_data().endswith(b"\n")
+    assert json.loads(response.get_data()) == {"base": "USD", "rates": {"TRY": 35.0}}
+
+    # Hata ayıklama kipinde girintili / Indented in debug mode
+    app.debug = True
+    with app.app_context():
+        assert b"\n  " in jsonify({"a": 1}).get_data()
+
+
+def test_fallback_without_orjson(monkeypatch):
+    """
+    orjson yoksa standart kodlayıcı kullanılmalı.
+    Without orjson the stdlib encoder must be used.
+    """
+    monkeypatch.setattr(json_provider, "orjson", None)
+    app = make_app()
+
+    assert app.json.dumps({"b": 1, "a": 2}) == '{"a": 2, "b": 1}'
+    assert app.json.dump_bytes({"b": 1, "a": 2}) == b'{"a":2,"b":1}'
+    assert app.json.loads('{"a": 1}') == {"a": 1}
@@ -0,0 +1,84 @@
+# ============================================================
+# KurTakip - Para Hesabı Testleri / Money Arithmetic Tests
+# ============================================================
+
+import pytest
+
+import money
+
+
+def test_minor_units():
+    """
+    JPY ve KRW kuruşsuz, diğerleri 2 hanelidir.
+    JPY and KRW have no minor unit, the others have 2 digits.
+    """
+    assert money.minor_units("JPY") == 0
+    assert money.minor_units("KRW") == 0
+    assert money.minor_units("TRY") == 2
+
+
+def test_parse_amount():
+    """
+    Miktar tam sayı + ondalık hane olarak okunmalı.
+    Amounts must be read as an integer plus decimal digits.
+    """
+    assert money.parse_amount("12.50") == (1250, 2)
+    assert money.parse_amount(0.1) == (1, 1)
+    assert money.parse_amount("1e3") == (1000, 0)
+
+    for bad_value in ["abc", "nan", "inf", "1e400", "1e16", "1" * 16, "1e-999999"]:
+        with pytest.raises(ValueError):
+            money.parse_amount(bad_value)
+
+    # Sınırdaki değerler / Values at the limit
+    assert money.parse_amount("9" * 15) == (int("9" * 15), 0)
+    assert money.parse_amount("0001.5") == (15, 1)
+    assert money.parse_amount("0e999999999") == (0, 0)
+
+
+def test_convert_is_exact():
+    """
+    Float kayması olmamalı: 0.1 * 3 = 0.30 (float: 0.30000000000000004).
+    There must be no float drift: 0.1 * 3 = 0.30 (float: 0.30000000000000004).
+    """
+    assert money.convert_amount(0.1, 3, "USD") == 0.3
+    assert money.convert_amount("100", 35.12345, "TRY") == 3512.35
+    assert money.convert_amount("100", 151.236, "JPY") == 15124.0
+
+
+def test_small_cross_rate_keeps_precision():
+    """
+    Küçük çapraz kurlar sabit haneye yuvarlanmamalı: büyük KRW tutarı GBP'ye kuruşu kuruşuna çevrilmeli.
+    Small cross rates must not be rounded to fixed places: a large KRW amount must convert to GBP to the penny.
+    """
+    krw_to_gbp = 0.79 / 1380
+    assert money.scale_rate(krw_to_gbp) == (5724637681159421, 19)
+    assert money.convert_amount("1000000000000", krw_to_gbp, "GBP") == 572463768.12
+    assert money.convert_amount("123456789", krw_to_gbp, "GBP") == 70674.54
+
+
+def test_rounding_modes():
+    """
+    Yarım değerler seçilen kipe göre yuvarlanmalı.
+    Halfway values must round according to the chosen mode.
+    """
+    assert money.convert_amount("0.125", 1, "USD", "half_up") == 0.13
+    assert money.convert_amount("0.125", 1, "USD", "half_even") == 0.12
+    assert money.convert_amount("0.125", 1, "USD", "half_down") == 0.12
+    assert money.convert_amount("0.121", 1, "USD", "up") == 0.13
+    assert money.convert_amount("0.129", 1, "USD", "down") == 0.12
+    assert money.convert_amount("-0.121", 1, "USD", "ceiling") == -0.12
+    assert money.convert_amount("-0.121", 1, "USD", "floor") == -0.13
+
+    with pytest.raises(ValueError):
+        money.parse_rounding("sideways")
+
+
+def test_scale_rates():
+    """
+    Kur satırı tek seferde ölçeklenmeli.
+    A rate row must be scaled in one go.
+    """
+    scaled = money.scale_rates({"TRY": 35.0, "EUR": 0.9})
+    assert scaled == {"TRY": (350, 1), "EUR": (9, 1)}
+    assert money.convert_scaled(money.parse_amount("2"), scaled["TRY"], "TRY") == 70.0
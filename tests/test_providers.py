@@ -0,0 +1,168 @@
+"""
+KurTakip - Kur Kaynakları Testleri / Rate Provider Tests
+Yedekli çağrı, hedge istekleri ve kaynak istatistiklerini test eder.
+Tests failover, hedged requests and provider statistics.
+"""
+
+import time
+from datetime import date
+
+import pytest
+import requests
+
+from providers import FakeProvider, ProviderError, ProviderPool, ProviderStats, build_providers
+
+RATES = {"USD": 1.0, "TRY": 34.6}
+
+HISTORY = {
+    "2024-11-29": {"TRY": 34.6, "EUR": 0.95},
+    "2024-12-02": {"TRY": 34.7, "EUR": 0.94},
+}
+
+
+def test_first_provider_answers():
+    """
+    İlk kaynak hızlıysa sadece o çağrılmalı.
+    A fast first provider must be the only one called.
+    """
+    first = FakeProvider("first", rates=RATES)
+    second = FakeProvider("second", rates=RATES)
+    pool = ProviderPool([first, second], "latest")
+
+    assert pool.call("USD")["rates"]["TRY"] == 34.6
+    assert first.calls == 1
+    assert second.calls == 0
+
+
+def test_failover_on_error():
+    """
+    Hata veren ya da boş dönen kaynaktan sonra hemen sıradakine geçilmeli.
+    A failing or empty provider must fail over to the next one at once.
+    """
+    broken = FakeProvider("broken", error=requests.ConnectionError("down"))
+    empty = FakeProvider("empty")
+    working = FakeProvider("working", rates=RATES)
+    pool = ProviderPool([broken, empty, working], "latest", hedge_delay=10)
+
+    started = time.monotonic()
+    assert pool.call("USD")["base"] == "USD"
+    assert time.monotonic() - started < 1
+
+    assert pool.stats["broken"].errors == 1
+    assert pool.stats["empty"].errors == 1
+    assert pool.stats["working"].successes == 1
+
+
+def test_every_provider_fails():
+    """
+    Tüm kaynaklar başarısızsa son hata fırlatılmalı.
+    The last error must be raised when every provider fails.
+    """
+    pool = ProviderPool([
+        FakeProvider("a", error=requests.ConnectionError("a")),
+        FakeProvider("b", error=requests.Timeout("b")),
+    ], "latest")
+
+    with pytest.raises(requests.Timeout):
+        pool.call("USD")
+
+    with pytest.raises(ProviderError):
+        ProviderPool([], "latest").call("USD")
+
+
+def test_partial_result_is_rejected():
+    """
+    Denetimden geçmeyen (eksik) sonuç hata sayılmalı; yedek ya da hedge kazanamamalı.
+    A result failing validation (partial) must count as an error; neither failover nor hedge may win with it.
+    """
+    full = {"USD": 1.0, "TRY": 34.6, "SAR": 3.75}
+    subset = {"USD": 1.0, "TRY": 34.6}
+
+    def validate(provider, data):
+        if "SAR" not in data["rates"]:
+            raise ProviderError(provider.name + ": missing SAR")
+
+    # Yavaş ama tam kaynak, hızlı ama eksik yedeğe karşı / Slow but complete vs fast but partial
+    slow = FakeProvider("slow", rates=full, delay=0.2)
+    partial = FakeProvider("partial", rates=subset)
+    pool = ProviderPool([slow, partial], "latest", hedge_delay=0.01, validate=validate)
+
+    assert pool.call("USD")["rates"] == full
+    assert partial.calls == 1
+    assert pool.stats["partial"].errors == 1
+    assert pool.stats["slow"].successes == 1
+
+    # Sadece eksik sonuç varsa çağrı başarısız olur / With only partial results the call fails
+    broken = FakeProvider("broken", error=requests.ConnectionError("down"))
+    pool = ProviderPool([broken, FakeProvider("partial", rates=subset)], "latest", validate=validate)
+    with pytest.raises(ProviderError):
+        pool.call("USD")
+
+
+def test_hedges_slow_provider():
+    """
+    Yavaş kaynak beklenirken ikinci kaynağa da istek gitmeli; ilk gelen kazanır.
+    While a slow provider is pending the second one must be asked too; the first answer wins.
+    """
+    slow = FakeProvider("slow", history=HISTORY, delay=1.0)
+    fast = FakeProvider("fast", history=HISTORY)
+    pool = ProviderPool([slow, fast], "on_date", hedge_delay=0.05)
+
+    started = time.monotonic()
+    assert pool.call("USD", "2024-12-01") == {"date": "2024-11-29", "rates": HISTORY["2024-11-29"]}
+    assert time.monotonic() - started < 0.5
+
+    assert slow.calls == 1
+    assert fast.calls == 1
+    assert pool.stats["fast"].hedges == 1
+
+
+def test_hedge_delay_follows_percentile():
+    """
+    Yeterli ölçüm varsa yedek istek gecikme yüzdeliğinden sonra gitmeli.
+    With enough samples the hedge must wait for the latency percentile.
+    """
+    provider = FakeProvider("measured", history=HISTORY)
+    pool = ProviderPool([provider, FakeProvider("backup")], "series", hedge_percentile=90, hedge_delay=5)
+    assert pool.hedge_after(provider) == 5
+
+    for latency in range(1, 21):
+        pool.stats["measured"].record_success(latency / 100)
+    assert pool.hedge_after(provider) == pytest.approx(0.18)
+
+    result = pool.call("USD", ["TRY"], date(2024, 12, 1), date(2024, 12, 31))
+    assert result == {"TRY": {"2024-12-02": 34.7}}
+
+
+def test_stats_snapshot():
+    """
+    İstatistik özeti sayıları ve yüzdelikleri içermeli.
+    The statistics summary must include the counts and percentiles.
+    """
+    stats = ProviderStats()
+    assert stats.percentile(95) is None
+    assert stats.snapshot()["p50_ms"] is None
+
+    for latency in [0.1, 0.2, 0.3, 0.4]:
+        stats.record_success(latency)
+    stats.record_error(ValueError("bad"))
+
+    summary = stats.snapshot()
+    assert summary["successes"] == 4
+    assert summary["errors"] == 1
+    assert summary["last_error"] == "bad"
+    assert summary["p50_ms"] == 200.0
+    assert summary["p95_ms"] == 400.0
+
+
+def test_build_providers():
+    """
+    Kaynak listesi addan oluşturulmalı; bilinmeyen ad hata vermeli.
+    Providers must be built by name; an unknown name must fail.
+    """
+    factories = {"fake": FakeProvider}
+    built = build_providers(" Fake, ,fake", factories)
+    assert [provider.name for provider in built] == ["fake", "fake"]
+
+    with pytest.raises(ValueError):
+        build_providers("fake,missing", factories)
@@ -0,0 +1,64 @@
+"""
+KurTakip - Arka Plan Yenileyici Testleri / Background Refresher Tests
+Zamanlayıcının kurları istekten bağımsız yenilediğini test eder.
+Tests that the scheduler refreshes rates independently of requests.
+"""
+
+import threading
+from datetime import datetime, timezone
+
+from refresher import RateRefresher, next_daily_run
+
+
+def test_next_daily_run():
+    """
+    Saat geçtiyse bir sonraki gün seçilmeli.
+    If the time has passed the next day must be chosen.
+    """
+    morning = datetime(2024, 12, 2, 10, 0, tzinfo=timezone.utc)
+    evening = datetime(2024, 12, 2, 18, 0, tzinfo=timezone.utc)
+
+    assert next_daily_run(morning, 15, 30) == datetime(2024, 12, 2, 15, 30, tzinfo=timezone.utc)
+    assert next_daily_run(evening, 15, 30) == datetime(2024, 12, 3, 15, 30, tzinfo=timezone.utc)
+
+
+def test_refresher_runs_until_stopped():
+    """
+    Yenileyici hemen çalışmalı, hatalarda durmamalı ve durdurulabilmeli.
+    The refresher must run at once, survive errors and be stoppable.
+    """
+    calls = []
+    twice = threading.Event()
+
+    def refresh():
+        calls.append(1)
+        if len(calls) >= 2:
+            twice.set()
+        raise RuntimeError("upstream down")
+
+    refresher = RateRefresher(refresh, interval=0.01)
+    refresher.start()
+    assert refresher.is_running()
+
+    assert twice.wait(2)
+    refresher.stop()
+    assert not refresher.is_running()
+
+
+def test_refresher_start_delay():
+    """
+    Başlangıç gecikmesi ilk yenilemeyi ertelemeli; durdurma beklemeyi kesmeli.
+    A start delay must postpone the first refresh; stopping cuts the wait short.
+    """
+    calls = []
+    refresher = RateRefresher(lambda: calls.append(1), interval=60)
+    refresher.start(delay=60)
+
+    assert refresher.is_running()
+    refresher._stop.wait(0.05)
+    assert calls == []
+
+    refresher.stop()
+    refresher._thread.join(1)
+    assert not refresher._thread.is_alive()
+    assert calls == []
@@ -0,0 +1,58 @@
+"""
+KurTakip - Paylaşılan Önbellek Testleri / Shared Cache Tests
+Süreçler arası paylaşılan kur dosyasını test eder.
+Tests the rate snapshot file shared between processes.
+"""
+
+import time
+
+from shared_cache import SharedSnapshotFile
+
+
+def test_write_and_read(tmp_path):
+    """
+    Yazılan veri başka bir nesneden okunabilmeli.
+    Written data must be readable from another instance.
+    """
+    path = tmp_path / "rates.json"
+    SharedSnapshotFile(path).write({"base": "USD", "rates": {"TRY": 35.0}})
+
+    data, written_at = SharedSnapshotFile(path).read()
+    assert data == {"base": "USD", "rates": {"TRY": 35.0}}
+    assert written_at <= time.time()
+
+
+def test_read_fresh_respects_max_age(tmp_path):
+    """
+    Eski veri read_fresh ile dönmemeli.
+    Old data must not be returned by read_fresh.
+    """
+    shared = SharedSnapshotFile(tmp_path / "rates.json")
+    assert shared.read_fresh(60) is None
+
+    shared.write({"base": "USD"})
+    assert shared.read_fresh(60) == {"base": "USD"}
+    assert shared.read_fresh(0) is None
+
+
+def test_corrupt_file_is_ignored(tmp_path):
+    """
+    Bozuk dosya hata vermemeli.
+    A corrupt file must not raise.
+    """
+    path = tmp_path / "rates.json"
+    path.write_text("{not json")
+
+    assert SharedSnapshotFile(path).read() is None
+
+
+def test_lock_is_reentrant_across_instances(tmp_path):
+    """
+    Kilit alınıp bırakılabilmeli.
+    The lock can be taken and released.
+    """
+    shared = SharedSnapshotFile(tmp_path / "rates.json")
+    with shared.lock():
+        shared.write({"base": "USD"})
+    with shared.lock():
+        assert shared.read_fresh(60) == {"base": "USD"}
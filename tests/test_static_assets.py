@@ -0,0 +1,78 @@
+"""
+KurTakip - Hazır Dosya Testleri / Prebuilt Asset Tests
+"""
+
+import gzip
+
+from flask import Flask, request
+
+import static_assets
+from static_assets import Asset, AssetBundle
+
+
+def test_asset_variants():
+    """
+    Büyük metin önceden sıkıştırılmalı, ikili içerik olduğu gibi kalmalı.
+    Large text must be precompressed; binary content is left alone.
+    """
+    body = b"body { color: red; }\n" * 200
+    asset = Asset(body, "text/css")
+
+    assert gzip.decompress(asset.variants["gzip"]) == body
+    assert Asset(body, "image/png").variants == {}
+
+    # Aynı içerik aynı ETag'i verir / The same content gives the same ETag
+    assert Asset(body, "text/css").etag == asset.etag
+    assert Asset(body + b" ", "text/css").etag != asset.etag
+
+
+def test_asset_response():
+    """
+    Yanıt kodlamayı seçmeli, ETag'e kodlamayı eklemeli ve 304 dönebilmeli.
+    The response must pick the encoding, add it to the ETag and support 304.
+    """
+    app = Flask(__name__)
+    body = b"var rates = {};\n" * 200
+    asset = Asset(body, "application/javascript")
+
+    with app.test_request_context(headers={"Accept-Encoding": "gzip"}):
+        response = asset.response(request, app.response_class, static_assets.IMMUTABLE_MAX_AGE, immutable=True)
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert gzip.decompress(response.get_data()) == body
+    assert response.get_etag() == (asset.etag + "-gzip", False)
+    assert "immutable" in response.headers["Cache-Control"]
+
+    with app.test_request_context():
+        response = asset.response(request, app.response_class, 0)
+    assert response.get_data() == body
+    assert "Content-Encoding" not in response.headers
+    assert "no-cache" in response.headers["Cache-Control"]
+
+    with app.test_request_context(headers={"If-None-Match": '"' + asset.etag + '"'}):
+        response = asset.response(request, app.response_class, 0)
+    assert response.status_code == 304
+
+
+def test_asset_bundle(tmp_path):
+    """
+    Sayfa içerik özetli adreslere yönlendirilmeli; eski adresler de çalışmalı.
+    The page must point at content-hashed URLs; the plain URLs keep working.
+    """
+    (tmp_path / "js").mkdir()
+    (tmp_path / "css").mkdir()
+    (tmp_path / "js" / "app.js").write_text("console.log(1);\n")
+    (tmp_path / "css" / "style.css").write_text("body {}\n")
+    (tmp_path / "index.html").write_text(
+        '<link href="/css/style.css"><script src="/js/app.js"></script>', "utf-8")
+
+    bundle = AssetBundle(tmp_path)
+    js_url = bundle.urls["/js/app.js"]
+    css_url = bundle.urls["/css/style.css"]
+
+    assert js_url.startswith("/js/app.") and js_url.endswith(".js")
+    assert bundle.page.body.decode("utf-8") == '<link href="' + css_url + '"><script src="' + js_url + '"></script>'
+
+    asset, immutable = bundle.get(js_url)
+    assert immutable and asset.mimetype == "application/javascript"
+    assert bundle.get("/js/app.js") == (asset, False)
+    assert bundle.get("/js/other.js") is None
@@ -0,0 +1,90 @@
+"""
+KurTakip - Dış API İstemcisi Testleri / Upstream Client Tests
+Tekrar deneme ve devre kesici davranışını test eder.
+Tests retry and circuit breaker behaviour.
+"""
+
+import os
+
+import pytest
+import requests
+
+from upstream import CircuitOpenError, UpstreamClient
+
+
+class FakeResponse:
+    def __init__(self, status_code):
+        self.status_code = status_code
+
+
+class FakeSession:
+    """
+    Sırayla önceden belirlenmiş yanıtlar ya da hatalar döndürür.
+    Returns predefined responses or errors in order.
+    """
+
+    def __init__(self, outcomes):
+        self.outcomes = list(outcomes)
+        self.calls = 0
+
+    def get(self, url, params=None, timeout=None):
+        self.calls += 1
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return FakeResponse(outcome)
+
+
+def make_client(outcomes, **settings):
+    client = UpstreamClient(backoff=0, **settings)
+    client._session = FakeSession(outcomes)
+    client._pid = os.getpid()
+    return client
+
+
+def test_retries_transient_errors():
+    """
+    Geçici hatalar tekrar denenmeli.
+    Transient failures must be retried.
+    """
+    client = make_client([requests.ConnectionError(), 503, 200], retries=2)
+
+    response = client.get("https://example.com/latest")
+
+    assert response.status_code == 200
+    assert client._session.calls == 3
+
+
+def test_client_errors_are_not_retried():
+    """
+    4xx yanıtlar tekrar denenmemeli.
+    4xx responses must not be retried.
+    """
+    client = make_client([404], retries=2)
+
+    assert client.get("https://example.com/latest").status_code == 404
+    assert client._session.calls == 1
+
+
+def test_circuit_opens_and_fails_fast():
+    """
+    Art arda hatalardan sonra devre açılmalı ve istek gönderilmemeli.
+    After consecutive failures the circuit opens and no request is sent.
+    """
+    client = make_client(
+        [requests.Timeout(), requests.Timeout()],
+        retries=0,
+        failure_threshold=2,
+        reset_timeout=60,
+    )
+
+    for _ in range(2):
+        with pytest.raises(requests.Timeout):
+            client.get("https://example.com/latest")
+
+    with pytest.raises(CircuitOpenError):
+        client.get("https://example.com/latest")
+    assert client._session.calls == 2
+
+    # Diğer sunucular etkilenmez / Other hosts are not affected
+    assert not client.breaker("https://other.example.com/").is_open
@@ -0,0 +1,248 @@
+# ============================================================
+# KurTakip - Dış API İstemcisi / Upstream API Client
+# Tüm dış API çağrıları için ortak, bağlantı havuzlu HTTP istemcisi
+# Shared, connection-pooled HTTP client for all upstream API calls
+# ============================================================
+
+# --- Kütüphaneleri içe aktar / Import libraries ---
+import logging
+import os
+import random
+import threading
+import time
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# --- Log ayarları / Logging setup ---
+logger = logging.getLogger(__name__)
+
+
+# ============================================================
+# Ayarlar / Settings
+# ============================================================
+
+# Sunucu başına açık tutulacak bağlantı sayısı / Connections kept open per host
+UPSTREAM_POOL_SIZE = int(os.getenv("UPSTREAM_POOL_SIZE", "10"))
+
+# Başarısız istek en fazla kaç kez tekrarlanır / Max retries for a failed request
+UPSTREAM_RETRIES = int(os.getenv("UPSTREAM_RETRIES", "2"))
+
+# Tekrar denemeler arasındaki temel bekleme (saniye) / Base backoff between retries (seconds)
+UPSTREAM_BACKOFF = float(os.getenv("UPSTREAM_BACKOFF", "0.2"))
+
+# Devre kesicinin açılması için art arda hata sayısı
+# Consecutive failures that open the circuit breaker
+CIRCUIT_FAILURE_THRESHOLD = int(os.getenv("CIRCUIT_FAILURE_THRESHOLD", "5"))
+
+# Açık devrenin tekrar denenmeden önce beklediği süre (saniye)
+# How long an open circuit waits before a trial request (seconds)
+CIRCUIT_RESET_TIMEOUT = float(os.getenv("CIRCUIT_RESET_TIMEOUT", "30"))
+
+# Tekrar denenecek HTTP durum kodları / HTTP status codes worth retrying
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+class CircuitOpenError(requests.ConnectionError):
+    """
+    Sunucunun devre kesicisi açıkken fırlatılır (istek gönderilmez).
+    Raised while a host's circuit breaker is open (no request is sent).
+    """
+
+
+# ============================================================
+# Devre Kesici / Circuit Breaker
+# ============================================================
+
+class CircuitBreaker:
+    """
+    Tek bir sunucu için devre kesici.
+    Circuit breaker for a single host.
+
+    - Kapalı: istekler normal gider / Closed: requests go through
+    - Açık: art arda failure_threshold hatadan sonra istekler hemen reddedilir
+      Open: after failure_threshold consecutive failures requests fail at once
+    - Yarı açık: reset_timeout sonra tek bir deneme isteğine izin verilir
+      Half-open: after reset_timeout a single trial request is allowed
+    """
+
+    def __init__(self, failure_threshold, reset_timeout):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at = None
+        self._trial_running = False
+
+    def allow(self):
+        """
+        Bu istek gönderilebilir mi?
+        May this request be sent?
+        """
+        with self._lock:
+            if self._opened_at is None:
+                return True
+
+            # Bekleme süresi dolduysa tek bir deneme isteği
+            # Once the wait is over, allow a single trial request
+            waited = time.monotonic() - self._opened_at
+            if waited >= self.reset_timeout and not self._trial_running:
+                self._trial_running = True
+                return True
+
+            return False
+
+    def record_success(self):
+        """
+        Başarılı isteği kaydeder ve devreyi kapatır.
+        Records a success and closes the circuit.
+        """
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_running = False
+
+    def record_failure(self):
+        """
+        Başarısız isteği kaydeder; eşik aşılırsa devreyi açar.
+        Records a failure and opens the circuit past the threshold.
+        """
+        with self._lock:
+            self._failures += 1
+            self._trial_running = False
+            if self._failures >= self.failure_threshold:
+                if self._opened_at is None:
+                    logger.warning("Devre kesici açıldı / Circuit breaker opened")
+                self._opened_at = time.monotonic()
+
+    @property
+    def is_open(self):
+        """
+        Devre şu anda açık mı? / Is the circuit currently open?
+        """
+        with self._lock:
+            return self._opened_at is not None
+
+
+# ============================================================
+# İstemci / Client
+# ============================================================
+
+class UpstreamClient:
+    """
+    Bağlantı havuzlu, tekrar denemeli ve devre kesicili HTTP istemcisi.
+    HTTP client with connection pooling, retries and circuit breakers.
+
+    Bağlantılar (TCP + TLS) sunucu başına havuzda açık tutulur.
+    Connections (TCP + TLS) are kept alive in a pool per host.
+    """
+
+    def __init__(
+        self,
+        pool_size=UPSTREAM_POOL_SIZE,
+        retries=UPSTREAM_RETRIES,
+        backoff=UPSTREAM_BACKOFF,
+        failure_threshold=CIRCUIT_FAILURE_THRESHOLD,
+        reset_timeout=CIRCUIT_RESET_TIMEOUT,
+    ):
+        self.pool_size = pool_size
+        self.retries = retries
+        self.backoff = backoff
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._lock = threading.Lock()
+        self._session = None
+        self._pid = None
+        self._breakers = {}
+
+    @property
+    def session(self):
+        """
+        Bu süreç için paylaşılan requests.Session (çatallanmadan sonra yenilenir).
+        Shared requests.Session for this process (recreated after a fork).
+        """
+        with self._lock:
+            if self._session is None or self._pid != os.getpid():
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=4, pool_maxsize=self.pool_size, max_retries=0)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                self._session = session
+                self._pid = os.getpid()
+            return self._session
+
+    def breaker(self, url):
+        """
+        Adresin sunucusuna ait devre kesiciyi döndürür.
+        Returns the circuit breaker for the URL's host.
+        """
+        host = urlsplit(url).netloc
+        with self._lock:
+            breaker = self._breakers.get(host)
+            if breaker is None:
+                breaker = CircuitBreaker(self.failure_threshold, self.reset_timeout)
+                self._breakers[host] = breaker
+            return breaker
+
+    def get(self, url, params=None, timeout=None):
+        """
+        GET isteği gönderir; geçici hatalarda rastgele beklemeli olarak tekrar dener.
+        Sends a GET request, retrying transient failures with jittered backoff.
+
+        Parametreler / Parameters:
+            url: İstek adresi / Request URL
+            params: Sorgu parametreleri / Query parameters
+            timeout: Her deneme için bekleme süresi (saniye) / Timeout per attempt (seconds)
+
+        Döndürür / Returns:
+            requests.Response (4xx yanıtlar da döner / 4xx responses are returned too)
+
+        Hatalar / Raises:
+            CircuitOpenError: Devre açıksa / If the circuit is open
+            requests.RequestException: Tüm denemeler başarısızsa / If every attempt failed
+        """
+        breaker = self.breaker(url)
+        if not breaker.allow():
+            raise CircuitOpenError("Devre açık / Circuit open: " + urlsplit(url).netloc)
+
+        last_error = None
+        response = None
+
+        for attempt in range(self.retries + 1):
+            # İlk denemeden sonra rastgele bekle (full jitter)
+            # Wait a random time after the first attempt (full jitter)
+            if attempt > 0:
+                time.sleep(random.uniform(0, self.backoff * (2 ** (attempt - 1))))
+
+            try:
+                response = self.session.get(url, params=params, timeout=timeout)
+            except (requests.ConnectionError, requests.Timeout) as error:
+                last_error = error
+                response = None
+                continue
+            except Exception:
+                breaker.record_failure()
+                raise
+
+            if response.status_code not in RETRY_STATUS_CODES:
+                breaker.record_success()
+                return response
+
+        # Tüm denemeler başarısız / Every attempt failed
+        breaker.record_failure()
+        if response is not None:
+            return response
+        raise last_error
+
+
+# Paylaşılan istemci / Shared client
+client = UpstreamClient()
+
+
+def get(url, params=None, timeout=None):
+    """
+    Paylaşılan istemciyle GET isteği gönderir.
+    Sends a GET request with the shared client.
+    """
+    return client.get(url, params=params, timeout=timeout)